@@ -3,6 +3,7 @@ from fastapi.security import OAuth2PasswordBearer
 from uuid import UUID
 
 from core.auth import decode_access_token
+from core.cache import principal_cache
 from models.user_models import User, Role
 
 # This tells FastAPI where to look for the token
@@ -12,6 +13,8 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     """
     Dependency to get the current user from a token.
     Validates token, decodes it, and fetches the user from the database.
+    Users are served from the in-process principal cache when possible,
+    so most authenticated requests make no database round trip here.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -30,13 +33,20 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     # This line might fail if the user_id from the token is invalid.
     # Beanie's `get` method expects a valid document ID.
     try:
-        user = await User.find_one(User.user_id == UUID(user_id))
+        user_uuid = UUID(user_id)
     except (ValueError, TypeError):
         # This handles cases where user_id is not a valid UUID string
         raise credentials_exception
-        
+
+    user = principal_cache.get(user_uuid)
+    if user is not None:
+        return user
+
+    user = await User.find_one(User.user_id == user_uuid)
     if user is None:
         raise credentials_exception
+
+    principal_cache.set(user_uuid, user)
     return user
 
 async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
@@ -1,10 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+import asyncio
+from datetime import date
+from beanie import UpdateResponse
+from beanie.operators import In, Set
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import List, Literal, Optional
 from uuid import UUID
+from pymongo import ASCENDING
 
 from models.user_models import User, DoctorProfile, DoctorStatus
-from schemas.admin_schemas import DoctorAdminOut, DoctorStatusUpdate
+from models.clinic_models import Appointment, AppointmentStatus, Prescription, Review
+from schemas.admin_schemas import (
+    DoctorAdminOut, DoctorStatusUpdate, DoctorStatusBulkUpdate, DoctorStatusBulkResult,
+    PrescriptionExport, ReviewExport,
+)
+from schemas.clinic_schemas import AppointmentOut
 from api.dependencies import get_current_admin
+from core.auth import get_password_hash_stats
+from core.cache import invalidate_principal, invalidate_principals
+from core.doctor_directory import doctor_directory
+from core.pagination import PageParams, cursor_filter, split_page
+from core.export import date_range_filter, export_response
+from core.lean import LeanShape
 
 # Note: I removed the prefixes from the router definition. 
 # Make sure the prefix is only defined once in your main.py file, like so:
@@ -13,53 +29,103 @@ router = APIRouter(
     dependencies=[Depends(get_current_admin)]
 )
 
+# Oldest registrations first. ObjectIds increase with insertion time, so _id
+# order is registration order and is covered by the (status, _id) index.
+PENDING_DOCTORS_SORT = [("_id", ASCENDING)]
+
+# Export row shapes; see core/export.py
+APPOINTMENT_EXPORT = LeanShape(AppointmentOut)
+PRESCRIPTION_EXPORT = LeanShape(PrescriptionExport)
+REVIEW_EXPORT = LeanShape(ReviewExport)
+
+class ExportParams:
+    """Query parameters shared by the export endpoints."""
+    def __init__(
+        self,
+        format: Literal["ndjson", "csv"] = "ndjson",
+        gzip: bool = False,
+        date_from: Optional[date] = Query(None, description="Inclusive start date"),
+        date_to: Optional[date] = Query(None, description="Inclusive end date"),
+        doctor_id: Optional[UUID] = None,
+    ):
+        self.format = format
+        self.gzip = gzip
+        self.date_from = date_from
+        self.date_to = date_to
+        self.doctor_id = doctor_id
+
+    def filter(self, date_field: str) -> dict:
+        query = date_range_filter(date_field, self.date_from, self.date_to)
+        if self.doctor_id is not None:
+            query["doctor_id"] = self.doctor_id
+        return query
+
 @router.get("/doctors/pending", response_model=List[DoctorAdminOut])
-async def get_pending_doctors():
+async def get_pending_doctors(response: Response, page: PageParams = Depends()):
     """
-    Get a list of all doctors with 'pending' status.
-    (Using a simpler, more stable method).
+    Get a page of doctors with 'pending' status, oldest registration first.
+    Profiles and their users' emails are joined in a single aggregation.
+    Pass the X-Next-Cursor response header back as ?cursor= to get the next page.
     """
-    pending_profiles = await DoctorProfile.find(DoctorProfile.status == DoctorStatus.PENDING).to_list()
-    
-    response = []
-    for profile in pending_profiles:
-        # Fetch the corresponding user for each profile to get the email
-        user = await User.find_one(User.user_id == profile.doctor_id)
-        if user:
-            # Manually construct the response model
-            response.append(
-                DoctorAdminOut(
-                    doctor_id=profile.doctor_id,
-                    email=user.email,
-                    full_name=profile.full_name,
-                    specialty=profile.specialty,
-                    status=profile.status,
-                    photo_url=profile.photo_url,
-                    degree_url=profile.degree_url,
-                    bio=profile.bio
-                )
-            )
-    return response
+    pipeline = [
+        {"$match": {"status": DoctorStatus.PENDING.value, **cursor_filter(page, PENDING_DOCTORS_SORT)}},
+        {"$sort": dict(PENDING_DOCTORS_SORT)},
+        {"$limit": page.limit + 1},
+        {"$lookup": {
+            "from": User.get_settings().name,
+            "localField": "doctor_id",
+            "foreignField": "user_id",
+            "as": "user",
+        }},
+        {"$unwind": {"path": "$user", "preserveNullAndEmptyArrays": True}},
+        {"$project": {
+            "doctor_id": 1,
+            "email": "$user.email",
+            "full_name": 1,
+            "specialty": 1,
+            "status": 1,
+            "photo_url": 1,
+            "degree_url": 1,
+            "bio": 1,
+        }},
+    ]
+    rows = await DoctorProfile.aggregate(pipeline).to_list()
+    rows = split_page(rows, page, PENDING_DOCTORS_SORT, response)
+
+    # Profiles whose user account is missing are skipped, as before
+    return [DoctorAdminOut(**row) for row in rows if row.get("email")]
 
 @router.patch("/doctors/{doctor_id}/status", response_model=DoctorAdminOut)
 async def update_doctor_status(doctor_id: UUID, status_update: DoctorStatusUpdate):
     """
     Update a doctor's status to 'verified' or 'rejected'.
     """
-    profile = await DoctorProfile.find_one(DoctorProfile.doctor_id == doctor_id)
-    if not profile:
-        raise HTTPException(status_code=404, detail="Doctor profile not found")
-
-    if profile.status != DoctorStatus.PENDING:
+    # The pending check is part of the filter, so it and the write are one
+    # atomic find_one_and_update. The account lookup doesn't depend on it and
+    # runs alongside, so this costs a single round trip of latency.
+    profile, user = await asyncio.gather(
+        DoctorProfile.find_one(
+            DoctorProfile.doctor_id == doctor_id,
+            DoctorProfile.status == DoctorStatus.PENDING,
+        ).update(
+            Set({DoctorProfile.status: status_update.status}),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        ),
+        User.find_one(User.user_id == doctor_id),
+    )
+    if profile is None:
+        # Nothing matched; only this failure path reads again, to say why
+        existing = await DoctorProfile.find_one(DoctorProfile.doctor_id == doctor_id)
+        if not existing:
+            raise HTTPException(status_code=404, detail="Doctor profile not found")
         raise HTTPException(
             status_code=400, 
-            detail=f"Doctor is already {profile.status.value}."
+            detail=f"Doctor is already {existing.status.value}."
         )
 
-    profile.status = status_update.status
-    await profile.save()
+    invalidate_principal(profile.doctor_id)
+    doctor_directory.upsert(profile)
 
-    user = await User.find_one(User.user_id == profile.doctor_id)
     if not user:
         raise HTTPException(status_code=404, detail="Associated user account not found.")
 
@@ -67,4 +133,124 @@ async def update_doctor_status(doctor_id: UUID, status_update: DoctorStatusUpdat
     response_data['email'] = user.email
     response_data['doctor_id'] = profile.doctor_id
     
-    return DoctorAdminOut(**response_data)
\ No newline at end of file
+    return DoctorAdminOut(**response_data)
+
+@router.patch("/doctors/status", response_model=DoctorStatusBulkResult)
+async def update_doctor_statuses(body: DoctorStatusBulkUpdate):
+    """
+    Set the status of many pending doctors at once, e.g. to clear the review queue.
+    Only pending profiles change; every requested id gets its own outcome, in request order.
+    """
+    results = []
+    targets = {}  # doctor_id -> (requested status, index into results)
+    for item in body.updates:
+        if item.doctor_id in targets:
+            results.append({"doctor_id": item.doctor_id, "outcome": "duplicate"})
+        elif item.status == DoctorStatus.PENDING:
+            results.append({"doctor_id": item.doctor_id, "outcome": "invalid_status"})
+        else:
+            targets[item.doctor_id] = (item.status, len(results))
+            results.append(None)
+
+    def settle(doctor_id: UUID, outcome: str, status: Optional[DoctorStatus]):
+        results[targets[doctor_id][1]] = {"doctor_id": doctor_id, "outcome": outcome, "status": status}
+
+    # 1. One read for every requested profile; the directory needs them whole anyway
+    profiles = {
+        profile.doctor_id: profile
+        for profile in await DoctorProfile.find(In(DoctorProfile.doctor_id, list(targets))).to_list()
+    }
+    pending = {}  # requested status -> doctor_ids
+    for doctor_id, (status, _) in targets.items():
+        profile = profiles.get(doctor_id)
+        if profile is None:
+            settle(doctor_id, "not_found", None)
+        elif profile.status != DoctorStatus.PENDING:
+            settle(doctor_id, "not_pending", profile.status)
+        else:
+            pending.setdefault(status, []).append(doctor_id)
+
+    # 2. One update_many per requested status, still guarded on pending, sent together
+    statuses = list(pending)
+    updates = await asyncio.gather(*(
+        DoctorProfile.find(
+            In(DoctorProfile.doctor_id, pending[status]),
+            DoctorProfile.status == DoctorStatus.PENDING,
+        ).update_many(Set({DoctorProfile.status: status}))
+        for status in statuses
+    ))
+
+    # 3. Only if another request changed some of them in between: read those back
+    raced = {
+        doctor_id
+        for status, result in zip(statuses, updates) if result.modified_count < len(pending[status])
+        for doctor_id in pending[status]
+    }
+    current = {}
+    if raced:
+        current = {
+            profile.doctor_id: profile.status
+            for profile in await DoctorProfile.find(In(DoctorProfile.doctor_id, list(raced))).to_list()
+        }
+
+    changed = []
+    for status, doctor_ids in pending.items():
+        for doctor_id in doctor_ids:
+            if doctor_id in raced and doctor_id not in current:
+                settle(doctor_id, "not_found", None)  # Deleted in between
+                continue
+            # A concurrent request that set the same status is indistinguishable
+            # from our own write here; both asked for it, so it counts as updated
+            now = current.get(doctor_id) if doctor_id in raced else status
+            if now != status:
+                settle(doctor_id, "conflict", now)
+                continue
+            settle(doctor_id, "updated", status)
+            profile = profiles[doctor_id]
+            profile.status = status
+            changed.append(profile)
+
+    # Downstream caches are updated once for the whole batch
+    invalidate_principals(profile.doctor_id for profile in changed)
+    doctor_directory.upsert_many(changed)
+    return {"updated": len(changed), "results": results}
+
+@router.get("/stats/password-hashing")
+async def get_password_hashing_stats():
+    """
+    Timing and queue-depth stats for the bcrypt hashing pool.
+    Useful when sizing PASSWORD_HASH_WORKERS against login traffic.
+    """
+    return get_password_hash_stats()
+
+@router.get("/export/appointments")
+async def export_appointments(
+    params: ExportParams = Depends(),
+    status: Optional[AppointmentStatus] = None,
+):
+    """
+    Stream every appointment as NDJSON or CSV, optionally gzipped.
+    Filters: created between date_from and date_to, status, doctor_id.
+    """
+    query = params.filter("created_at")
+    if status is not None:
+        query["status"] = status.value
+    return export_response(Appointment, query, APPOINTMENT_EXPORT, params.format, params.gzip, "appointments")
+
+@router.get("/export/prescriptions")
+async def export_prescriptions(params: ExportParams = Depends()):
+    """
+    Stream every prescription as NDJSON or CSV, optionally gzipped.
+    Filters: issued between date_from and date_to, doctor_id.
+    """
+    query = params.filter("issued_date")
+    return export_response(Prescription, query, PRESCRIPTION_EXPORT, params.format, params.gzip, "prescriptions")
+
+@router.get("/export/reviews")
+async def export_reviews(params: ExportParams = Depends()):
+    """
+    Stream every review as NDJSON or CSV, optionally gzipped.
+    Filters: created between date_from and date_to, doctor_id.
+    """
+    query = params.filter("created_at")
+    return export_response(Review, query, REVIEW_EXPORT, params.format, params.gzip, "reviews")
@@ -1,29 +1,29 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import OAuth2PasswordRequestForm
-from typing import Optional
-from pydantic import EmailStr
+from pymongo.errors import DuplicateKeyError
 
 # Import models and schemas
 from models.user_models import User, DoctorProfile, Role, DoctorStatus
-from schemas.user_schemas import UserCreate, UserOut, DoctorOut, Token
+from schemas.user_schemas import (
+    UserCreate, UserOut, DoctorCreate, DoctorOut, Token,
+    UploadIntentCreate, UploadIntentOut, UploadFinalize, UploadedAssetOut,
+)
 
-# Import auth and cloudinary utilities
-from core.auth import get_password_hash, verify_password, create_access_token
-from core.cloudinary_utils import upload_file_to_cloudinary
+# Import auth and upload utilities
+from core.auth import get_password_hash_async, verify_password_async, create_access_token
+from core.uploads import create_upload_intent, finalize_upload, read_asset_token
 
 # CORRECTED LINE: Removed the prefix="/auth" from here
 router = APIRouter(tags=["Authentication"])
 
+DUPLICATE_EMAIL_DETAIL = "An account with this email already exists."
+
 @router.post("/register/patient", response_model=UserOut, status_code=201)
 async def register_patient(user_data: UserCreate):
     import traceback
     print("Received patient registration request for email:", user_data.email)
     try:
-        existing_user = await User.find_one(User.email == user_data.email)
-        print("Checked existing user:", existing_user)
-        if existing_user:
-            raise HTTPException(status_code=409, detail="An account with this email already exists.")    
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         print("Hashed password")
         new_user = User(
             email=user_data.email,
@@ -31,9 +31,16 @@ async def register_patient(user_data: UserCreate):
             role=Role.PATIENT
         )
         print("Created new user object")
-        await new_user.insert()
+        try:
+            # The unique email index rejects duplicates in the same round trip as the insert
+            await new_user.insert()
+        except DuplicateKeyError:
+            raise HTTPException(status_code=409, detail=DUPLICATE_EMAIL_DETAIL)
         print("Inserted new user into database")
         return new_user
+    except HTTPException:
+        # Let deliberate errors (409 duplicate email, 503 hashing pool busy) through unchanged
+        raise
     except Exception as e:
         import traceback
         print("Error during patient registration:", e)
@@ -41,53 +48,61 @@ async def register_patient(user_data: UserCreate):
         raise HTTPException(status_code=500, detail=f"Internal server error during patient registration: {str(e)}")
 
 
+@router.post("/uploads/intent", response_model=UploadIntentOut, status_code=201)
+async def create_upload(intent: UploadIntentCreate):
+    """
+    Issue short-lived signed parameters for uploading a registration file
+    (photo or degree) directly to storage.
+    """
+    return create_upload_intent(intent.kind, intent.content_type, intent.size)
+
+@router.post("/uploads/finalize", response_model=UploadedAssetOut)
+async def finalize_upload_intent(body: UploadFinalize):
+    """
+    Verify that a direct upload arrived intact and return the asset token
+    that links it to a doctor profile at registration.
+    """
+    return await finalize_upload(body.upload_token)
+
 @router.post("/register/doctor", response_model=DoctorOut, status_code=201)
-async def register_doctor(
-    email: EmailStr = Form(...),
-    password: str = Form(..., min_length=8),
-    full_name: str = Form(...),
-    specialty: str = Form(...),
-    bio: Optional[str] = Form(None),
-    photo: UploadFile = File(...),
-    degree: UploadFile = File(...)
-):
+async def register_doctor(doctor_data: DoctorCreate):
     import traceback
+    email = doctor_data.email
     print("Received doctor registration request for email:", email)
     try:
-        existing_user = await User.find_one(User.email == email)
-        print("Checked existing user:", existing_user)
-        if existing_user:
-            raise HTTPException(status_code=409, detail="An account with this email already exists.")    
-        hashed_password = get_password_hash(password)
+        # Checked before anything is written, so a bad token leaves no user behind
+        photo = read_asset_token(doctor_data.photo_asset, "photo")
+        degree = read_asset_token(doctor_data.degree_asset, "degree")
+        hashed_password = await get_password_hash_async(doctor_data.password)
         print("Hashed password")
-        try:
-            photo_result = await upload_file_to_cloudinary(photo, "clinic/doctor_photos")
-            degree_result = await upload_file_to_cloudinary(degree, "clinic/doctor_degrees")
-            print("Uploaded files to Cloudinary")
-        except Exception as e:
-            print("File upload failed:", e)
-            raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
         new_user = User(
             email=email,
             hashed_password=hashed_password,
             role=Role.DOCTOR
         )
         print("Created new user object")
-        await new_user.insert()
+        try:
+            # The unique email index rejects duplicates in the same round trip as the insert
+            await new_user.insert()
+        except DuplicateKeyError:
+            raise HTTPException(status_code=409, detail=DUPLICATE_EMAIL_DETAIL)
         print("Inserted new user into database")
         new_doctor_profile = DoctorProfile(
             doctor_id=new_user.user_id,
-            full_name=full_name,
-            specialty=specialty,
-            bio=bio,
-            photo_url=photo_result.get("secure_url"),
-            degree_url=degree_result.get("secure_url"),
+            full_name=doctor_data.full_name,
+            specialty=doctor_data.specialty,
+            bio=doctor_data.bio,
+            photo_url=photo["secure_url"],
+            degree_url=degree["secure_url"],
             status=DoctorStatus.PENDING
         )
         print("Created new doctor profile object")
         await new_doctor_profile.insert()
         print("Inserted new doctor profile into database")
         return new_doctor_profile
+    except HTTPException:
+        # Let deliberate errors (400 bad asset token, 409 duplicate email, 503 hashing pool busy) through unchanged
+        raise
     except Exception as e:
         import traceback
         print("Error during doctor registration:", e)
@@ -110,7 +125,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     user_dict = user.dict(exclude_unset=True)
 
     # Verify the password
-    if not verify_password(form_data.password, user_dict['hashed_password']):
+    if not await verify_password_async(form_data.password, user_dict['hashed_password']):
         raise HTTPException(status_code=401, detail="Incorrect password")
 
     # Check if the user is a doctor and if they are verified
@@ -1,15 +1,21 @@
 # File: clinic-backend/api/routes/doctor_routes.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from typing import List
-from beanie.operators import In
-from datetime import datetime
+from uuid import UUID
+from datetime import date, datetime
+from beanie import UpdateResponse
+from beanie.operators import Set
 
 # --- FIX 1: Import Role and User from user_models ---
 from models.user_models import User, Role
-from models.clinic_models import Appointment
-from schemas.clinic_schemas import AppointmentWithPatientInfo
+from models.clinic_models import Appointment, AppointmentStatus, Prescription
+from schemas.clinic_schemas import AppointmentWithPatientInfo, PrescriptionIssue, PrescriptionWithPatientInfo
 from api.dependencies import get_current_user
+from core.loaders import RequestLoaders, get_loaders, add_patient_names
+from core.lean import LeanShape, find_lean, lean_response
+from core.pagination import NEWEST_FIRST, NEWEST_ISSUED_FIRST, PageParams, cursor_filter, split_page
+from core.notifications import APPOINTMENT_STATUS_CHANGED, publish_appointment_event
 
 # --- FIX 2: Create a dependency to require a doctor role ---
 def require_doctor(current_user: User = Depends(get_current_user)):
@@ -21,6 +27,13 @@ def require_doctor(current_user: User = Depends(get_current_user)):
         )
     return current_user
 
+# Lean (raw, projected) reads for the appointment lists; see core/lean.py
+APPOINTMENT_SHAPE = LeanShape(AppointmentWithPatientInfo)
+PRESCRIPTION_SHAPE = LeanShape(PrescriptionWithPatientInfo)
+
+# Prescriptions can only be issued in appointments that are taking place
+PRESCRIBABLE_STATUSES = {AppointmentStatus.CONFIRMED, AppointmentStatus.COMPLETED}
+
 # --- Use the new require_doctor dependency for the whole router ---
 router = APIRouter(
     tags=["Doctor Data"],
@@ -29,39 +42,40 @@ router = APIRouter(
 
 @router.get("/me/appointments", response_model=List[AppointmentWithPatientInfo])
 # --- FIX 3: Use the correct dependency and variable name ---
-async def get_doctor_appointments(current_user: User = Depends(get_current_user)):
+async def get_doctor_appointments(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
+):
     """
-    Fetch all appointments for the currently logged-in doctor.
+    Fetch a page of appointments for the currently logged-in doctor, newest first.
     Exclude cancelled appointments.
     """
     from models.clinic_models import AppointmentStatus
-    # 1. Fetch all appointments for the doctor excluding cancelled
-    appointments = await Appointment.find(
-        Appointment.doctor_id == current_user.user_id,
-        Appointment.status != AppointmentStatus.CANCELLED
-    ).to_list()
-
-    if not appointments:
-        return []
-
-    # 2. Get unique patient IDs
-    patient_ids = {app.patient_id for app in appointments}
-
-    # 3. Fetch the corresponding patient user documents
-    patients = await User.find(In(User.user_id, patient_ids)).to_list()
-    patient_name_map = {patient.user_id: patient.full_name or "Unknown Patient" for patient in patients}
-
-    # 4. Combine data for the response
-    response_data = []
-    for app in appointments:
-        app_data = app.model_dump()
-        app_data['patient_name'] = app.patient_name or patient_name_map.get(app.patient_id, "Unknown Patient")
-        response_data.append(app_data)
-
-    return response_data
+    # 1. Fetch one page of appointments for the doctor excluding cancelled
+    appointments = await find_lean(
+        Appointment.find(
+            Appointment.doctor_id == current_user.user_id,
+            Appointment.status != AppointmentStatus.CANCELLED,
+            cursor_filter(page, NEWEST_FIRST),
+        ),
+        APPOINTMENT_SHAPE,
+        NEWEST_FIRST,
+        page.limit + 1,
+    )
+    appointments = split_page(appointments, page, NEWEST_FIRST, response)
+
+    # 2. Add patient names, fetched in one batched, projected lookup
+    await add_patient_names(appointments, loaders)
+    return lean_response(appointments, APPOINTMENT_SHAPE, response)
 
 @router.put("/me/appointments/{appointment_id}/status")
-async def update_appointment_status(appointment_id: str, status: str, current_user: User = Depends(get_current_user)):
+async def update_appointment_status(
+    appointment_id: str,
+    status: str,
+    current_user: User = Depends(get_current_user),
+):
     """
     Update the status of an appointment (confirm or decline) for the currently logged-in doctor.
     """
@@ -77,50 +91,120 @@ async def update_appointment_status(appointment_id: str, status: str, current_us
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid appointment ID format")
 
-    appointment = await Appointment.find_one(Appointment.appointment_id == app_id)
-    if not appointment:
-        raise HTTPException(status_code=404, detail="Appointment not found")
-
-    if appointment.doctor_id != current_user.user_id:
-        raise HTTPException(status_code=403, detail="Not authorized to update this appointment")
-
-    if appointment.status != AppointmentStatus.PENDING:
+    # Ownership and the pending check are part of the filter, so the check and
+    # the write are one atomic find_one_and_update
+    appointment = await Appointment.find_one(
+        Appointment.appointment_id == app_id,
+        Appointment.doctor_id == current_user.user_id,
+        Appointment.status == AppointmentStatus.PENDING,
+    ).update(
+        Set({
+            Appointment.status: AppointmentStatus.CONFIRMED if status == "confirmed" else AppointmentStatus.CANCELLED,
+            Appointment.updated_at: datetime.utcnow(),
+        }),
+        response_type=UpdateResponse.NEW_DOCUMENT,
+    )
+    if appointment is None:
+        # Nothing matched; only this failure path reads again, to say why
+        existing = await Appointment.find_one(Appointment.appointment_id == app_id)
+        if not existing:
+            raise HTTPException(status_code=404, detail="Appointment not found")
+        if existing.doctor_id != current_user.user_id:
+            raise HTTPException(status_code=403, detail="Not authorized to update this appointment")
         raise HTTPException(status_code=400, detail="Can only update pending appointments")
-
-    appointment.status = AppointmentStatus.CONFIRMED if status == "confirmed" else AppointmentStatus.CANCELLED
-    appointment.updated_at = datetime.utcnow()
-    await appointment.save()
+    await publish_appointment_event(APPOINTMENT_STATUS_CHANGED, appointment)
 
     return {"message": f"Appointment {status} successfully"}
 
 @router.get("/me/appointments/history", response_model=List[AppointmentWithPatientInfo])
-async def get_doctor_appointment_history(current_user: User = Depends(get_current_user)):
+async def get_doctor_appointment_history(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
+):
     """
-    Fetch all cancelled appointments for the currently logged-in doctor.
+    Fetch a page of cancelled appointments for the currently logged-in doctor, newest first.
     """
     from models.clinic_models import AppointmentStatus
 
-    # 1. Fetch all cancelled appointments for the doctor
-    cancelled_appointments = await Appointment.find(
-        Appointment.doctor_id == current_user.user_id,
-        Appointment.status == AppointmentStatus.CANCELLED
-    ).to_list()
-
-    if not cancelled_appointments:
-        return []
-
-    # 2. Get unique patient IDs
-    patient_ids = {app.patient_id for app in cancelled_appointments}
-
-    # 3. Fetch the corresponding patient user documents
-    patients = await User.find(In(User.user_id, patient_ids)).to_list()
-    patient_name_map = {patient.user_id: patient.full_name or "Unknown Patient" for patient in patients}
-
-    # 4. Combine data for the response
-    response_data = []
-    for app in cancelled_appointments:
-        app_data = app.model_dump()
-        app_data['patient_name'] = app.patient_name or patient_name_map.get(app.patient_id, "Unknown Patient")
-        response_data.append(app_data)
-
-    return response_data
+    # 1. Fetch one page of cancelled appointments for the doctor
+    cancelled_appointments = await find_lean(
+        Appointment.find(
+            Appointment.doctor_id == current_user.user_id,
+            Appointment.status == AppointmentStatus.CANCELLED,
+            cursor_filter(page, NEWEST_FIRST),
+        ),
+        APPOINTMENT_SHAPE,
+        NEWEST_FIRST,
+        page.limit + 1,
+    )
+    cancelled_appointments = split_page(cancelled_appointments, page, NEWEST_FIRST, response)
+
+    # 2. Add patient names, fetched in one batched, projected lookup
+    await add_patient_names(cancelled_appointments, loaders)
+    return lean_response(cancelled_appointments, APPOINTMENT_SHAPE, response)
+
+@router.post(
+    "/me/appointments/{appointment_id}/prescriptions",
+    response_model=List[PrescriptionWithPatientInfo],
+    status_code=201,
+)
+async def issue_prescriptions(
+    appointment_id: UUID,
+    body: PrescriptionIssue,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Issue one or more prescriptions to the patient of one of the doctor's
+    confirmed or completed appointments, written together in one insert_many.
+    """
+    appointment = await Appointment.find_one(Appointment.appointment_id == appointment_id)
+    if not appointment:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+    if appointment.doctor_id != current_user.user_id:
+        raise HTTPException(status_code=403, detail="Not authorized to prescribe for this appointment")
+    if appointment.status not in PRESCRIBABLE_STATUSES:
+        raise HTTPException(status_code=400, detail="Can only prescribe in confirmed or completed appointments")
+
+    issued_date = date.today()
+    prescriptions = [
+        Prescription(
+            patient_id=appointment.patient_id,
+            doctor_id=current_user.user_id,
+            appointment_id=appointment.appointment_id,
+            medication=item.medication,
+            dosage=item.dosage,
+            notes=item.notes,
+            issued_date=issued_date,
+        )
+        for item in body.prescriptions
+    ]
+    await Prescription.insert_many(prescriptions)
+    return [
+        PrescriptionWithPatientInfo(**prescription.model_dump(), patient_name=appointment.patient_name)
+        for prescription in prescriptions
+    ]
+
+@router.get("/me/prescriptions", response_model=List[PrescriptionWithPatientInfo])
+async def get_issued_prescriptions(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
+):
+    """
+    Fetch a page of the prescriptions the currently logged-in doctor has issued, most recent first.
+    """
+    prescriptions = await find_lean(
+        Prescription.find(
+            Prescription.doctor_id == current_user.user_id,
+            cursor_filter(page, NEWEST_ISSUED_FIRST),
+        ),
+        PRESCRIPTION_SHAPE,
+        NEWEST_ISSUED_FIRST,
+        page.limit + 1,
+    )
+    prescriptions = split_page(prescriptions, page, NEWEST_ISSUED_FIRST, response)
+    await add_patient_names(prescriptions, loaders)
+    return lean_response(prescriptions, PRESCRIPTION_SHAPE, response)
@@ -0,0 +1,29 @@
+# File: clinic-backend/api/routes/health_routes.py
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from core.db import ping, pool_monitor
+
+router = APIRouter(tags=["Health"])
+
+@router.get("/live")
+async def liveness():
+    """The process is up and serving requests."""
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def readiness(request: Request):
+    """
+    Ready to take traffic: the database answers a ping. Also reports the
+    connection pool's in-use, waiting and checkout wait figures for sizing
+    MONGO_MAX_POOL_SIZE against the number of workers.
+    """
+    try:
+        ping_ms = await ping(request.app.state.db_client)
+    except Exception as e:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "detail": str(e), "pool": pool_monitor.stats()},
+        )
+    return {"status": "ready", "database_ping_ms": ping_ms, "pool": pool_monitor.stats()}
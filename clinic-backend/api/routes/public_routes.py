@@ -1,37 +1,88 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import List, Optional
 from uuid import UUID
 
-from models.user_models import DoctorProfile, DoctorStatus
-from schemas.user_schemas import DoctorOut 
+from schemas.user_schemas import DoctorOut, DoctorSearchOut
+from core.doctor_directory import DIRECTORY_SORT, doctor_directory
+from core.doctor_search import SEARCH_SORT
+from core.pagination import NEXT_CURSOR_HEADER, PageParams, decode_cursor, encode_cursor
 
 # CORRECTED LINE: Removed the prefix="/public" from here
 router = APIRouter(tags=["Public Data"])
 
 @router.get("/doctors", response_model=List[DoctorOut])
-async def get_verified_doctors():
+async def get_verified_doctors(page: PageParams = Depends()):
     """
-    Fetch a list of all doctor profiles that have been verified by an admin.
-    This is a public endpoint.
+    Fetch a page of doctor profiles that have been verified by an admin, ordered by name.
+    This is a public endpoint, served from the in-memory doctor directory.
     """
-    verified_doctors = await DoctorProfile.find(
-        DoctorProfile.status == DoctorStatus.VERIFIED
-    ).to_list()
+    await doctor_directory.ensure_loaded()
+    after = decode_cursor(page.cursor, DIRECTORY_SORT) if page.cursor else None
+    if after is not None and not all(isinstance(value, str) for value in after):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    body, next_key = doctor_directory.page_json(after, page.limit)
 
-    return verified_doctors
+    response = Response(content=body, media_type="application/json")
+    if next_key is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(list(next_key))
+    return response
+
+# Declared before /doctors/{doctor_id} so "search" and "suggest" are not parsed as ids
+@router.get("/doctors/search", response_model=DoctorSearchOut)
+async def search_doctors(
+    q: Optional[str] = Query(None, max_length=200, description="Words to match in name, specialty or bio"),
+    specialty: Optional[str] = Query(None, description="Only return doctors with this specialty"),
+    page: PageParams = Depends(),
+):
+    """
+    Search verified doctors by name, specialty and bio, ranked by relevance.
+    The last word matches as a prefix, so partial input works for search-as-you-type.
+    Results include per-specialty facet counts. This is a public endpoint.
+    """
+    await doctor_directory.ensure_loaded()
+    after = decode_cursor(page.cursor, SEARCH_SORT) if page.cursor else None
+    if after is not None and not (
+        isinstance(after[0], (int, float)) and isinstance(after[1], str) and isinstance(after[2], str)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    doctor_ids, facets, next_key = doctor_directory.search_index.search(q, specialty, page.limit, after)
+    next_cursor = encode_cursor(list(next_key)) if next_key is not None else None
+
+    body = b"".join([
+        b'{"items":', doctor_directory.many_json(doctor_ids),
+        b',"facets":', json.dumps(facets).encode(),
+        b',"next_cursor":', json.dumps(next_cursor).encode(),
+        b"}",
+    ])
+    response = Response(content=body, media_type="application/json")
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
+
+@router.get("/doctors/suggest", response_model=List[DoctorOut])
+async def suggest_doctors(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+):
+    """
+    Autocomplete verified doctors by name. This is a public endpoint.
+    """
+    await doctor_directory.ensure_loaded()
+    doctor_ids = doctor_directory.search_index.suggest(q, limit)
+    return Response(content=doctor_directory.many_json(doctor_ids), media_type="application/json")
 
 @router.get("/doctors/{doctor_id}", response_model=DoctorOut)
 async def get_doctor_by_id(doctor_id: UUID):
     """
     Fetch the public profile of a single verified doctor by their user ID.
-    This is a public endpoint.
+    This is a public endpoint, served from the in-memory doctor directory.
     """
-    doctor_profile = await DoctorProfile.find_one(
-        DoctorProfile.doctor_id == doctor_id,
-        DoctorProfile.status == DoctorStatus.VERIFIED
-    )
+    await doctor_directory.ensure_loaded()
+    doctor_json = doctor_directory.get_json(doctor_id)
 
-    if not doctor_profile:
+    if doctor_json is None:
         raise HTTPException(status_code=404, detail="Verified doctor not found.")
 
-    return doctor_profile
\ No newline at end of file
+    return Response(content=doctor_json, media_type="application/json")
@@ -1,11 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from typing import List, Optional
 from uuid import UUID
 
-from models.user_models import User, Role
-from models.clinic_models import Review
-from schemas.clinic_schemas import ReviewCreate, ReviewOut
+from models.user_models import User, Role, DoctorProfile
+from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from models.clinic_models import Review, DoctorRatingSummary
+from schemas.clinic_schemas import ReviewCreate, ReviewOut, RatingSummaryOut
+from core.doctor_directory import doctor_directory
+from core.jobs import job_runner
 from api.dependencies import get_current_user
+from core.lean import LeanShape, find_lean, lean_response
+from core.pagination import NEWEST_FIRST, PageParams, cursor_filter, split_page
+
+# Lean (raw, projected) reads for the review list; see core/lean.py
+REVIEW_SHAPE = LeanShape(ReviewOut)
+
+# Reviews remembered on each rating summary, far more than could be folded in
+# between a job's first attempt and its retry
+RECENT_REVIEW_IDS = 100
 
 # CORRECTED LINE: Removed the prefix="/reviews" from here
 router = APIRouter(tags=["Reviews"])
@@ -21,6 +36,8 @@ async def create_review(
     """
     if current_user.role != Role.PATIENT:
         raise HTTPException(status_code=403, detail="Only patients can leave reviews.")
+    if await DoctorProfile.find_one(DoctorProfile.doctor_id == doctor_id) is None:
+        raise HTTPException(status_code=404, detail="Doctor not found.")
     
     new_review = Review(
         doctor_id=doctor_id,
@@ -29,12 +46,71 @@ async def create_review(
         comment=review_data.comment
     )
     await new_review.insert()
+    # The summary is updated by a job, so a failed update is retried rather than lost,
+    # and carries everything it needs, so the job never has to read the review back
+    await job_runner.enqueue("reviews.count_rating", {
+        "review_id": new_review.review_id, "doctor_id": doctor_id, "rating": new_review.rating,
+    })
     return new_review
 
+@job_runner.handler("reviews.count_rating", concurrency=4)
+async def count_rating(review_id: UUID, doctor_id: Optional[UUID] = None, rating: Optional[int] = None):
+    """Folds a new review into its doctor's rating summary, exactly once."""
+    if doctor_id is None or rating is None:
+        # Queued before the payload carried the review's doctor and rating
+        review = await Review.find_one(Review.review_id == review_id)
+        if review is None:
+            return
+        doctor_id, rating = review.doctor_id, review.rating
+    collection = DoctorRatingSummary.get_motor_collection()
+    for attempt in range(2):
+        try:
+            # Matches nothing if this review was already counted; the upsert then
+            # collides with the existing summary instead of counting it again
+            document = await collection.find_one_and_update(
+                {"doctor_id": doctor_id, "recent_review_ids": {"$ne": review_id}},
+                {
+                    "$inc": {"review_count": 1, "rating_total": rating, f"histogram.{rating}": 1},
+                    "$set": {"updated_at": datetime.utcnow()},
+                    "$push": {"recent_review_ids": {"$each": [review_id], "$slice": -RECENT_REVIEW_IDS}},
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            break
+        except DuplicateKeyError:
+            # Either already counted, or another job created the doctor's first
+            # summary at the same time; only the first means we are done
+            if await collection.find_one({"doctor_id": doctor_id, "recent_review_ids": review_id}):
+                return
+            if attempt:
+                raise  # The job runner retries it later
+    doctor_directory.update_rating(DoctorRatingSummary.model_validate(document))
+
+@router.get("/{doctor_id}/summary", response_model=RatingSummaryOut)
+async def get_rating_summary(doctor_id: UUID):
+    """
+    Get a doctor's review count, average rating and 1-5 star histogram.
+    This is a public endpoint and reads a single summary document.
+    """
+    summary = await DoctorRatingSummary.find_one(DoctorRatingSummary.doctor_id == doctor_id)
+    if summary is None:
+        return RatingSummaryOut.empty(doctor_id)
+    return RatingSummaryOut.from_summary(summary)
+
 @router.get("/{doctor_id}", response_model=List[ReviewOut])
-async def get_reviews_for_doctor(doctor_id: UUID):
+async def get_reviews_for_doctor(doctor_id: UUID, response: Response, page: PageParams = Depends()):
     """
-    Get all reviews for a specific doctor. This is a public endpoint.
+    Get a page of reviews for a specific doctor, newest first. This is a public endpoint.
     """
-    reviews = await Review.find(Review.doctor_id == doctor_id).to_list()
-    return reviews
\ No newline at end of file
+    reviews = await find_lean(
+        Review.find(
+            Review.doctor_id == doctor_id,
+            cursor_filter(page, NEWEST_FIRST),
+        ),
+        REVIEW_SHAPE,
+        NEWEST_FIRST,
+        page.limit + 1,
+    )
+    reviews = split_page(reviews, page, NEWEST_FIRST, response)
+    return lean_response(reviews, REVIEW_SHAPE, response)
\ No newline at end of file
@@ -1,13 +1,20 @@
 # File: clinic-backend/api/routes/user_routes.py
-# Add this import at the top
-from beanie.operators import In
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pymongo.errors import DuplicateKeyError
 from typing import List
 
-from models.user_models import User,DoctorProfile
+from models.user_models import User
 from models.clinic_models import Appointment, Prescription
 from schemas.clinic_schemas import AppointmentCreate, AppointmentOut, PrescriptionOut,AppointmentWithDoctorInfo
 from api.dependencies import get_current_user
+from core.loaders import RequestLoaders, get_loaders, add_doctor_names
+from core.lean import LeanShape, find_lean, lean_response
+from core.pagination import NEWEST_FIRST, NEWEST_ISSUED_FIRST, PageParams, cursor_filter, split_page
+from core.notifications import APPOINTMENT_CREATED, APPOINTMENT_DELETED, publish_appointment_event
+
+# Lean (raw, projected) reads for the list endpoints; see core/lean.py
+APPOINTMENT_SHAPE = LeanShape(AppointmentWithDoctorInfo)
+PRESCRIPTION_SHAPE = LeanShape(PrescriptionOut)
 
 router = APIRouter( 
     tags=["User Data"],
@@ -15,9 +22,13 @@ router = APIRouter(
 )
 
 @router.post("/me/appointments", response_model=AppointmentOut)
-async def create_appointment(appointment_data: AppointmentCreate, current_user: User = Depends(get_current_user)):
+async def create_appointment(
+    appointment_data: AppointmentCreate,
+    current_user: User = Depends(get_current_user),
+):
     """
     Create a new appointment for the currently logged-in patient.
+    Fails with 409 if the doctor already has a live booking in that slot.
     """
     appointment = Appointment(
         patient_id=current_user.user_id,
@@ -31,108 +42,129 @@ async def create_appointment(appointment_data: AppointmentCreate, current_user:
         patient_phone=appointment_data.patient_phone,
         patient_address=appointment_data.patient_address
     )
-    await appointment.insert()
+    try:
+        # The unique slot index makes the clash check and the insert one atomic step
+        await appointment.insert()
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=409,
+            detail="This time slot is already booked. Please choose another time."
+        )
+    await publish_appointment_event(APPOINTMENT_CREATED, appointment)
     return appointment
 
 @router.get("/me/appointments", response_model=List[AppointmentWithDoctorInfo])
-async def get_my_appointments(current_user: User = Depends(get_current_user)):
+async def get_my_appointments(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
+):
     """
-    Fetch all appointments for the currently logged-in user, including doctor's name.
-    Exclude cancelled appointments.
+    Fetch a page of appointments for the currently logged-in user, newest first,
+    including doctor's name. Exclude cancelled appointments.
     """
     from models.clinic_models import AppointmentStatus
-    # 1. Fetch all appointments for the patient excluding cancelled
-    appointments = await Appointment.find(
-        Appointment.patient_id == current_user.user_id,
-        Appointment.status != AppointmentStatus.CANCELLED
-    ).to_list()
-
-    if not appointments:
-        return []
-
-    # 2. Get a unique list of all doctor IDs from these appointments
-    doctor_ids = {app.doctor_id for app in appointments}
-
-    # 3. Fetch all the required doctor profiles in a single query
-    doctor_profiles = await DoctorProfile.find(
-    In(DoctorProfile.doctor_id, doctor_ids) # This is the correct syntax
-).to_list()
-
-    # 4. Create a quick lookup map of doctor_id -> doctor_name
-    doctor_name_map = {profile.doctor_id: profile.full_name for profile in doctor_profiles}
-
-    # 5. Combine the appointment data with the doctor's name
-    response_data = []
-    for app in appointments:
-        appointment_data = app.model_dump()
-        appointment_data['doctor_name'] = doctor_name_map.get(app.doctor_id, "Unknown Doctor")
-        response_data.append(appointment_data)
+    # 1. Fetch one page of appointments for the patient excluding cancelled
+    appointments = await find_lean(
+        Appointment.find(
+            Appointment.patient_id == current_user.user_id,
+            Appointment.status != AppointmentStatus.CANCELLED,
+            cursor_filter(page, NEWEST_FIRST),
+        ),
+        APPOINTMENT_SHAPE,
+        NEWEST_FIRST,
+        page.limit + 1,
+    )
+    appointments = split_page(appointments, page, NEWEST_FIRST, response)
 
-    return response_data
+    # 2. Add doctor names, fetched in one batched, projected lookup
+    await add_doctor_names(appointments, loaders)
+    return lean_response(appointments, APPOINTMENT_SHAPE, response)
 
 @router.get("/me/appointments/history", response_model=List[AppointmentWithDoctorInfo])
-async def get_my_appointment_history(current_user: User = Depends(get_current_user)):
+async def get_my_appointment_history(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
+):
     """
-    Fetch all cancelled appointments for the currently logged-in user, including doctor's name.
+    Fetch a page of cancelled appointments for the currently logged-in user,
+    newest first, including doctor's name.
     """
     from models.clinic_models import AppointmentStatus
 
-    # 1. Fetch all cancelled appointments for the patient
-    cancelled_appointments = await Appointment.find(
-        Appointment.patient_id == current_user.user_id,
-        Appointment.status == AppointmentStatus.CANCELLED
-    ).to_list()
-
-    if not cancelled_appointments:
-        return []
-
-    # 2. Get a unique list of all doctor IDs from these cancelled appointments
-    doctor_ids = {app.doctor_id for app in cancelled_appointments}
-
-    # 3. Fetch all the required doctor profiles in a single query
-    doctor_profiles = await DoctorProfile.find(
-        In(DoctorProfile.doctor_id, doctor_ids)
-    ).to_list()
-
-    # 4. Create a quick lookup map of doctor_id -> doctor_name
-    doctor_name_map = {profile.doctor_id: profile.full_name for profile in doctor_profiles}
-
-    # 5. Combine the appointment data with the doctor's name
-    response_data = []
-    for app in cancelled_appointments:
-        appointment_data = app.model_dump()
-        appointment_data['doctor_name'] = doctor_name_map.get(app.doctor_id, "Unknown Doctor")
-        response_data.append(appointment_data)
+    # 1. Fetch one page of cancelled appointments for the patient
+    cancelled_appointments = await find_lean(
+        Appointment.find(
+            Appointment.patient_id == current_user.user_id,
+            Appointment.status == AppointmentStatus.CANCELLED,
+            cursor_filter(page, NEWEST_FIRST),
+        ),
+        APPOINTMENT_SHAPE,
+        NEWEST_FIRST,
+        page.limit + 1,
+    )
+    cancelled_appointments = split_page(cancelled_appointments, page, NEWEST_FIRST, response)
 
-    return response_data
+    # 2. Add doctor names, fetched in one batched, projected lookup
+    await add_doctor_names(cancelled_appointments, loaders)
+    return lean_response(cancelled_appointments, APPOINTMENT_SHAPE, response)
 
 @router.delete("/me/appointments/{appointment_id}")
-async def delete_appointment(appointment_id: str, current_user: User = Depends(get_current_user)):
+async def delete_appointment(
+    appointment_id: str,
+    current_user: User = Depends(get_current_user),
+):
     """
     Delete a pending appointment for the currently logged-in patient.
     """
     from uuid import UUID
     from models.clinic_models import AppointmentStatus
 
-    appointment = await Appointment.find_one(Appointment.appointment_id == UUID(appointment_id))
-    if not appointment:
-        raise HTTPException(status_code=404, detail="Appointment not found")
-
-    if appointment.patient_id != current_user.user_id:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this appointment")
-
-    if appointment.status != AppointmentStatus.PENDING:
+    try:
+        app_id = UUID(appointment_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid appointment ID format")
+
+    # Ownership and the pending check are part of the filter, so the check and
+    # the delete are one atomic find_one_and_delete
+    document = await Appointment.get_motor_collection().find_one_and_delete({
+        "appointment_id": app_id,
+        "patient_id": current_user.user_id,
+        "status": AppointmentStatus.PENDING.value,
+    })
+    if document is None:
+        # Nothing matched; only this failure path reads again, to say why
+        existing = await Appointment.find_one(Appointment.appointment_id == app_id)
+        if not existing:
+            raise HTTPException(status_code=404, detail="Appointment not found")
+        if existing.patient_id != current_user.user_id:
+            raise HTTPException(status_code=403, detail="Not authorized to delete this appointment")
         raise HTTPException(status_code=400, detail="Can only delete pending appointments")
 
-    await appointment.delete()
+    appointment = Appointment.model_validate(document)
+    await publish_appointment_event(APPOINTMENT_DELETED, appointment)
     return {"message": "Appointment deleted successfully"}
 
 @router.get("/me/prescriptions", response_model=List[PrescriptionOut])
-async def get_my_prescriptions(current_user: User = Depends(get_current_user)):
+async def get_my_prescriptions(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: User = Depends(get_current_user),
+):
     """
-    Fetch all prescriptions for the currently logged-in user.
+    Fetch a page of prescriptions for the currently logged-in user, most recently issued first.
     """
-    prescriptions = await Prescription.find(
-        Prescription.patient_id == current_user.user_id
-    ).to_list()
-    return prescriptions
+    prescriptions = await find_lean(
+        Prescription.find(
+            Prescription.patient_id == current_user.user_id,
+            cursor_filter(page, NEWEST_ISSUED_FIRST),
+        ),
+        PRESCRIPTION_SHAPE,
+        NEWEST_ISSUED_FIRST,
+        page.limit + 1,
+    )
+    prescriptions = split_page(prescriptions, page, NEWEST_ISSUED_FIRST, response)
+    return lean_response(prescriptions, PRESCRIPTION_SHAPE, response)
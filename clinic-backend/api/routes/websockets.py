@@ -1,42 +1,64 @@
 # File: clinic-backend/api/routes/websockets.py
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import List
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
 
-router = APIRouter(prefix="/ws", tags=["WebSockets"])
+from api.dependencies import get_current_user
+from core.backplane import backplane
+from core.connections import ConnectionManager
+from core.notifications import events_since, user_connections
 
-class ConnectionManager:
-    """Manages active WebSocket connections."""
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
+# The "/ws" prefix is applied in main.py
+router = APIRouter(tags=["WebSockets"])
 
 manager = ConnectionManager()
+# Room messages go through the backplane so members on other workers receive them too
+backplane.add_handler("room", manager.broadcast)
 
 @router.websocket("/video-call/{room_id}")
 async def websocket_endpoint(websocket: WebSocket, room_id: str):
     """
     WebSocket endpoint for video call signaling.
-    A real implementation would use the room_id to manage specific call rooms.
+    Messages are relayed to every member of the same room, on any worker.
     """
-    await manager.connect(websocket)
-    await manager.broadcast(f"A new user joined the call in room {room_id}")
+    await manager.connect(websocket, room_id)
+    await backplane.publish("room", room_id, f"A new user joined the call in room {room_id}")
     try:
         while True:
             # Wait for messages from the client
             data = await websocket.receive_text()
             # For a real WebRTC app, this would handle signaling messages (offers, answers, candidates)
-            await manager.broadcast(f"Message received in room {room_id}: {data}")
+            await backplane.publish("room", room_id, f"Message received in room {room_id}: {data}")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(websocket, room_id)
+        await backplane.publish("room", room_id, f"A user left the call in room {room_id}")
+
+
+@router.websocket("/notifications")
+async def notifications_endpoint(websocket: WebSocket, token: str, since: int = 0):
+    """
+    Per-user push channel for appointment changes (NotificationOut JSON frames).
+    Browsers can't set headers on a websocket, so the access token is a query
+    parameter. Pass the last `seq` seen as `since` after a reconnect to replay
+    what was missed; a live event can arrive before the replay finishes, so
+    clients should order by seq and skip ones they have already applied.
+    """
+    try:
+        user = await get_current_user(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    room = str(user.user_id)
+    await user_connections.connect(websocket, room)
+    try:
+        for message in await events_since(user.user_id, since):
+            user_connections.send(websocket, room, message)
+        while True:
+            # Nothing is expected from the client; this just waits for it to leave
+            await websocket.receive_text()
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
-        await manager.broadcast(f"A user left the call in room {room_id}")
\ No newline at end of file
+        pass
+    finally:
+        user_connections.disconnect(websocket, room)
@@ -0,0 +1,10 @@
+# Shared by benchmarks/seed.py, which creates these accounts, and
+# benchmarks/run.py, which logs in as them. Kept free of app imports so
+# run.py needs nothing but httpx.
+
+BENCH_PASSWORD = "benchmark-password"
+BENCH_DOMAIN = "bench.clinic"
+
+# The database seed.py fills by default. The API under test must be started
+# against it, e.g. DATABASE_NAME=clinic_bench uvicorn main:app
+BENCH_DATABASE = "clinic_bench"
@@ -0,0 +1,195 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from accounts import BENCH_DATABASE, BENCH_DOMAIN, BENCH_PASSWORD
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+class Endpoint:
+    """One benchmarked route: `build` returns (path, params) for the next request."""
+    def __init__(self, name: str, role: Optional[str], build: Callable[[random.Random], tuple], method: str = "GET", form: Optional[dict] = None):
+        self.name = name
+        self.role = role
+        self.build = build
+        self.method = method
+        self.form = form
+
+def endpoints(doctor_ids: List[str]) -> List[Endpoint]:
+    def doctor(rng):
+        return rng.choice(doctor_ids)
+    return [
+        Endpoint("public.list_doctors", None, lambda rng: ("/public/doctors", {"limit": 50})),
+        Endpoint("public.get_doctor", None, lambda rng: (f"/public/doctors/{doctor(rng)}", None)),
+        Endpoint("public.search_doctors", None, lambda rng: ("/public/doctors/search", {"q": rng.choice(["cardio", "neuro", "smith", "pediatrics"])})),
+        Endpoint("public.suggest_doctors", None, lambda rng: ("/public/doctors/suggest", {"q": rng.choice(["ma", "li", "pr"])})),
+        Endpoint("reviews.list", None, lambda rng: (f"/reviews/{doctor(rng)}", {"limit": 50})),
+        Endpoint("reviews.summary", None, lambda rng: (f"/reviews/{doctor(rng)}/summary", None)),
+        Endpoint("users.appointments", "patient", lambda rng: ("/users/me/appointments", {"limit": 50})),
+        Endpoint("users.appointment_history", "patient", lambda rng: ("/users/me/appointments/history", {"limit": 50})),
+        Endpoint("users.prescriptions", "patient", lambda rng: ("/users/me/prescriptions", {"limit": 50})),
+        Endpoint("doctors.appointments", "doctor", lambda rng: ("/doctors/me/appointments", {"limit": 50})),
+        Endpoint("doctors.appointment_history", "doctor", lambda rng: ("/doctors/me/appointments/history", {"limit": 50})),
+        Endpoint("doctors.prescriptions", "doctor", lambda rng: ("/doctors/me/prescriptions", {"limit": 50})),
+        Endpoint("admin.pending_doctors", "admin", lambda rng: ("/admin/doctors/pending", {"limit": 50})),
+        Endpoint(
+            "auth.login", None, lambda rng: ("/auth/login", None), method="POST",
+            form={"username": f"patient0@{BENCH_DOMAIN}", "password": BENCH_PASSWORD},
+        ),
+    ]
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+async def login(client: httpx.AsyncClient, email: str) -> str:
+    response = await client.post("/auth/login", data={"username": email, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+async def bench_endpoint(client, endpoint: Endpoint, tokens: Dict[str, List[str]], requests: int, concurrency: int, seed: int) -> dict:
+    """Fires `requests` requests with `concurrency` in flight at all times."""
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            path, params = endpoint.build(rng)
+            headers = {}
+            if endpoint.role is not None:
+                headers["Authorization"] = f"Bearer {rng.choice(tokens[endpoint.role])}"
+            started = time.perf_counter()
+            try:
+                response = await client.request(endpoint.method, path, params=params, headers=headers, data=endpoint.form)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(1000 * percentile(latencies, 0.50), 2),
+        "p95_ms": round(1000 * percentile(latencies, 0.95), 2),
+        "p99_ms": round(1000 * percentile(latencies, 0.99), 2),
+    }
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Endpoints whose p95 rose, or throughput fell, by more than `tolerance`."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if base["p95_ms"] and result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms -> {result['p95_ms']}ms")
+        if base["rps"] and result["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {base['rps']} rps -> {result['rps']} rps")
+    return regressions
+
+def print_table(results: Dict[str, dict], baseline: Dict[str, dict]):
+    print(f"{'endpoint':32} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}  vs baseline p95")
+    for name, r in results.items():
+        delta = ""
+        base = baseline.get(name)
+        if base and base["p95_ms"]:
+            delta = f"{100 * (r['p95_ms'] - base['p95_ms']) / base['p95_ms']:+.1f}%"
+        print(f"{name:32} {r['rps']:>9} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9} {r['errors']:>7}  {delta}")
+
+async def main():
+    """
+    Drives every router of a running server at fixed concurrency and reports
+    latency percentiles and throughput per endpoint. Seed a database with
+    benchmarks/seed.py first and start the server against it, e.g.
+    DATABASE_NAME=clinic_bench uvicorn main:app
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the clinic API.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=100, help="Unmeasured requests per endpoint")
+    parser.add_argument("--only", help="Comma-separated endpoint names to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed regression before failing, as a fraction")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        print("--- Clinic API Benchmark ---")
+        try:
+            tokens = {
+                "patient": [await login(client, f"patient{i}@{BENCH_DOMAIN}") for i in range(5)],
+                "doctor": [await login(client, f"doctor{i}@{BENCH_DOMAIN}") for i in range(5)],
+                "admin": [await login(client, f"admin@{BENCH_DOMAIN}")],
+            }
+        except httpx.HTTPStatusError as e:
+            print(f"Could not log in as the benchmark accounts ({e.response.status_code}). Is the server running "
+                  f"with DATABASE_NAME={BENCH_DATABASE} (or the database you seeded)?")
+            return 1
+        directory = (await client.get("/public/doctors", params={"limit": 200})).json()
+        doctor_ids = [doctor["doctor_id"] for doctor in directory]
+        if not doctor_ids:
+            print("No verified doctors found. Seed the database with benchmarks/seed.py first.")
+            return 1
+
+        selected = endpoints(doctor_ids)
+        if args.only:
+            wanted = set(args.only.split(","))
+            selected = [endpoint for endpoint in selected if endpoint.name in wanted]
+
+        results = {}
+        for endpoint in selected:
+            await bench_endpoint(client, endpoint, tokens, args.warmup, args.concurrency, args.seed)
+            results[endpoint.name] = await bench_endpoint(client, endpoint, tokens, args.requests, args.concurrency, args.seed)
+            print(f"  {endpoint.name}: {results[endpoint.name]['rps']} rps, p95 {results[endpoint.name]['p95_ms']}ms")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        if stored.get("concurrency") != args.concurrency:
+            print(f"Note: the baseline was recorded at concurrency {stored.get('concurrency')}, not {args.concurrency}.")
+        baseline = stored.get("results", {})
+
+    print()
+    print_table(results, baseline)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"concurrency": args.concurrency, "requests": args.requests, "results": results}, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions beyond tolerance:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,218 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from uuid import UUID
+from dotenv import load_dotenv
+
+# Allow script to import from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Load .env file
+dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
+load_dotenv(dotenv_path=dotenv_path)
+
+# These imports MUST come AFTER loading the .env file
+from core.config import settings
+from core.auth import get_password_hash
+from models.user_models import User, DoctorProfile
+from models.clinic_models import Appointment, Prescription, Review, DoctorRatingSummary
+from accounts import BENCH_DATABASE, BENCH_DOMAIN, BENCH_PASSWORD
+
+# Full-size dataset; --scale shrinks every count proportionally
+VOLUMES = {
+    "patients": 100_000,
+    "doctors": 20_000,
+    "appointments": 2_000_000,
+    "reviews": 500_000,
+    "prescriptions": 300_000,
+}
+
+BATCH_SIZE = 10_000
+
+SPECIALTIES = [
+    "Cardiology", "Dermatology", "Neurology", "Pediatrics", "Orthopedics",
+    "Psychiatry", "Oncology", "Ophthalmology", "General Practice", "Endocrinology",
+]
+FIRST_NAMES = ["Aarav", "Maya", "Liam", "Priya", "Noah", "Sara", "Omar", "Elena", "Kenji", "Zoe", "Ravi", "Anna"]
+LAST_NAMES = ["Sharma", "Smith", "Khan", "Garcia", "Chen", "Patel", "Müller", "Rossi", "Singh", "Okafor", "Kim"]
+# "9:00 AM" ... "4:30 PM", the same normalized form AppointmentCreate produces
+TIME_SLOTS = [f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}" for hour in range(9, 17) for minute in (0, 30)]
+STATUSES = ["pending", "confirmed", "completed", "cancelled"]
+STATUS_WEIGHTS = [2, 3, 4, 1]
+
+def bench_uuid(kind: int, index: int) -> UUID:
+    """Deterministic ids, so runs against the same seed hit the same documents."""
+    return UUID(int=(kind << 64) | index)
+
+def patient_id(i: int) -> UUID:
+    return bench_uuid(1, i)
+
+def doctor_id(i: int) -> UUID:
+    return bench_uuid(2, i)
+
+def name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+async def insert_batches(model, documents, total: int, label: str):
+    """Raw unordered insert_many in batches: no per-document validation or hooks."""
+    collection = model.get_motor_collection()
+    started = time.perf_counter()
+    batch = []
+    inserted = 0
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= BATCH_SIZE:
+            await collection.insert_many(batch, ordered=False)
+            inserted += len(batch)
+            batch = []
+            print(f"\r  {label}: {inserted}/{total}", end="", flush=True)
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+        inserted += len(batch)
+    elapsed = time.perf_counter() - started
+    print(f"\r  {label}: {inserted} in {elapsed:.1f}s ({inserted / max(elapsed, 1e-9):,.0f}/s)")
+
+def users(counts, rng, hashed_password, now):
+    yield {
+        "user_id": bench_uuid(0, 0), "email": f"admin@{BENCH_DOMAIN}", "full_name": "Bench Admin",
+        "hashed_password": hashed_password, "role": "admin", "is_active": True, "created_at": now,
+    }
+    for i in range(counts["patients"]):
+        yield {
+            "user_id": patient_id(i), "email": f"patient{i}@{BENCH_DOMAIN}", "full_name": name(rng),
+            "hashed_password": hashed_password, "role": "patient", "is_active": True,
+            "created_at": now - timedelta(days=rng.randint(0, 730)),
+        }
+    for i in range(counts["doctors"]):
+        yield {
+            "user_id": doctor_id(i), "email": f"doctor{i}@{BENCH_DOMAIN}", "full_name": None,
+            "hashed_password": hashed_password, "role": "doctor", "is_active": True,
+            "created_at": now - timedelta(days=rng.randint(0, 730)),
+        }
+
+def doctor_profiles(counts, rng):
+    for i in range(counts["doctors"]):
+        specialty = rng.choice(SPECIALTIES)
+        yield {
+            "doctor_id": doctor_id(i),
+            "full_name": f"Dr. {name(rng)}",
+            "specialty": specialty,
+            "bio": f"{specialty} specialist with {rng.randint(1, 30)} years of experience.",
+            "photo_url": None,
+            "degree_url": None,
+            # Most doctors are verified; a tail waits in the admin queue
+            "status": "pending" if i % 20 == 19 else "verified",
+        }
+
+def appointments(counts, rng, now):
+    doctors = counts["doctors"]
+    first_day = datetime(now.year, now.month, now.day) - timedelta(days=365)
+    for i in range(counts["appointments"]):
+        # Walk each doctor's calendar slot by slot so the unique slot index never clashes
+        slot = i // doctors
+        created_at = now - timedelta(minutes=rng.randint(0, 730 * 24 * 60))
+        yield {
+            "appointment_id": bench_uuid(3, i),
+            "patient_id": patient_id(rng.randrange(counts["patients"])),
+            "doctor_id": doctor_id(i % doctors),
+            "appointment_date": first_day + timedelta(days=slot // len(TIME_SLOTS)),
+            "appointment_time": TIME_SLOTS[slot % len(TIME_SLOTS)],
+            "reason": "Follow-up visit",
+            "notes": None,
+            "status": rng.choices(STATUSES, STATUS_WEIGHTS)[0],
+            "patient_name": None,
+            "patient_email": None,
+            "patient_phone": None,
+            "patient_address": None,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+def reviews(counts, rng, now, summaries):
+    for i in range(counts["reviews"]):
+        # Skewed towards low doctor indices: a few popular doctors get most reviews
+        doctor = doctor_id(int(counts["doctors"] * rng.random() ** 2))
+        rating = rng.choices([1, 2, 3, 4, 5], [1, 1, 2, 4, 5])[0]
+        summary = summaries.setdefault(doctor, {"review_count": 0, "rating_total": 0, "histogram": {}})
+        summary["review_count"] += 1
+        summary["rating_total"] += rating
+        summary["histogram"][str(rating)] = summary["histogram"].get(str(rating), 0) + 1
+        yield {
+            "review_id": bench_uuid(4, i),
+            "doctor_id": doctor,
+            "patient_id": patient_id(rng.randrange(counts["patients"])),
+            "rating": rating,
+            "comment": None if rng.random() < 0.6 else "Very attentive and clear.",
+            "created_at": now - timedelta(minutes=rng.randint(0, 730 * 24 * 60)),
+        }
+
+def prescriptions(counts, rng, now):
+    today = datetime(now.year, now.month, now.day)
+    for i in range(counts["prescriptions"]):
+        yield {
+            "prescription_id": bench_uuid(5, i),
+            "patient_id": patient_id(rng.randrange(counts["patients"])),
+            "doctor_id": doctor_id(rng.randrange(counts["doctors"])),
+            "medication": rng.choice(["Amoxicillin", "Ibuprofen", "Metformin", "Atorvastatin", "Lisinopril"]),
+            "dosage": rng.choice(["250mg", "500mg", "10mg", "20mg"]),
+            "notes": None,
+            "issued_date": today - timedelta(days=rng.randint(0, 730)),
+        }
+
+async def main():
+    """
+    Seeds a dedicated benchmark database with a large synthetic dataset.
+    Ids and data are derived from --seed, so every run produces the same dataset.
+    """
+    parser = argparse.ArgumentParser(description="Seed a benchmark database.")
+    parser.add_argument("--database", default=BENCH_DATABASE, help="Database to (re)create")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every volume, e.g. 0.01 for a quick run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--drop", action="store_true", help="Drop the benchmark database first")
+    args = parser.parse_args()
+
+    if args.database == settings.DATABASE_NAME:
+        print(f"Refusing to seed the application database '{args.database}'. Pick a dedicated one.")
+        return
+
+    print("--- Benchmark Seed Script ---")
+    counts = {kind: max(1, int(volume * args.scale)) for kind, volume in VOLUMES.items()}
+    print(", ".join(f"{kind}={count:,}" for kind, count in counts.items()))
+
+    # Point the app at the benchmark database; init_db also creates every index
+    settings.DATABASE_NAME = args.database
+    from core.db import create_client, init_db, close_db
+    if args.drop:
+        client = create_client()
+        await client.drop_database(args.database)
+        close_db(client)
+    client = await init_db()
+
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    summaries = {}
+
+    await insert_batches(User, users(counts, rng, hashed_password, now), counts["patients"] + counts["doctors"] + 1, "users")
+    await insert_batches(DoctorProfile, doctor_profiles(counts, rng), counts["doctors"], "doctor profiles")
+    await insert_batches(Appointment, appointments(counts, rng, now), counts["appointments"], "appointments")
+    await insert_batches(Review, reviews(counts, rng, now, summaries), counts["reviews"], "reviews")
+    await insert_batches(
+        DoctorRatingSummary,
+        ({"doctor_id": doctor, "updated_at": now, **summary} for doctor, summary in summaries.items()),
+        len(summaries),
+        "rating summaries",
+    )
+    await insert_batches(Prescription, prescriptions(counts, rng, now), counts["prescriptions"], "prescriptions")
+
+    close_db(client)
+    print(f"Done. Log in as patient0@{BENCH_DOMAIN}, doctor0@{BENCH_DOMAIN} or admin@{BENCH_DOMAIN} "
+          f"with password '{BENCH_PASSWORD}'.")
+    print(f"Start the API under test with DATABASE_NAME={args.database} before running benchmarks/run.py.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,9 @@
 # File: clinic-backend/core/auth.py
 
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
 from jose import JWTError, jwt
@@ -19,6 +23,102 @@ def get_password_hash(password: str) -> str:
     """Hashes a plain password."""
     return pwd_context.hash(password)
 
+# ===================================================================
+# Async password hashing (bcrypt runs off the event loop)
+# ===================================================================
+
+class _HashTimings:
+    """Running timing stats for one kind of password operation."""
+    def __init__(self):
+        self.calls = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds = 0.0
+
+    def record(self, seconds: float):
+        self.calls += 1
+        self.total_seconds += seconds
+        self.last_seconds = seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "total_seconds": round(self.total_seconds, 6),
+            "avg_seconds": round(self.total_seconds / self.calls, 6) if self.calls else 0.0,
+            "max_seconds": round(self.max_seconds, 6),
+            "last_seconds": round(self.last_seconds, 6),
+        }
+
+_hash_executor: Executor | None = None
+_hash_pending = 0
+_hash_timings = {"hash": _HashTimings(), "verify": _HashTimings()}
+
+def _get_hash_executor() -> Executor:
+    """Creates the hashing pool on first use, sized from settings."""
+    global _hash_executor
+    if _hash_executor is None:
+        workers = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _hash_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwd-hash")
+    return _hash_executor
+
+async def _run_in_hash_pool(kind: str, func, *args):
+    """
+    Runs a bcrypt call in the hashing pool and records its duration.
+    Sheds load with a 503 once PASSWORD_HASH_MAX_PENDING calls are in flight,
+    so a login burst cannot build an unbounded queue behind the pool.
+    """
+    global _hash_pending
+    timings = _hash_timings[kind]
+    if _hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        timings.rejected += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+    _hash_pending += 1
+    started = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_pending -= 1
+        timings.record(time.perf_counter() - started)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a password without blocking the event loop."""
+    return await _run_in_hash_pool("verify", verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hashes a password without blocking the event loop."""
+    return await _run_in_hash_pool("hash", get_password_hash, password)
+
+def get_password_hash_stats() -> dict:
+    """Returns pool configuration, current queue depth and per-operation timings."""
+    return {
+        "executor": settings.PASSWORD_HASH_EXECUTOR,
+        "workers": settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+        "pending": _hash_pending,
+        "hash": _hash_timings["hash"].snapshot(),
+        "verify": _hash_timings["verify"].snapshot(),
+    }
+
+def shutdown_password_hasher():
+    """Stops the hashing pool. Called on application shutdown."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
 # --- UPDATED FUNCTION ---
 # Simplified for clarity and to match our login endpoint's usage.
 def create_access_token(data: dict):
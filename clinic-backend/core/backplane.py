@@ -0,0 +1,204 @@
+# File: clinic-backend/core/backplane.py
+
+import abc
+import asyncio
+import json
+from typing import Callable, Dict, Optional, Set
+from urllib.parse import urlparse
+
+from .config import settings
+
+# Pub/sub between workers for websocket traffic.
+# Channels are "<namespace>:<key>", e.g. "room:<room_id>". A message published
+# on any worker is delivered once to the handler registered for its namespace
+# on every worker (including the publisher), which then fans it out to the
+# sockets it holds locally. An external broker (Redis, NATS, ...) only needs
+# to implement start/stop/_send below and be added to _BACKPLANES.
+
+Handler = Callable[[str, str], object]
+
+class Backplane(abc.ABC):
+    """Base class: handler registry and local dispatch."""
+    def __init__(self):
+        self._handlers: Dict[str, Handler] = {}
+
+    def add_handler(self, namespace: str, handler: Handler):
+        """Registers handler(key, message) for every channel in `namespace`."""
+        self._handlers[namespace] = handler
+
+    async def publish(self, namespace: str, key: str, message: str):
+        await self._send(f"{namespace}:{key}", message)
+
+    def _deliver(self, channel: str, message: str):
+        namespace, _, key = channel.partition(":")
+        handler = self._handlers.get(namespace)
+        if handler is None:
+            return
+        try:
+            handler(key, message)
+        except Exception as e:
+            print(f"Backplane handler for '{namespace}' failed: {e}")
+
+    @abc.abstractmethod
+    async def _send(self, channel: str, message: str):
+        raise NotImplementedError
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+class InProcessBackplane(Backplane):
+    """Single-worker deployments: publishing is just a local dispatch."""
+    async def _send(self, channel: str, message: str):
+        self._deliver(channel, message)
+
+# Frames are newline-delimited JSON: {"c": channel, "m": message}
+_MAX_FRAME_BYTES = 1024 * 1024
+# The broker disconnects a worker whose unread backlog grows past this; it reconnects
+_MAX_PEER_BACKLOG_BYTES = 8 * 1024 * 1024
+
+class _Broker:
+    """Relays every frame it receives to every connected worker."""
+    def __init__(self):
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.peers: Set[asyncio.StreamWriter] = set()
+
+    async def bind(self, host: str, port: int):
+        self.server = await asyncio.start_server(self._serve, host, port, limit=_MAX_FRAME_BYTES)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.peers.add(writer)
+        try:
+            while True:
+                frame = await reader.readline()
+                if not frame:
+                    break
+                for peer in list(self.peers):
+                    if peer.transport.get_write_buffer_size() > _MAX_PEER_BACKLOG_BYTES:
+                        self.peers.discard(peer)
+                        peer.close()
+                        continue
+                    peer.write(frame)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self.peers.discard(writer)
+            writer.close()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            for peer in list(self.peers):
+                peer.close()
+            await self.server.wait_closed()
+            self.server = None
+
+class LocalSocketBackplane(Backplane):
+    """
+    Cross-worker backplane over a loopback TCP socket, with no external service.
+
+    Every worker connects to one broker. Whichever worker first manages to bind
+    WS_BACKPLANE_URL embeds the broker; the others connect to it. If the broker's
+    worker exits, the rest reconnect and one of them takes over the address.
+    While disconnected, messages are still delivered to this worker's sockets.
+    """
+    def __init__(self, url: str):
+        super().__init__()
+        parsed = urlparse(url)
+        if parsed.scheme != "tcp" or not parsed.port:
+            raise ValueError(f"Local backplane needs a tcp://host:port URL, got {url!r}")
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port
+        self._broker = _Broker()
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._connected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_broker(self) -> bool:
+        return self._broker.server is not None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+        # Don't accept traffic before the first connection, but never block startup on it
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            print("Backplane broker not reachable yet; retrying in the background.")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._broker.close()
+
+    async def _open(self):
+        try:
+            return await asyncio.open_connection(self.host, self.port, limit=_MAX_FRAME_BYTES)
+        except OSError:
+            pass
+        try:
+            await self._broker.bind(self.host, self.port)
+            print(f"Backplane broker listening on {self.host}:{self.port}")
+        except OSError:
+            # Another worker won the race to bind; connect to it instead
+            pass
+        return await asyncio.open_connection(self.host, self.port, limit=_MAX_FRAME_BYTES)
+
+    async def _run(self):
+        delay = 0.1
+        while True:
+            try:
+                reader, writer = await self._open()
+            except OSError:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 5.0)
+                continue
+            delay = 0.1
+            self._writer = writer
+            self._connected.set()
+            try:
+                while True:
+                    frame = await reader.readline()
+                    if not frame:
+                        break
+                    data = json.loads(frame)
+                    self._deliver(data["c"], data["m"])
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                pass
+            finally:
+                self._connected.clear()
+                self._writer = None
+                writer.close()
+            print("Backplane connection lost; reconnecting.")
+
+    async def _send(self, channel: str, message: str):
+        writer = self._writer
+        if writer is None:
+            self._deliver(channel, message)
+            return
+        writer.write(json.dumps({"c": channel, "m": message}).encode() + b"\n")
+        try:
+            await writer.drain()
+        except ConnectionError:
+            # The broker will not echo it back now, so deliver locally at least
+            self._deliver(channel, message)
+
+_BACKPLANES = {
+    "memory": lambda: InProcessBackplane(),
+    "local": lambda: LocalSocketBackplane(settings.WS_BACKPLANE_URL),
+}
+
+def create_backplane(kind: str) -> Backplane:
+    factory = _BACKPLANES.get(kind)
+    if factory is None:
+        raise ValueError(f"Unknown WS_BACKPLANE: {kind}")
+    return factory()
+
+backplane = create_backplane(settings.WS_BACKPLANE)
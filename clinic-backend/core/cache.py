@@ -0,0 +1,76 @@
+# File: clinic-backend/core/cache.py
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from .config import settings
+
+class TTLCache:
+    """
+    A small in-process cache with per-entry expiry and LRU eviction.
+    Memory is bounded by max_entries; the least recently used entry goes first.
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+# Authenticated users keyed by user_id, used by api.dependencies.get_current_user.
+# Entries must be invalidated whenever a user's role, is_active flag or doctor
+# status changes; the TTL bounds staleness for changes made by other workers.
+principal_cache = TTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+def invalidate_principal(user_id):
+    """Drops a cached principal so the next request reloads it from the database."""
+    principal_cache.invalidate(user_id)
+
+def invalidate_principals(user_ids):
+    """invalidate_principal for a batch of users."""
+    for user_id in user_ids:
+        principal_cache.invalidate(user_id)
@@ -1,8 +1,11 @@
 # File: clinic-backend/core/cloudinary_utils.py
 
+from functools import partial
+
 import cloudinary
 import cloudinary.uploader
 from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
 from .config import settings
 
 def configure_cloudinary():
@@ -21,6 +24,9 @@ def configure_cloudinary():
 async def upload_file_to_cloudinary(file: UploadFile, folder: str) -> dict:
     """
     Uploads a file to a specified folder in Cloudinary.
+    The blocking SDK call runs in the threadpool so the event loop stays free,
+    and files above STORAGE_LARGE_FILE_BYTES are sent in chunks with
+    upload_large instead of as a single request body.
 
     Args:
         file (UploadFile): The file to upload, coming from a FastAPI endpoint.
@@ -29,10 +35,20 @@ async def upload_file_to_cloudinary(file: UploadFile, folder: str) -> dict:
     Returns:
         dict: A dictionary containing the upload result from Cloudinary.
     """
-    # The cloudinary library's upload method can handle file-like objects directly
-    result = cloudinary.uploader.upload(
-        file.file,
-        folder=folder,
-        resource_type="auto" # Let Cloudinary detect file type
-    )
-    return result
\ No newline at end of file
+    if file.size is not None and file.size > settings.STORAGE_LARGE_FILE_BYTES:
+        upload = partial(
+            cloudinary.uploader.upload_large,
+            file.file,
+            folder=folder,
+            resource_type="auto",
+            chunk_size=settings.STORAGE_CHUNK_SIZE,
+        )
+    else:
+        # The cloudinary library's upload method can handle file-like objects directly
+        upload = partial(
+            cloudinary.uploader.upload,
+            file.file,
+            folder=folder,
+            resource_type="auto" # Let Cloudinary detect file type
+        )
+    return await run_in_threadpool(upload)
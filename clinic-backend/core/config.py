@@ -1,5 +1,7 @@
 # File: clinic-backend/core/config.py
 
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -9,15 +11,92 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     DATABASE_NAME: str
 
+    # MongoDB client pool (see core/db.py). Size maxPoolSize against the worker
+    # count: every worker process opens its own pool.
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 5  # Also the number of connections opened at startup
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = 5000  # Fail a checkout instead of queueing forever
+    MONGO_CONNECT_TIMEOUT_MS: int = 10000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 10000
+    MONGO_SOCKET_TIMEOUT_MS: Optional[int] = None
+    MONGO_COMPRESSORS: str = ""  # e.g. "zstd,snappy,zlib"; zstd and snappy need extra packages
+    MONGO_RETRY_WRITES: bool = True
+    MONGO_RETRY_READS: bool = True
+
     # JWT Settings
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
-    # Cloudinary Settings
-    CLOUDINARY_CLOUD_NAME: str
-    CLOUDINARY_API_KEY: str
-    CLOUDINARY_API_SECRET: str
+    # File storage: "cloudinary", or "local" for tests and air-gapped runs
+    STORAGE_BACKEND: str = "cloudinary"
+    STORAGE_CHUNK_SIZE: int = 6 * 1024 * 1024
+    STORAGE_LARGE_FILE_BYTES: int = 20 * 1024 * 1024  # Above this, upload in chunks
+    LOCAL_STORAGE_DIR: str = "media"
+    LOCAL_STORAGE_BASE_URL: str = "/media"
+    # Where the local stand-in storage server (core/upload_server.py) accepts direct uploads
+    LOCAL_STORAGE_UPLOAD_URL: str = "/storage/upload"
+
+    # Direct-to-storage uploads (see core/uploads.py)
+    UPLOAD_INTENT_TTL_SECONDS: int = 900  # How long signed upload parameters stay valid
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+
+    # Cloudinary Settings (only required when STORAGE_BACKEND is "cloudinary")
+    CLOUDINARY_CLOUD_NAME: str = ""
+    CLOUDINARY_API_KEY: str = ""
+    CLOUDINARY_API_SECRET: str = ""
+
+    # Password hashing pool
+    # "thread" works well because bcrypt releases the GIL; "process" isolates it fully.
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 0  # 0 means one worker per CPU core
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Calls queued or running before we shed load
+
+    # Keyset pagination for list endpoints (see core/pagination.py)
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+
+    # Verified-doctor directory snapshot (see core/doctor_directory.py)
+    DOCTOR_DIRECTORY_REFRESH_SECONDS: float = 300
+
+    # Authenticated-principal cache (see core/cache.py)
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # WebSocket fan-out (see core/connections.py)
+    WS_SEND_QUEUE_SIZE: int = 100  # Messages buffered per connection
+    WS_SLOW_CONSUMER_POLICY: str = "drop"  # "drop" the message or "evict" the client when its queue is full
+    WS_SEND_TIMEOUT_SECONDS: float = 10
+
+    # Cross-worker websocket pub/sub (see core/backplane.py)
+    # "memory" for a single worker; "local" to share rooms across `uvicorn --workers N`
+    WS_BACKPLANE: str = "memory"
+    WS_BACKPLANE_URL: str = "tcp://127.0.0.1:8765"
+
+    # Appointment notifications (see core/notifications.py)
+    NOTIFICATION_RETENTION_HOURS: float = 72  # How long reconnecting clients can replay events
+
+    # Database query profiler (see core/profiler.py); meant for dev and staging
+    QUERY_PROFILER_ENABLED: bool = False
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD: int = 5  # Same query shape more often than this in one request
+    QUERY_PROFILER_SLOW_MS: float = 100
+    QUERY_PROFILER_EXPLAIN_SLOW: bool = True
+    QUERY_PROFILER_LOG_REQUESTS: bool = False  # Print a query count and DB time line per request
+
+    # Admin exports (see core/export.py)
+    EXPORT_BATCH_SIZE: int = 1000  # Documents fetched per cursor round trip
+    EXPORT_CHUNK_BYTES: int = 64 * 1024  # Bytes buffered before each write to the client
+
+    # Background jobs (see core/jobs.py)
+    JOB_WORKERS: int = 16  # Jobs running at once in each worker process
+    JOB_POLL_SECONDS: float = 2  # How often to look for retries and jobs queued by other processes
+    JOB_LEASE_SECONDS: float = 60  # A claimed job is retried elsewhere if its runner goes quiet this long
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 2  # Backoff doubles from here after each failed attempt
+    JOB_RETRY_MAX_SECONDS: float = 600
+    JOB_SHUTDOWN_GRACE_SECONDS: float = 10  # Running jobs get this long to finish on shutdown
+    JOB_RETENTION_HOURS: float = 24  # Finished jobs are removed by a TTL index after this long
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,141 @@
+# File: clinic-backend/core/connections.py
+
+import asyncio
+from typing import Dict, Hashable, Optional
+
+from fastapi import WebSocket
+from starlette.websockets import WebSocketState
+
+from .config import settings
+
+# Slow-consumer policies, applied when a connection's send queue is full
+DROP = "drop"    # Discard the new message for that connection only
+EVICT = "evict"  # Close the connection; the client is expected to reconnect
+
+# Close code sent to evicted consumers ("Try Again Later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+class _Connection:
+    """One socket with its own bounded outbox, drained by a dedicated sender task."""
+    def __init__(self, websocket: WebSocket, room: Hashable, queue_size: int):
+        self.websocket = websocket
+        self.room = room
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size)
+        self.sender: Optional[asyncio.Task] = None
+        self.closing = False
+
+class ConnectionManager:
+    """
+    Manages WebSocket connections grouped into rooms.
+
+    Each room is a dict keyed by socket, so joining and leaving are O(1) and a
+    broadcast only touches the room it is for. Broadcasting never awaits a
+    socket: the message is put on every member's bounded queue and each
+    connection's sender task writes it out, so members are served concurrently
+    and one slow client cannot hold up the rest. When a queue is full the
+    configured policy either drops the message for that client or evicts it.
+    """
+    def __init__(
+        self,
+        queue_size: int = settings.WS_SEND_QUEUE_SIZE,
+        slow_consumer_policy: str = settings.WS_SLOW_CONSUMER_POLICY,
+        send_timeout: float = settings.WS_SEND_TIMEOUT_SECONDS,
+    ):
+        if slow_consumer_policy not in (DROP, EVICT):
+            raise ValueError(f"Unknown slow consumer policy: {slow_consumer_policy}")
+        self.queue_size = queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.send_timeout = send_timeout
+        self.rooms: Dict[Hashable, Dict[WebSocket, _Connection]] = {}
+        self.dropped_messages = 0
+        self.evicted_connections = 0
+
+    async def connect(self, websocket: WebSocket, room: Hashable):
+        await websocket.accept()
+        connection = _Connection(websocket, room, self.queue_size)
+        connection.sender = asyncio.create_task(self._send_loop(connection))
+        self.rooms.setdefault(room, {})[websocket] = connection
+
+    def disconnect(self, websocket: WebSocket, room: Hashable):
+        members = self.rooms.get(room)
+        if members is None:
+            return
+        connection = members.pop(websocket, None)
+        if not members:
+            del self.rooms[room]
+        if connection is not None and connection.sender is not None:
+            connection.sender.cancel()
+
+    def broadcast(self, room: Hashable, message: str, exclude: Optional[WebSocket] = None) -> int:
+        """Queues a message for every member of the room. Returns how many accepted it."""
+        delivered = 0
+        # Copy: evicting a member mutates the room
+        for websocket, connection in list(self.rooms.get(room, {}).items()):
+            if websocket is exclude or connection.closing:
+                continue
+            try:
+                connection.queue.put_nowait(message)
+                delivered += 1
+            except asyncio.QueueFull:
+                self._handle_slow_consumer(connection)
+        return delivered
+
+    def send(self, websocket: WebSocket, room: Hashable, message: str) -> bool:
+        """Queues a message for one member, behind anything already queued for it."""
+        connection = self.rooms.get(room, {}).get(websocket)
+        if connection is None or connection.closing:
+            return False
+        try:
+            connection.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self._handle_slow_consumer(connection)
+            return False
+
+    def room_size(self, room: Hashable) -> int:
+        return len(self.rooms.get(room, ()))
+
+    def stats(self) -> dict:
+        return {
+            "rooms": len(self.rooms),
+            "connections": sum(len(members) for members in self.rooms.values()),
+            "dropped_messages": self.dropped_messages,
+            "evicted_connections": self.evicted_connections,
+        }
+
+    def _handle_slow_consumer(self, connection: _Connection):
+        if self.slow_consumer_policy == DROP:
+            self.dropped_messages += 1
+            return
+        self._evict(connection)
+
+    def _evict(self, connection: _Connection):
+        if connection.closing:
+            return
+        connection.closing = True
+        self.evicted_connections += 1
+        self.disconnect(connection.websocket, connection.room)
+        asyncio.create_task(self._close(connection.websocket))
+
+    async def _close(self, websocket: WebSocket):
+        if websocket.client_state != WebSocketState.CONNECTED:
+            return
+        try:
+            await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            pass
+
+    async def _send_loop(self, connection: _Connection):
+        queue = connection.queue
+        while True:
+            message = await queue.get()
+            try:
+                await asyncio.wait_for(connection.websocket.send_text(message), self.send_timeout)
+            except asyncio.TimeoutError:
+                # A client that stops reading entirely is evicted under either policy
+                print(f"WebSocket consumer in room {connection.room} timed out; evicting.")
+                self._evict(connection)
+                return
+            except Exception:
+                # The socket is gone; the endpoint's receive loop will disconnect it
+                return
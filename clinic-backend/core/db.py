@@ -1,32 +1,171 @@
 # File: clinic-backend/core/db.py
 
+import asyncio
+import threading
+import time
+
 import motor.motor_asyncio
 from beanie import init_beanie
+from pymongo import monitoring
 from .config import settings
+from .profiler import query_profiler
 
 # --- Import your document models here ---
 from models.user_models import User, DoctorProfile
-from models.clinic_models import Appointment, Prescription,Review
+from models.clinic_models import Appointment, Prescription, Review, DoctorRatingSummary, NotificationCounter, Notification, Job
 
-async def init_db():
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Tracks connection pool usage across every pool the client opens.
+    PyMongo calls these hooks from Motor's worker threads, and a checkout's
+    "started" and "checked out" events arrive on the same thread, which is how
+    the time spent waiting for a free connection is measured.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.open = 0
+        self.in_use = 0
+        self.waiting = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _end_wait(self, checked_out: bool):
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        waited = time.perf_counter() - started if started is not None else 0.0
+        with self._lock:
+            self.waiting -= 1
+            if checked_out:
+                self.in_use += 1
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            else:
+                self.checkout_failures += 1
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+        with self._lock:
+            self.waiting += 1
+
+    def connection_checked_out(self, event):
+        self._end_wait(checked_out=True)
+
+    def connection_check_out_failed(self, event):
+        self._end_wait(checked_out=False)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open -= 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+                "min_pool_size": settings.MONGO_MIN_POOL_SIZE,
+                "open": self.open,
+                "in_use": self.in_use,
+                "waiting": self.waiting,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checkout_wait_avg_ms": round(1000 * self.wait_seconds_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "checkout_wait_max_ms": round(1000 * self.wait_seconds_max, 3),
+            }
+
+pool_monitor = PoolMonitor()
+
+def create_client() -> motor.motor_asyncio.AsyncIOMotorClient:
+    """Builds the Motor client from the MONGO_* pool, timeout and retry settings."""
+    options = dict(
+        maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        retryWrites=settings.MONGO_RETRY_WRITES,
+        retryReads=settings.MONGO_RETRY_READS,
+        uuidRepresentation="standard",
+        event_listeners=[pool_monitor],
+    )
+    if settings.QUERY_PROFILER_ENABLED:
+        options["event_listeners"].append(query_profiler)
+    if settings.MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = settings.MONGO_SOCKET_TIMEOUT_MS
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    return motor.motor_asyncio.AsyncIOMotorClient(settings.DATABASE_URL, **options)
+
+async def warm_up(client: motor.motor_asyncio.AsyncIOMotorClient):
+    """
+    Opens connections up front so the first requests after a deploy don't pay
+    for TCP/TLS handshakes: one concurrent ping per connection minPoolSize asks for.
+    """
+    started = time.perf_counter()
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(max(settings.MONGO_MIN_POOL_SIZE, 1))))
+    print(f"Database pool warmed up ({pool_monitor.open} connections in {time.perf_counter() - started:.3f}s).")
+
+async def init_db() -> motor.motor_asyncio.AsyncIOMotorClient:
     """
     Initializes the database connection and Beanie ODM.
     This function should be called once when the application starts.
+    Returns the client; the caller owns it and must pass it to close_db().
     """
-    client = motor.motor_asyncio.AsyncIOMotorClient(
-        settings.DATABASE_URL
-    )
+    client = create_client()
+    query_profiler.attach(client)
 
     # Add the document models to this list
     await init_beanie(
-        database=client[settings.DATABASE_NAME], 
+        database=client[settings.DATABASE_NAME],
         document_models=[
-            User, 
+            User,
             DoctorProfile,
-            Appointment,      
+            Appointment,
             Prescription,
-            Review
+            Review,
+            DoctorRatingSummary,
+            NotificationCounter,
+            Notification,
+            Job
         ]
     )
+    await warm_up(client)
     print("Database connection initialized with models...")
+    return client
+
+def close_db(client: motor.motor_asyncio.AsyncIOMotorClient):
+    """Closes the client's pools and monitoring threads."""
+    client.close()
+    print("Database connection closed.")
 
+async def ping(client: motor.motor_asyncio.AsyncIOMotorClient) -> float:
+    """Round-trip time of a ping in milliseconds; raises if the server is unreachable."""
+    started = time.perf_counter()
+    await client.admin.command("ping")
+    return round(1000 * (time.perf_counter() - started), 3)
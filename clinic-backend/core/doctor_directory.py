@@ -0,0 +1,217 @@
+# File: clinic-backend/core/doctor_directory.py
+
+import asyncio
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pymongo import ASCENDING
+
+from models.user_models import DoctorProfile, DoctorStatus
+from models.clinic_models import DoctorRatingSummary
+from schemas.user_schemas import DoctorOut
+from .config import settings
+from .doctor_search import DoctorSearchIndex
+
+# Directory order, used to validate pagination cursors
+DIRECTORY_SORT = [("full_name", ASCENDING), ("doctor_id", ASCENDING)]
+
+# Sorts after every real doctor_id, so bisecting past (name, id, MAX_UUID) skips that doctor
+MAX_UUID = UUID(int=(1 << 128) - 1)
+
+class DoctorDirectory:
+    """
+    In-process snapshot of the verified-doctor directory.
+
+    Each doctor's public profile (with rating totals from DoctorRatingSummary)
+    is kept as pre-serialized DoctorOut JSON, keyed
+    by doctor_id, so the public endpoints answer from memory without touching
+    the database. Doctors are also kept in a list sorted by (name, id) so the
+    directory can be paged with keyset cursors in O(log n) per page, and
+    indexed for full-text search in `search_index`.
+
+    The snapshot is patched in place when a doctor's status or profile changes
+    in this process, and fully reloaded in the background every
+    DOCTOR_DIRECTORY_REFRESH_SECONDS to pick up changes made by other workers.
+    Changes made while a reload is reading are replayed onto the new snapshot,
+    so a reload never rolls back a newer local change.
+    `version` increases on every change.
+    """
+    def __init__(self):
+        self.version = 0
+        self._models: Dict[UUID, DoctorOut] = {}
+        self._entries: Dict[UUID, bytes] = {}
+        self._ratings: Dict[UUID, DoctorRatingSummary] = {}
+        self.search_index = DoctorSearchIndex()
+        self._sort_keys: Dict[UUID, Tuple[str, str]] = {}
+        self._order: List[Tuple[str, str, UUID]] = []
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._replay: Optional[List[Callable[[], Any]]] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _build(self, profile: DoctorProfile) -> DoctorOut:
+        doctor = DoctorOut.model_validate(profile)
+        summary = self._ratings.get(profile.doctor_id)
+        if summary is not None:
+            doctor.rating_count = summary.review_count
+            doctor.rating_average = summary.average
+        return doctor
+
+    @staticmethod
+    def sort_key(profile: DoctorProfile) -> Tuple[str, str]:
+        """Directory order: case-insensitive name, then id as a tie-breaker."""
+        return (profile.full_name.casefold(), str(profile.doctor_id))
+
+    def _put(self, profile: DoctorProfile):
+        self._drop(profile.doctor_id)
+        key = self.sort_key(profile)
+        doctor = self._build(profile)
+        self._models[profile.doctor_id] = doctor
+        self._entries[profile.doctor_id] = doctor.model_dump_json().encode()
+        self._sort_keys[profile.doctor_id] = key
+        self.search_index.add(doctor)
+        insort(self._order, (*key, profile.doctor_id))
+
+    def _drop(self, doctor_id: UUID) -> bool:
+        key = self._sort_keys.pop(doctor_id, None)
+        if key is None:
+            return False
+        del self._models[doctor_id]
+        self.search_index.remove(doctor_id)
+        del self._entries[doctor_id]
+        del self._order[bisect_left(self._order, key)]
+        return True
+
+    def _record(self, change: Callable[[], Any]) -> Any:
+        """Applies a local change, remembering it if a reload is in flight."""
+        result = change()
+        if self._replay is not None:
+            self._replay.append(change)
+        return result
+
+    def _apply(self, profile: DoctorProfile):
+        if profile.status == DoctorStatus.VERIFIED:
+            self._put(profile)
+        else:
+            self._drop(profile.doctor_id)
+
+    def _apply_rating(self, summary: DoctorRatingSummary) -> bool:
+        current = self._ratings.get(summary.doctor_id)
+        if current is not None and current.updated_at > summary.updated_at:
+            return False
+        self._ratings[summary.doctor_id] = summary
+        doctor = self._models.get(summary.doctor_id)
+        if doctor is None:
+            return False
+        doctor.rating_count = summary.review_count
+        doctor.rating_average = summary.average
+        self._entries[summary.doctor_id] = doctor.model_dump_json().encode()
+        return True
+
+    async def reload(self):
+        """Rebuilds the snapshot from the database."""
+        async with self._load_lock:
+            await self._reload()
+
+    async def _reload(self):
+        self._replay = replay = []
+        try:
+            profiles = await DoctorProfile.find(
+                DoctorProfile.status == DoctorStatus.VERIFIED
+            ).to_list()
+            summaries = await DoctorRatingSummary.find_all().to_list()
+        finally:
+            self._replay = None
+        self._ratings = {summary.doctor_id: summary for summary in summaries}
+        self._models = {profile.doctor_id: self._build(profile) for profile in profiles}
+        self._entries = {
+            doctor_id: doctor.model_dump_json().encode()
+            for doctor_id, doctor in self._models.items()
+        }
+        self._sort_keys = {profile.doctor_id: self.sort_key(profile) for profile in profiles}
+        search_index = DoctorSearchIndex()
+        for doctor in self._models.values():
+            search_index.add(doctor)
+        self.search_index = search_index
+        self._order = sorted((*key, doctor_id) for doctor_id, key in self._sort_keys.items())
+        # The reads may predate changes this process made meanwhile
+        for change in replay:
+            change()
+        self._loaded = True
+        self.version += 1
+
+    async def ensure_loaded(self):
+        """Loads the snapshot on first use; later reads never wait on the database."""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if not self._loaded:
+                await self._reload()
+
+    def upsert(self, profile: DoctorProfile):
+        """Applies a profile change: verified profiles are (re)published, others removed."""
+        self._record(lambda: self._apply(profile))
+        self.version += 1
+
+    def upsert_many(self, profiles: List[DoctorProfile]):
+        """upsert() for a batch of profiles, published as a single version."""
+        for profile in profiles:
+            self._record(lambda profile=profile: self._apply(profile))
+        if profiles:
+            self.version += 1
+
+    def remove(self, doctor_id: UUID):
+        if self._record(lambda: self._drop(doctor_id)):
+            self.version += 1
+
+    def update_rating(self, summary: DoctorRatingSummary):
+        """Applies a new rating summary after a review is created."""
+        if self._record(lambda: self._apply_rating(summary)):
+            self.version += 1
+
+    def get_json(self, doctor_id: UUID) -> Optional[bytes]:
+        return self._entries.get(doctor_id)
+
+    def many_json(self, doctor_ids: List[UUID]) -> bytes:
+        """The given doctors as a JSON array, in the order given."""
+        return b"[" + b",".join(self._entries[doctor_id] for doctor_id in doctor_ids) + b"]"
+
+    def page_json(self, after: Optional[Tuple[str, str]], limit: int) -> Tuple[bytes, Optional[Tuple[str, str]]]:
+        """
+        Returns up to `limit` doctors after the sort key `after` as a JSON array,
+        plus the sort key to continue from (None on the last page).
+        """
+        start = bisect_right(self._order, tuple(after) + (MAX_UUID,)) if after else 0
+        rows = self._order[start:start + limit + 1]
+        next_key = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_key = rows[-1][:2]
+        body = b"[" + b",".join(self._entries[row[2]] for row in rows) + b"]"
+        return body, next_key
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def _refresh_forever(self):
+        while True:
+            await asyncio.sleep(settings.DOCTOR_DIRECTORY_REFRESH_SECONDS)
+            try:
+                await self.reload()
+            except Exception as e:
+                # Keep serving the previous snapshot; try again next interval
+                print("Doctor directory refresh failed:", e)
+
+    async def start(self):
+        """Loads the snapshot and starts the periodic refresh. Called on startup."""
+        await self.ensure_loaded()
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+doctor_directory = DoctorDirectory()
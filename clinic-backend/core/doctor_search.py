@@ -0,0 +1,219 @@
+# File: clinic-backend/core/doctor_search.py
+
+import heapq
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from pymongo import ASCENDING, DESCENDING
+
+from schemas.user_schemas import DoctorOut
+
+# Field flags stored in the postings, and how much a match in each field counts
+NAME, SPECIALTY, BIO = 4, 2, 1
+FIELD_WEIGHTS = {NAME: 3.0, SPECIALTY: 2.0, BIO: 1.0}
+
+# The last query term is treated as a prefix once it is at least this long,
+# and expands to at most this many vocabulary terms
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_EXPANSIONS = 64
+
+# Result order, used to validate pagination cursors
+SEARCH_SORT = [("score", DESCENDING), ("full_name", ASCENDING), ("doctor_id", ASCENDING)]
+
+_TOKEN_RE = re.compile(r"\w+")
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall(text.casefold()) if text else []
+
+def _mask_score(mask: int) -> float:
+    return sum(weight for field, weight in FIELD_WEIGHTS.items() if mask & field)
+
+class DoctorSearchIndex:
+    """
+    In-process inverted index over the verified-doctor directory.
+
+    Postings map each token to {doctor_id: field flags}; sorted vocabularies
+    (every token, and name tokens alone for autocomplete) give prefix lookups
+    by bisection. Doctors are also kept in (name, id) order, overall and per
+    specialty, so browsing without a query is a slice rather than a ranking,
+    and specialty counts are kept for facets. Updates are per doctor, so the
+    index is maintained alongside DoctorDirectory rather than rebuilt.
+    """
+    def __init__(self):
+        self._postings: Dict[str, Dict[UUID, int]] = {}
+        self._vocab: List[str] = []
+        self._name_vocab: List[str] = []
+        self._name_token_counts: Dict[str, int] = {}
+        self._doc_tokens: Dict[UUID, Set[str]] = {}
+        self._specialty: Dict[UUID, str] = {}
+        self._specialty_counts: Counter = Counter()
+        self._name_key: Dict[UUID, str] = {}
+        # (name key, id) of every doctor, and of each specialty's doctors, in browse order
+        self._order: List[Tuple[str, str]] = []
+        self._by_specialty: Dict[str, List[Tuple[str, str]]] = {}
+
+    def add(self, doctor: DoctorOut):
+        self.remove(doctor.doctor_id)
+        fields: Dict[str, int] = {}
+        for flag, text in ((NAME, doctor.full_name), (SPECIALTY, doctor.specialty), (BIO, doctor.bio)):
+            for token in tokenize(text):
+                fields[token] = fields.get(token, 0) | flag
+
+        for token, mask in fields.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocab, token)
+            postings[doctor.doctor_id] = mask
+            if mask & NAME:
+                count = self._name_token_counts.get(token, 0)
+                if not count:
+                    insort(self._name_vocab, token)
+                self._name_token_counts[token] = count + 1
+
+        specialty = doctor.specialty.strip()
+        name_key = doctor.full_name.casefold()
+        entry = (name_key, str(doctor.doctor_id))
+        self._doc_tokens[doctor.doctor_id] = set(fields)
+        self._specialty[doctor.doctor_id] = specialty
+        self._specialty_counts[specialty] += 1
+        self._name_key[doctor.doctor_id] = name_key
+        insort(self._order, entry)
+        insort(self._by_specialty.setdefault(specialty.casefold(), []), entry)
+
+    def remove(self, doctor_id: UUID):
+        tokens = self._doc_tokens.pop(doctor_id, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            postings = self._postings[token]
+            mask = postings.pop(doctor_id, 0)
+            if not postings:
+                del self._postings[token]
+                del self._vocab[bisect_left(self._vocab, token)]
+            if mask & NAME:
+                self._name_token_counts[token] -= 1
+                if not self._name_token_counts[token]:
+                    del self._name_token_counts[token]
+                    del self._name_vocab[bisect_left(self._name_vocab, token)]
+
+        specialty = self._specialty.pop(doctor_id)
+        self._specialty_counts[specialty] -= 1
+        if not self._specialty_counts[specialty]:
+            del self._specialty_counts[specialty]
+        entry = (self._name_key.pop(doctor_id), str(doctor_id))
+        del self._order[bisect_left(self._order, entry)]
+        members = self._by_specialty[specialty.casefold()]
+        del members[bisect_left(members, entry)]
+        if not members:
+            del self._by_specialty[specialty.casefold()]
+
+    def _expand(self, term: str, as_prefix: bool, min_prefix: int, vocab: List[str]) -> List[str]:
+        if not as_prefix or len(term) < min_prefix:
+            return [term] if term in self._postings else []
+        start = bisect_left(vocab, term)
+        expansions = []
+        for token in vocab[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not token.startswith(term):
+                break
+            expansions.append(token)
+        return expansions
+
+    def _match(self, terms: List[str], field_mask: int, min_prefix: int = MIN_PREFIX_LENGTH) -> Dict[UUID, float]:
+        """Scores doctors matching every term; the last term also matches as a prefix."""
+        # Name-only matching expands over name tokens, so bio words can't use up the cap
+        vocab = self._name_vocab if field_mask == NAME else self._vocab
+        scores: Optional[Dict[UUID, float]] = None
+        for i, term in enumerate(terms):
+            term_scores: Dict[UUID, float] = {}
+            for token in self._expand(term, as_prefix=(i == len(terms) - 1), min_prefix=min_prefix, vocab=vocab):
+                # Whole-word hits rank above prefix completions
+                boost = 1.0 if token == term else 0.5
+                for doctor_id, mask in self._postings[token].items():
+                    if mask & field_mask:
+                        score = _mask_score(mask & field_mask) * boost
+                        if score > term_scores.get(doctor_id, 0.0):
+                            term_scores[doctor_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: s + term_scores[d] for d, s in scores.items() if d in term_scores}
+            if not scores:
+                return {}
+        return scores or {}
+
+    def search(
+        self,
+        query: Optional[str],
+        specialty: Optional[str],
+        limit: int,
+        after: Optional[Tuple[float, str, str]] = None,
+    ) -> Tuple[List[UUID], Dict[str, int], Optional[Tuple[float, str, str]]]:
+        """
+        Returns one page of doctor ids ranked by relevance (then name), the
+        specialty facet counts for the whole query, and the key to continue from.
+        Facets ignore the specialty filter so clients can show every option.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return self._browse(specialty, limit, after)
+        scores = self._match(terms, NAME | SPECIALTY | BIO)
+
+        facets = Counter(self._specialty[doctor_id] for doctor_id in scores)
+
+        candidates = scores.keys()
+        if specialty:
+            wanted = specialty.strip().casefold()
+            candidates = [doctor_id for doctor_id in scores if self._specialty[doctor_id].casefold() == wanted]
+
+        # Rank key: highest score first, then name, then id for a stable order
+        keys = ((-scores[d], self._name_key[d], str(d)) for d in candidates)
+        if after is not None:
+            after_key = (-after[0], after[1], after[2])
+            keys = (key for key in keys if key > after_key)
+        page = heapq.nsmallest(limit + 1, keys)
+
+        next_key = None
+        if len(page) > limit:
+            page = page[:limit]
+            last = page[-1]
+            next_key = (-last[0], last[1], last[2])
+        return [UUID(key[2]) for key in page], dict(facets.most_common()), next_key
+
+    def _browse(
+        self,
+        specialty: Optional[str],
+        limit: int,
+        after: Optional[Tuple[float, str, str]],
+    ) -> Tuple[List[UUID], Dict[str, int], Optional[Tuple[float, str, str]]]:
+        """search() without terms: every doctor scores 0, so results are in name order."""
+        order = self._by_specialty.get(specialty.strip().casefold(), []) if specialty else self._order
+        if after is None or after[0] > 0:
+            start = 0
+        elif after[0] < 0:
+            start = len(order)  # Nothing ranks below a negative score
+        else:
+            start = bisect_right(order, (after[1], after[2]))
+        rows = order[start:start + limit + 1]
+
+        next_key = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_key = (0.0, *rows[-1])
+        return [UUID(row[1]) for row in rows], dict(self._specialty_counts.most_common()), next_key
+
+    def suggest(self, prefix: str, limit: int) -> List[UUID]:
+        """Doctors whose name matches the typed text, for autocomplete."""
+        terms = tokenize(prefix)
+        if not terms:
+            return []
+        # Names are short, so even a single typed letter expands (still capped)
+        scores = self._match(terms, NAME, min_prefix=1)
+        ranked = heapq.nsmallest(limit, ((-s, self._name_key[d], str(d)) for d, s in scores.items()))
+        return [UUID(key[2]) for key in ranked]
+
+    def __len__(self):
+        return len(self._doc_tokens)
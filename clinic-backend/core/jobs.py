@@ -0,0 +1,212 @@
+# File: clinic-backend/core/jobs.py
+
+import asyncio
+import os
+import random
+import socket
+import traceback
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from uuid import uuid4
+
+from pymongo import ASCENDING, ReturnDocument
+
+from models.clinic_models import Job, JobStatus
+from .config import settings
+
+# Durable background jobs.
+# Request handlers enqueue() a job (one small insert) and return; the runner
+# in every worker process claims due jobs from the shared collection and runs
+# them on the event loop, at most JOB_WORKERS at a time and at most a job
+# type's `concurrency` at a time per type. Failures are retried with
+# exponential backoff and jitter. Delivery is at least once: a job can run
+# again if its process dies mid-run, so handlers must tolerate repeats.
+
+Handler = Callable[..., Awaitable[None]]
+
+class JobType:
+    def __init__(self, name: str, handler: Handler, concurrency: int, max_attempts: int):
+        self.name = name
+        self.handler = handler
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+
+class JobRunner:
+    def __init__(self):
+        self.runner_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._types: Dict[str, JobType] = {}
+        self._running: Dict[str, int] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._wake = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.claimed = 0
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+
+    def handler(self, name: str, concurrency: int = 4, max_attempts: Optional[int] = None):
+        """Registers a coroutine as the handler for a job type; it is called with the payload as keyword arguments."""
+        def register(func: Handler) -> Handler:
+            self._types[name] = JobType(name, func, concurrency, max_attempts or settings.JOB_MAX_ATTEMPTS)
+            self._running[name] = 0
+            return func
+        return register
+
+    async def enqueue(self, job_type: str, payload: dict, delay: float = 0) -> Job:
+        """Stores a job; it runs once the write is acknowledged, so it survives a crash."""
+        return (await self.enqueue_many(job_type, [payload], delay))[0]
+
+    async def enqueue_many(self, job_type: str, payloads: Iterable[dict], delay: float = 0) -> List[Job]:
+        run_at = datetime.utcnow() + timedelta(seconds=delay)
+        max_attempts = self._types[job_type].max_attempts
+        jobs = [Job(type=job_type, payload=payload, max_attempts=max_attempts, run_at=run_at) for payload in payloads]
+        if jobs:
+            await Job.insert_many(jobs)
+            self._wake.set()
+        return jobs
+
+    async def start(self):
+        self._slots = asyncio.Semaphore(settings.JOB_WORKERS)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        print(f"Job runner {self.runner_id} started ({settings.JOB_WORKERS} slots, types: {', '.join(self._types)}).")
+
+    async def stop(self):
+        """Stops claiming, gives running jobs a grace period, then requeues whatever is left."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=settings.JOB_SHUTDOWN_GRACE_SECONDS)
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _dispatch(self):
+        while True:
+            await self._slots.acquire()
+            # Cleared before claiming, so a job enqueued during the claim still wakes us
+            self._wake.clear()
+            job = None
+            try:
+                # Only this coroutine claims, so the per-type counts can't change under it
+                available = [name for name, job_type in self._types.items() if self._running[name] < job_type.concurrency]
+                if available:
+                    job = await self._claim(available)
+            except Exception as e:
+                print(f"Job runner failed to claim a job: {e}")
+            if job is None:
+                self._slots.release()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=settings.JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.claimed += 1
+            self._running[job.type] += 1
+            task = asyncio.create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _claim(self, types: List[str]) -> Optional[Job]:
+        now = datetime.utcnow()
+        document = await Job.get_motor_collection().find_one_and_update(
+            {
+                "type": {"$in": types},
+                "$or": [
+                    {"status": JobStatus.QUEUED.value, "run_at": {"$lte": now}},
+                    {"status": JobStatus.RUNNING.value, "lease_expires_at": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "locked_by": self.runner_id,
+                    "lease_expires_at": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return Job.model_validate(document) if document is not None else None
+
+    async def _heartbeat(self, job: Job):
+        """Extends the lease while a long job runs."""
+        while True:
+            await asyncio.sleep(settings.JOB_LEASE_SECONDS / 3)
+            try:
+                await Job.get_motor_collection().update_one(
+                    {"_id": job.id, "locked_by": self.runner_id},
+                    {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS)}},
+                )
+            except Exception as e:
+                # Keep trying; a single missed renewal still leaves two thirds of the lease
+                print(f"Failed to extend the lease of job {job.type} {job.job_id}: {e}")
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(settings.JOB_RETRY_MAX_SECONDS, settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+        return random.uniform(delay / 2, delay)
+
+    async def _run(self, job: Job):
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            if job.attempts > job.max_attempts:
+                # Its runners kept dying mid-run; don't let it take down another
+                raise RuntimeError("Lease expired on every attempt")
+            await self._types[job.type].handler(**job.payload)
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back without spending an attempt
+            await asyncio.shield(self._finish(job, {
+                "status": JobStatus.QUEUED.value, "attempts": job.attempts - 1, "locked_by": None, "lease_expires_at": None,
+            }))
+            raise
+        except Exception as e:
+            error = "".join(traceback.format_exception_only(e)).strip()
+            if job.attempts >= job.max_attempts:
+                self.failed += 1
+                print(f"Job {job.type} {job.job_id} failed after {job.attempts} attempts: {error}")
+                await self._finish(job, {
+                    "status": JobStatus.FAILED.value, "last_error": error, "finished_at": datetime.utcnow(),
+                    "locked_by": None, "lease_expires_at": None,
+                })
+            else:
+                self.retried += 1
+                delay = self._backoff(job.attempts)
+                await self._finish(job, {
+                    "status": JobStatus.QUEUED.value, "last_error": error, "locked_by": None, "lease_expires_at": None,
+                    "run_at": datetime.utcnow() + timedelta(seconds=delay),
+                })
+        else:
+            self.succeeded += 1
+            await self._finish(job, {
+                "status": JobStatus.SUCCEEDED.value, "finished_at": datetime.utcnow(), "locked_by": None, "lease_expires_at": None,
+            })
+        finally:
+            heartbeat.cancel()
+            self._running[job.type] -= 1
+            self._slots.release()
+            self._wake.set()
+
+    async def _finish(self, job: Job, changes: dict):
+        try:
+            await Job.get_motor_collection().update_one(
+                {"_id": job.id, "locked_by": self.runner_id, "attempts": job.attempts},
+                {"$set": changes},
+            )
+        except Exception as e:
+            # The lease runs out and another runner retries the job
+            print(f"Failed to record the outcome of job {job.type} {job.job_id}: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "slots": settings.JOB_WORKERS,
+            "running": sum(self._running.values()),
+            "claimed": self.claimed,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+job_runner = JobRunner()
@@ -0,0 +1,79 @@
+# File: clinic-backend/core/lean.py
+
+from datetime import date, datetime
+from typing import Any, Iterable, List, Optional, Type, get_args
+
+from beanie.odm.queries.find import FindMany
+from bson.binary import UuidRepresentation
+from bson.codec_options import CodecOptions
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from .pagination import SortSpec
+
+# Lean read path for hot list endpoints.
+# The regular path builds a Beanie Document per row, model_dump()s it, and then
+# FastAPI validates the result again against response_model. Here we instead
+# read raw BSON dicts projected to just the fields the response schema needs,
+# reshape them to that schema without validation (the data was validated when
+# it was written), and serialize straight to bytes with pydantic-core's JSON
+# encoder. Routes keep response_model for the OpenAPI docs; returning a
+# Response bypasses the second validation pass.
+
+# Decode UUIDs stored by Beanie (binary subtype 4) straight into uuid.UUID
+_CODEC_OPTIONS = CodecOptions(uuid_representation=UuidRepresentation.STANDARD)
+
+def _is_date_only(annotation: Any) -> bool:
+    return annotation is date or date in get_args(annotation)
+
+class LeanShape:
+    """
+    How to read and reshape raw documents for one response schema.
+    `extra_fields` are also fetched (e.g. sort keys needed for cursors, or ids
+    used for enrichment) but are dropped by shape().
+    """
+    def __init__(self, schema: Type[BaseModel], extra_fields: Iterable[str] = ()):
+        self.schema = schema
+        self.fields = list(schema.model_fields)
+        self.projection = {name: 1 for name in [*self.fields, *extra_fields]}
+        # Beanie stores dates as midnight datetimes; the schema wants plain dates
+        self.date_fields = {
+            name for name, field in schema.model_fields.items() if _is_date_only(field.annotation)
+        }
+        self.defaults = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in schema.model_fields.items()
+            if not field.is_required()
+        }
+
+    def shape(self, doc: dict) -> dict:
+        row = {name: doc.get(name, self.defaults.get(name)) for name in self.fields}
+        for name in self.date_fields:
+            value = row[name]
+            if isinstance(value, datetime):
+                row[name] = value.date()
+        return row
+
+async def find_lean(query: FindMany, shape: LeanShape, sort: SortSpec, limit: int) -> List[dict]:
+    """
+    Runs a Beanie find query as a raw, projected cursor and returns plain dicts.
+    Sort keys are always fetched so the rows can be paginated with split_page().
+    """
+    collection = query.document_model.get_motor_collection().with_options(codec_options=_CODEC_OPTIONS)
+    projection = {**shape.projection, **{field: 1 for field, _ in sort}}
+    cursor = collection.find(query.get_filter_query(), projection).sort(list(sort)).limit(limit)
+    return await cursor.to_list(length=limit)
+
+def lean_response(rows: List[dict], shape: LeanShape, response: Optional[Response] = None) -> Response:
+    """
+    Serializes rows in the shape's schema directly to a JSON response.
+    FastAPI ignores headers set on the injected `response` when a handler
+    returns its own Response, so those (e.g. X-Next-Cursor) are copied over.
+    """
+    lean = Response(content=to_json([shape.shape(row) for row in rows]), media_type="application/json")
+    if response is not None:
+        for name, value in response.headers.items():
+            if name != "content-length":
+                lean.headers[name] = value
+    return lean
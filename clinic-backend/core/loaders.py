@@ -0,0 +1,116 @@
+# File: clinic-backend/core/loaders.py
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+from uuid import UUID
+
+from beanie.operators import In
+from pydantic import BaseModel
+
+from models.user_models import User, DoctorProfile
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+class BatchLoader(Generic[K, V]):
+    """
+    DataLoader-style batching for one request.
+
+    Every load() made in the same event-loop tick is coalesced into a single
+    call to `batch_fn` with the de-duplicated keys, and results are memoized,
+    so asking for the same key twice in a request never queries twice.
+    `batch_fn` returns {key: value}; keys it omits resolve to None.
+    """
+    def __init__(self, batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]]):
+        self._batch_fn = batch_fn
+        self._futures: Dict[K, asyncio.Future] = {}
+        self._pending: List[K] = []
+
+    def load(self, key: K) -> "asyncio.Future[Optional[V]]":
+        future = self._futures.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[key] = future
+        if not self._pending:
+            # First key of this tick: dispatch once the current callbacks have queued theirs
+            loop.call_soon(self._dispatch)
+        self._pending.append(key)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> Dict[K, Optional[V]]:
+        unique_keys = list(dict.fromkeys(keys))
+        values = await asyncio.gather(*(self.load(key) for key in unique_keys))
+        return dict(zip(unique_keys, values))
+
+    def _dispatch(self):
+        keys, self._pending = self._pending, []
+        asyncio.ensure_future(self._run(keys))
+
+    async def _run(self, keys: List[K]):
+        try:
+            results = await self._batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                # Forget failed keys so a retry in the same request fetches again
+                self._futures.pop(key).set_exception(e)
+            return
+        for key in keys:
+            self._futures[key].set_result(results.get(key))
+
+# Projections: fetch only the name fields, never whole documents
+class _DoctorName(BaseModel):
+    doctor_id: UUID
+    full_name: str
+
+class _PatientName(BaseModel):
+    user_id: UUID
+    full_name: Optional[str] = None
+
+async def _fetch_doctor_names(doctor_ids: List[UUID]) -> Dict[UUID, str]:
+    rows = await DoctorProfile.find(
+        In(DoctorProfile.doctor_id, doctor_ids),
+        projection_model=_DoctorName,
+    ).to_list()
+    return {row.doctor_id: row.full_name for row in rows}
+
+async def _fetch_patient_names(user_ids: List[UUID]) -> Dict[UUID, Optional[str]]:
+    rows = await User.find(
+        In(User.user_id, user_ids),
+        projection_model=_PatientName,
+    ).to_list()
+    return {row.user_id: row.full_name for row in rows}
+
+class RequestLoaders:
+    """The loaders available to a request. Create one per request via get_loaders()."""
+    def __init__(self):
+        self.doctor_names: BatchLoader[UUID, str] = BatchLoader(_fetch_doctor_names)
+        self.patient_names: BatchLoader[UUID, Optional[str]] = BatchLoader(_fetch_patient_names)
+
+def get_loaders() -> RequestLoaders:
+    """
+    FastAPI dependency. FastAPI caches dependencies per request, so every
+    handler and dependency in one request shares the same loaders.
+    """
+    return RequestLoaders()
+
+async def add_doctor_names(rows: List[dict], loaders: RequestLoaders):
+    """Sets doctor_name on each appointment row, for AppointmentWithDoctorInfo."""
+    names = await loaders.doctor_names.load_many(row["doctor_id"] for row in rows)
+    for row in rows:
+        row["doctor_name"] = names.get(row["doctor_id"]) or "Unknown Doctor"
+
+async def add_patient_names(rows: List[dict], loaders: RequestLoaders):
+    """
+    Fills patient_name on each appointment or prescription row, for
+    AppointmentWithPatientInfo and PrescriptionWithPatientInfo.
+    The name given at booking wins; the patient's account name is only looked
+    up when it is missing.
+    """
+    names = await loaders.patient_names.load_many(
+        row["patient_id"] for row in rows if not row.get("patient_name")
+    )
+    for row in rows:
+        row["patient_name"] = row.get("patient_name") or names.get(row["patient_id"]) or "Unknown Patient"
@@ -0,0 +1,176 @@
+# File: clinic-backend/core/metrics.py
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Request metrics in Prometheus text format.
+# Each worker process keeps its own registry, so with `--workers N` every
+# worker reports its own series; scrape them individually or aggregate by
+# instance. Everything runs on the event loop, so no locking is needed.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label for requests no route matched (404s, probes), so raw paths never become labels
+UNMATCHED_ROUTE = "<unmatched>"
+
+class _RouteStats:
+    __slots__ = ("buckets", "latency_sum", "count", "request_bytes", "response_bytes")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # The last one is +Inf
+        self.latency_sum = 0.0
+        self.count = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+class MetricsRegistry:
+    """Per-route request counters, latency histograms and payload sizes."""
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], _RouteStats] = {}
+        self.responses: Dict[Tuple[str, str, str], int] = {}
+        self.in_flight = 0
+        self._collectors: List[Tuple[str, Callable[[], dict]]] = []
+
+    def observe(self, method: str, route: str, status: int, seconds: float, request_bytes: int, response_bytes: int):
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[(method, route)] = _RouteStats()
+        stats.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        stats.latency_sum += seconds
+        stats.count += 1
+        stats.request_bytes += request_bytes
+        stats.response_bytes += response_bytes
+        key = (method, route, str(status))
+        self.responses[key] = self.responses.get(key, 0) + 1
+
+    def add_collector(self, prefix: str, collect: Callable[[], dict]):
+        """Exports a component's stats() dict as gauges named `<prefix>_<key>`."""
+        self._collectors.append((prefix, collect))
+
+    def render(self) -> str:
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_responses_total Responses by route template and status code.",
+            "# TYPE http_responses_total counter",
+        ]
+        for (method, route, status), count in sorted(self.responses.items()):
+            lines.append(f'http_responses_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), stats in sorted(self.routes.items()):
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), stats.buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {stats.latency_sum:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {stats.count}")
+
+        for name, attr, help_text in (
+            ("http_request_size_bytes_total", "request_bytes", "Request body bytes received by route template."),
+            ("http_response_size_bytes_total", "response_bytes", "Response body bytes sent by route template."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (method, route), stats in sorted(self.routes.items()):
+                lines.append(f'{name}{{method="{method}",route="{_escape(route)}"}} {getattr(stats, attr)}')
+
+        for prefix, collect in self._collectors:
+            try:
+                values = _flatten(prefix, collect())
+            except Exception as e:
+                print(f"Metrics collector '{prefix}' failed: {e}")
+                continue
+            for name, value in values:
+                lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+def _flatten(prefix: str, values: dict) -> List[Tuple[str, float]]:
+    flat = []
+    for key, value in values.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, dict):
+            flat.extend(_flatten(name, value))
+        elif isinstance(value, bool):
+            flat.append((name, int(value)))
+        elif isinstance(value, (int, float)):
+            flat.append((name, value))
+    return flat
+
+def _content_length(scope) -> Optional[int]:
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+metrics = MetricsRegistry()
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware, so streaming is untouched)
+    timing every HTTP request. Requests are labelled with the matched route's
+    template, e.g. "/users/me/appointments/{appointment_id}", which FastAPI
+    leaves in scope["route"] once routing has happened.
+    """
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        status = 500
+        response_bytes = 0
+        # Trust Content-Length when sent, so bodies a handler never reads still count
+        request_bytes = _content_length(scope)
+        count_body = request_bytes is None
+        request_bytes = request_bytes or 0
+
+        async def receive_wrapper():
+            nonlocal request_bytes
+            message = await receive()
+            if count_body and message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        registry.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            registry.in_flight -= 1
+            route = scope.get("route")
+            registry.observe(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                elapsed,
+                request_bytes,
+                response_bytes,
+            )
@@ -0,0 +1,88 @@
+# File: clinic-backend/core/notifications.py
+
+from datetime import date
+from typing import List
+from uuid import UUID
+
+from beanie import UpdateResponse
+from beanie.operators import Inc
+
+from models.clinic_models import Appointment, Notification, NotificationCounter
+from schemas.clinic_schemas import NotificationOut
+from .backplane import backplane
+from .config import settings
+from .connections import ConnectionManager
+from .jobs import job_runner
+
+# Appointment events pushed to patients and doctors
+APPOINTMENT_CREATED = "appointment.created"
+APPOINTMENT_STATUS_CHANGED = "appointment.status_changed"
+APPOINTMENT_DELETED = "appointment.deleted"
+
+# Replay fits in one connection's send queue; a client further behind than
+# this should refetch its appointment lists instead
+MAX_REPLAY = settings.WS_SEND_QUEUE_SIZE
+
+# Each user's open notification sockets form one "room" keyed by user id
+user_connections = ConnectionManager()
+backplane.add_handler("user", user_connections.broadcast)
+
+async def _next_seq(user_id: UUID) -> int:
+    counter = await NotificationCounter.find_one(NotificationCounter.user_id == user_id).update(
+        Inc({NotificationCounter.seq: 1}),
+        upsert=True,
+        response_type=UpdateResponse.NEW_DOCUMENT,
+    )
+    return counter.seq
+
+@job_runner.handler("notify_user", concurrency=8)
+async def notify_user(
+    user_id: UUID,
+    event: str,
+    appointment_id: UUID,
+    status: str,
+    appointment_date: date,
+    appointment_time: str,
+):
+    """Stores the next event for a user and pushes it to their sockets on every worker."""
+    notification = Notification(
+        user_id=user_id,
+        seq=await _next_seq(user_id),
+        event=event,
+        appointment_id=appointment_id,
+        status=status,
+        appointment_date=appointment_date,
+        appointment_time=appointment_time,
+    )
+    await notification.insert()
+    message = NotificationOut.model_validate(notification).model_dump_json()
+    await backplane.publish("user", str(user_id), message)
+
+async def publish_appointment_event(event: str, appointment: Appointment):
+    """
+    Queues a notification of an appointment change for both the patient and
+    the doctor, as separate jobs so a retry for one never repeats the other.
+    The appointment is captured as it is now, since it may be deleted.
+    """
+    snapshot = {
+        "event": event,
+        "appointment_id": appointment.appointment_id,
+        "status": appointment.status.value,
+        "appointment_date": appointment.appointment_date,
+        "appointment_time": appointment.appointment_time,
+    }
+    try:
+        await job_runner.enqueue_many("notify_user", [
+            {"user_id": user_id, **snapshot} for user_id in (appointment.patient_id, appointment.doctor_id)
+        ])
+    except Exception as e:
+        # The appointment change is already committed; a lost notification only costs the client a refresh
+        print(f"Failed to queue {event} for appointment {appointment.appointment_id}: {e}")
+
+async def events_since(user_id: UUID, since: int) -> List[str]:
+    """Stored events after `since`, oldest first, serialized for the socket."""
+    notifications = await Notification.find(
+        Notification.user_id == user_id,
+        Notification.seq > since,
+    ).sort("+seq").limit(MAX_REPLAY).to_list()
+    return [NotificationOut.model_validate(n).model_dump_json() for n in notifications]
@@ -0,0 +1,103 @@
+# File: clinic-backend/core/pagination.py
+
+import base64
+import binascii
+from datetime import date, datetime, time
+from typing import Any, List, Optional, Sequence, Tuple
+
+from bson import json_util
+from bson.binary import UuidRepresentation
+from bson.json_util import JSONOptions
+from fastapi import HTTPException, Query, Response
+from pymongo import ASCENDING, DESCENDING
+
+from .config import settings
+
+# Keyset pagination helpers.
+# A page is requested with ?limit=&cursor=. The cursor is an opaque, URL-safe
+# token holding the sort-key values of the last item on the previous page, and
+# the next page is fetched with a range filter on those keys (no skip), so each
+# page costs one index range scan no matter how deep the client has paged.
+# The token for the following page is returned in the X-Next-Cursor header and
+# is absent on the last page; list bodies keep their existing shape.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+SortSpec = Sequence[Tuple[str, int]]
+
+# Most recent first; _id breaks ties between equal timestamps
+NEWEST_FIRST = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+# Prescriptions, most recently issued first
+NEWEST_ISSUED_FIRST = [("issued_date", DESCENDING), ("_id", DESCENDING)]
+
+_JSON_OPTIONS = JSONOptions(uuid_representation=UuidRepresentation.STANDARD, tz_aware=False)
+
+class PageParams:
+    """Query parameters shared by every paginated list endpoint."""
+    def __init__(
+        self,
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+        cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+def encode_cursor(values: List[Any]) -> str:
+    raw = json_util.dumps(values, json_options=_JSON_OPTIONS).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: SortSpec) -> List[Any]:
+    """Decodes a cursor produced by encode_cursor. Raises a 400 if it was tampered with."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded), json_options=_JSON_OPTIONS)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return values
+
+def keyset_filter(sort: SortSpec, values: List[Any]) -> dict:
+    """
+    Builds the Mongo filter selecting items strictly after `values` in `sort` order,
+    e.g. for [(created_at, -1), (_id, -1)]:
+    {"$or": [{created_at: {$lt: v0}}, {created_at: v0, _id: {$lt: v1}}]}
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {sort[j][0]: values[j] for j in range(i)}
+        clause[field] = {"$gt" if direction == ASCENDING else "$lt": values[i]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+def cursor_filter(params: PageParams, sort: SortSpec) -> dict:
+    """The keyset filter for the requested page, or {} for the first page."""
+    if not params.cursor:
+        return {}
+    return keyset_filter(sort, decode_cursor(params.cursor, sort))
+
+def _sort_value(item: Any, field: str) -> Any:
+    if isinstance(item, dict):
+        value = item.get(field)
+    else:
+        value = getattr(item, "id" if field == "_id" else field)
+    # Dates are stored as midnight datetimes in Mongo, so compare against that form
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    return value
+
+def cursor_for(item: Any, sort: SortSpec) -> str:
+    """Cursor pointing just past `item`, which may be a raw document or a model."""
+    return encode_cursor([_sort_value(item, field) for field, _ in sort])
+
+def split_page(items: list, params: PageParams, sort: SortSpec, response: Response) -> list:
+    """
+    Trims a result fetched with limit + 1 down to the page size and sets the
+    X-Next-Cursor header when there is a following page.
+    """
+    if len(items) > params.limit:
+        items = items[:params.limit]
+        response.headers[NEXT_CURSOR_HEADER] = cursor_for(items[-1], sort)
+    return items
+
@@ -0,0 +1,219 @@
+# File: clinic-backend/core/profiler.py
+
+import asyncio
+import json
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+from .config import settings
+
+# Database query profiler (enable with QUERY_PROFILER_ENABLED).
+# A PyMongo CommandListener sees every command Beanie and Motor send. Motor
+# runs PyMongo on worker threads but copies the caller's contextvars into
+# them, so each event can be tied to the request that issued it through
+# _current_profile, which QueryProfilerMiddleware sets per request.
+
+# Commands that are driver housekeeping rather than application queries
+_IGNORED_COMMANDS = {
+    "hello", "ismaster", "isMaster", "ping", "endSessions", "saslStart",
+    "saslContinue", "buildInfo", "getLastError", "killCursors", "explain",
+}
+
+# Where each command keeps its filter
+_FILTER_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+}
+
+# Commands whose plans can be explained
+_EXPLAINABLE = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+
+# Session and cluster fields the server rejects inside an explain
+_COMMAND_ONLY_FIELDS = {"lsid", "$db", "$clusterTime", "txnNumber", "$readPreference", "autocommit", "startTransaction"}
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("query_profile", default=None)
+
+def shape_of(value: Any) -> Any:
+    """Replaces every literal in a filter with "?", keeping field names and operators."""
+    if isinstance(value, dict):
+        return {key: shape_of(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        return [shape_of(item) for item in value]
+    return "?"
+
+def _filter_of(command_name: str, command: dict) -> Any:
+    field = _FILTER_FIELDS.get(command_name)
+    if field is not None:
+        return command.get(field, {})
+    if command_name == "aggregate":
+        # The stage names, with the first $match's filter, identify a pipeline
+        stages = []
+        for stage in command.get("pipeline", []):
+            name = next(iter(stage), "?")
+            stages.append({name: shape_of(stage[name])} if name == "$match" and not stages else name)
+        return stages
+    if command_name in ("update", "delete"):
+        statements = command.get(command_name + "s") or [{}]
+        return statements[0].get("q", {})
+    return {}
+
+def _documents_in(command_name: str, reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") is not None else 0
+    return int(reply.get("n", 0))
+
+class QueryRecord:
+    __slots__ = ("collection", "operation", "shape", "duration_ms", "documents")
+
+    def __init__(self, collection: str, operation: str, shape: str, duration_ms: float, documents: int):
+        self.collection = collection
+        self.operation = operation
+        self.shape = shape
+        self.duration_ms = duration_ms
+        self.documents = documents
+
+class RequestProfile:
+    """The queries one request issued. Appended to from Motor's worker threads."""
+    def __init__(self, label: str, loop: asyncio.AbstractEventLoop):
+        self.label = label
+        self.loop = loop
+        self.queries: List[QueryRecord] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: QueryRecord):
+        with self._lock:
+            self.queries.append(record)
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[Tuple[str, str, str], int]]:
+        """(collection, operation, shape) keys run more than `threshold` times."""
+        counts: Dict[Tuple[str, str, str], int] = {}
+        for query in self.queries:
+            key = (query.collection, query.operation, query.shape)
+            counts[key] = counts.get(key, 0) + 1
+        return [(key, count) for key, count in counts.items() if count > threshold]
+
+class QueryProfiler(monitoring.CommandListener):
+    """Records every application command against the current request's profile."""
+    def __init__(self):
+        self._client = None
+        self._pending: Dict[Tuple[int, Any], Tuple[RequestProfile, str, str, str, Optional[dict], str]] = {}
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.slow_queries = 0
+        self.n_plus_one_requests = 0
+
+    def attach(self, client):
+        """The Motor client used to run explain for slow queries."""
+        self._client = client
+
+    def started(self, event):
+        profile = _current_profile.get()
+        if profile is None or event.command_name in _IGNORED_COMMANDS:
+            return
+        command = event.command
+        operation = event.command_name
+        collection = command.get(operation) if isinstance(command.get(operation), str) else "?"
+        shape = json.dumps(shape_of(_filter_of(operation, command)), sort_keys=True, default=str)
+        explain = None
+        if operation in _EXPLAINABLE:
+            explain = {key: value for key, value in command.items() if key not in _COMMAND_ONLY_FIELDS}
+        with self._lock:
+            self._pending[(event.request_id, event.connection_id)] = (
+                profile, collection, operation, shape, explain, event.database_name,
+            )
+
+    def succeeded(self, event):
+        with self._lock:
+            pending = self._pending.pop((event.request_id, event.connection_id), None)
+        if pending is None:
+            return
+        profile, collection, operation, shape, explain, database = pending
+        duration_ms = event.duration_micros / 1000
+        record = QueryRecord(collection, operation, shape, duration_ms, _documents_in(operation, event.reply))
+        profile.add(record)
+        self.queries += 1
+
+        if duration_ms >= settings.QUERY_PROFILER_SLOW_MS:
+            self.slow_queries += 1
+            print(
+                f"[profiler] Slow query in {profile.label}: {operation} {collection} "
+                f"{shape} took {duration_ms:.1f}ms, {record.documents} documents"
+            )
+            if explain is not None and settings.QUERY_PROFILER_EXPLAIN_SLOW and self._client is not None:
+                # We are on a Motor worker thread; run the explain on the event loop
+                profile.loop.call_soon_threadsafe(
+                    asyncio.ensure_future, self._explain(database, explain, operation, collection)
+                )
+
+    def failed(self, event):
+        with self._lock:
+            self._pending.pop((event.request_id, event.connection_id), None)
+
+    async def _explain(self, database: str, command: dict, operation: str, collection: str):
+        # Explain is itself a command; run it outside any request profile
+        _current_profile.set(None)
+        try:
+            result = await self._client[database].command({"explain": command, "verbosity": "queryPlanner"})
+        except Exception as e:
+            print(f"[profiler] Could not explain {operation} {collection}: {e}")
+            return
+        winning_plan = result.get("queryPlanner", {}).get("winningPlan", {})
+        print(f"[profiler] Plan for {operation} {collection}: {json.dumps(winning_plan, default=str)}")
+
+    def finish(self, profile: RequestProfile):
+        """Flags probable N+1 patterns once a request is done."""
+        repeated = profile.repeated_shapes(settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            self.n_plus_one_requests += 1
+        for (collection, operation, shape), count in repeated:
+            print(
+                f"[profiler] Probable N+1 in {profile.label}: {operation} {collection} "
+                f"{shape} ran {count} times"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "queries": self.queries,
+            "slow_queries": self.slow_queries,
+            "n_plus_one_requests": self.n_plus_one_requests,
+        }
+
+query_profiler = QueryProfiler()
+
+class QueryProfilerMiddleware:
+    """Opens a query profile for each HTTP request and checks it for N+1 patterns at the end."""
+    def __init__(self, app, profiler: QueryProfiler = query_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(f"{scope['method']} {scope['path']}", asyncio.get_running_loop())
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_profile.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                profile.label = f"{scope['method']} {route.path}"
+            self.profiler.finish(profile)
+            if settings.QUERY_PROFILER_LOG_REQUESTS and profile.queries:
+                total_ms = sum(query.duration_ms for query in profile.queries)
+                print(
+                    f"[profiler] {profile.label}: {len(profile.queries)} queries, "
+                    f"{total_ms:.1f}ms in database, {1000 * (time.perf_counter() - started):.1f}ms total"
+                )
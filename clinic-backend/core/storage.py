@@ -0,0 +1,176 @@
+# File: clinic-backend/core/storage.py
+
+import abc
+import hashlib
+import hmac
+import os
+import shutil
+import time
+from typing import Optional
+from urllib.parse import urlencode
+from uuid import uuid4
+
+import cloudinary.api
+import cloudinary.exceptions
+import cloudinary.uploader
+import cloudinary.utils
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from .config import settings
+from .cloudinary_utils import upload_file_to_cloudinary
+
+class StorageBackend(abc.ABC):
+    """
+    Interface for storing uploaded files.
+    upload() returns a dict with at least "secure_url" and "public_id",
+    matching the shape of a Cloudinary upload result.
+
+    Direct uploads skip the API entirely: create_upload() returns signed
+    parameters the client sends its file with, straight to storage, and
+    get_asset() later reports what actually arrived.
+    """
+    @abc.abstractmethod
+    async def upload(self, file: UploadFile, folder: str) -> dict:
+        raise NotImplementedError
+
+    def new_public_id(self, folder: str, file_format: str) -> str:
+        return f"{folder.strip('/')}/{uuid4().hex}"
+
+    @abc.abstractmethod
+    def create_upload(self, public_id: str, content_type: str, size: int, expires: int) -> dict:
+        """Signed {"method", "url", "headers", "fields"} for uploading one file of `size` bytes to `public_id`."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_asset(self, public_id: str) -> Optional[dict]:
+        """{"public_id", "secure_url", "bytes", "format"} of a stored file, or None if it is missing."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, public_id: str):
+        raise NotImplementedError
+
+class CloudinaryStorage(StorageBackend):
+    """Stores files in Cloudinary without blocking the event loop."""
+    async def upload(self, file: UploadFile, folder: str) -> dict:
+        return await upload_file_to_cloudinary(file, folder)
+
+    def create_upload(self, public_id: str, content_type: str, size: int, expires: int) -> dict:
+        # Cloudinary accepts a signed request for an hour after its timestamp and
+        # cannot pin the size, so finalize_upload() checks it once the upload lands.
+        params = {"public_id": public_id, "timestamp": int(time.time())}
+        return {
+            "method": "POST",
+            "url": cloudinary.utils.cloudinary_api_url("upload", resource_type="image"),
+            "headers": {},
+            "fields": {
+                **params,
+                "api_key": settings.CLOUDINARY_API_KEY,
+                "signature": cloudinary.utils.api_sign_request(params, settings.CLOUDINARY_API_SECRET),
+            },
+        }
+
+    async def get_asset(self, public_id: str) -> Optional[dict]:
+        try:
+            resource = await run_in_threadpool(cloudinary.api.resource, public_id, resource_type="image")
+        except cloudinary.exceptions.NotFound:
+            return None
+        return {
+            "public_id": public_id,
+            "secure_url": resource["secure_url"],
+            "bytes": resource["bytes"],
+            "format": resource["format"],
+        }
+
+    async def delete(self, public_id: str):
+        await run_in_threadpool(cloudinary.uploader.destroy, public_id, resource_type="image", invalidate=True)
+
+def sign_local_upload(public_id: str, content_type: str, size: int, expires: int) -> str:
+    """HMAC the local upload server checks before accepting a file."""
+    message = f"{public_id}\n{content_type}\n{size}\n{expires}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+class LocalStorage(StorageBackend):
+    """
+    Stores files on the local filesystem under LOCAL_STORAGE_DIR.
+    main.py serves that directory at LOCAL_STORAGE_BASE_URL when this backend is active.
+    """
+    def __init__(self, root: str, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    async def upload(self, file: UploadFile, folder: str) -> dict:
+        extension = os.path.splitext(file.filename or "")[1].lower()
+        public_id = f"{folder.strip('/')}/{uuid4().hex}{extension}"
+        await run_in_threadpool(self._write, file, public_id)
+        return {
+            "public_id": public_id,
+            "secure_url": f"{self.base_url}/{public_id}",
+            "bytes": file.size,
+        }
+
+    def new_public_id(self, folder: str, file_format: str) -> str:
+        # Files are served as-is, so the extension carries the format
+        return f"{folder.strip('/')}/{uuid4().hex}.{file_format}"
+
+    def create_upload(self, public_id: str, content_type: str, size: int, expires: int) -> dict:
+        query = urlencode({
+            "content_type": content_type,
+            "size": size,
+            "expires": expires,
+            "signature": sign_local_upload(public_id, content_type, size, expires),
+        })
+        return {
+            "method": "PUT",
+            "url": f"{settings.LOCAL_STORAGE_UPLOAD_URL.rstrip('/')}/{public_id}?{query}",
+            "headers": {"Content-Type": content_type},
+            "fields": {},
+        }
+
+    async def get_asset(self, public_id: str) -> Optional[dict]:
+        path = self.path(public_id)
+        try:
+            size = await run_in_threadpool(os.path.getsize, path)
+        except OSError:
+            return None
+        return {
+            "public_id": public_id,
+            "secure_url": f"{self.base_url}/{public_id}",
+            "bytes": size,
+            "format": os.path.splitext(public_id)[1].lstrip("."),
+        }
+
+    async def delete(self, public_id: str):
+        try:
+            await run_in_threadpool(os.remove, self.path(public_id))
+        except FileNotFoundError:
+            pass
+
+    def path(self, public_id: str) -> str:
+        path = os.path.realpath(os.path.join(self.root, public_id))
+        if not path.startswith(os.path.realpath(self.root) + os.sep):
+            raise ValueError(f"Invalid public_id: {public_id!r}")
+        return path
+
+    def _write(self, file: UploadFile, public_id: str):
+        path = os.path.join(self.root, public_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file.file.seek(0)
+        with open(path, "wb") as out:
+            # Copy in fixed-size chunks so large files are never held in memory whole
+            shutil.copyfileobj(file.file, out, settings.STORAGE_CHUNK_SIZE)
+
+_storage: StorageBackend | None = None
+
+def get_storage() -> StorageBackend:
+    """Returns the storage backend selected by STORAGE_BACKEND."""
+    global _storage
+    if _storage is None:
+        if settings.STORAGE_BACKEND == "local":
+            _storage = LocalStorage(settings.LOCAL_STORAGE_DIR, settings.LOCAL_STORAGE_BASE_URL)
+        elif settings.STORAGE_BACKEND == "cloudinary":
+            _storage = CloudinaryStorage()
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND!r}")
+    return _storage
@@ -0,0 +1,81 @@
+# File: clinic-backend/core/upload_server.py
+
+import hmac
+import os
+import time
+from uuid import uuid4
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from .config import settings
+from .storage import LocalStorage, sign_local_upload
+
+# Stand-in for Cloudinary's upload API when STORAGE_BACKEND is "local".
+# It accepts the signed PUTs LocalStorage.create_upload() describes and writes
+# them under LOCAL_STORAGE_DIR. main.py mounts it at LOCAL_STORAGE_UPLOAD_URL;
+# to keep upload traffic off the API process, run it on its own instead:
+#   uvicorn core.upload_server:app --port 9000
+# and point LOCAL_STORAGE_UPLOAD_URL at it.
+
+storage = LocalStorage(settings.LOCAL_STORAGE_DIR, settings.LOCAL_STORAGE_BASE_URL)
+
+def _error(status_code: int, detail: str) -> JSONResponse:
+    return JSONResponse({"detail": detail}, status_code=status_code)
+
+async def put_file(request: Request):
+    public_id = request.path_params["public_id"]
+    query = request.query_params
+    try:
+        content_type = query["content_type"]
+        size = int(query["size"])
+        expires = int(query["expires"])
+        signature = query["signature"]
+        declared = request.headers.get("content-length")
+        declared = int(declared) if declared is not None else None
+    except (KeyError, ValueError):
+        return _error(400, "Missing or malformed upload parameters.")
+
+    expected = sign_local_upload(public_id, content_type, size, expires)
+    if not hmac.compare_digest(signature, expected):
+        return _error(403, "Invalid upload signature.")
+    if expires < time.time():
+        return _error(403, "Upload parameters have expired.")
+    if request.headers.get("content-type", "").split(";")[0].strip() != content_type:
+        return _error(415, f"Content-Type must be {content_type}.")
+    if declared is not None and declared != size:
+        return _error(400, f"The upload must be exactly {size} bytes.")
+
+    try:
+        path = storage.path(public_id)
+    except ValueError:
+        return _error(400, "Invalid public_id.")
+    await run_in_threadpool(os.makedirs, os.path.dirname(path), exist_ok=True)
+
+    # Stream into a temporary file and rename it into place, so a failed or
+    # mis-sized upload never leaves a partial asset behind
+    partial = f"{path}.{uuid4().hex}.part"
+    out = await run_in_threadpool(open, partial, "wb")
+    written = 0
+    try:
+        async for chunk in request.stream():
+            written += len(chunk)
+            if written > size:
+                return _error(400, f"The upload must be exactly {size} bytes.")
+            await run_in_threadpool(out.write, chunk)
+        if written != size:
+            return _error(400, f"The upload must be exactly {size} bytes.")
+        await run_in_threadpool(out.close)
+        await run_in_threadpool(os.replace, partial, path)
+    finally:
+        if not out.closed:
+            await run_in_threadpool(out.close)
+        if os.path.exists(partial):
+            await run_in_threadpool(os.remove, partial)
+
+    return JSONResponse({"public_id": public_id, "bytes": written}, status_code=201)
+
+app = Starlette(routes=[Route("/{public_id:path}", put_file, methods=["PUT"])])
@@ -0,0 +1,116 @@
+# File: clinic-backend/core/uploads.py
+
+import time
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+from jose import JWTError, jwt
+
+from .config import settings
+from .jobs import job_runner
+from .storage import get_storage
+
+# Direct-to-storage uploads.
+# 1. The client asks for an upload intent and gets signed parameters plus an
+#    upload token naming the exact public_id it may write.
+# 2. It sends the file straight to storage with those parameters.
+# 3. It finalizes the token: the API checks the stored asset has the declared
+#    size and format and returns an asset token, which registration exchanges
+#    for the URL.
+# The API only ever sees small JSON bodies.
+
+# What each kind of upload is for, and the content types it accepts
+UPLOAD_KINDS = {
+    "photo": {"folder": "clinic/doctor_photos", "content_types": {"image/jpeg", "image/png", "image/webp"}},
+    "degree": {"folder": "clinic/doctor_degrees", "content_types": {"application/pdf", "image/jpeg", "image/png"}},
+}
+
+# The format storage reports for each accepted content type
+CONTENT_TYPE_FORMATS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "application/pdf": "pdf",
+}
+
+UPLOAD_TOKEN = "upload"
+ASSET_TOKEN = "asset"
+
+def _encode(claims: dict) -> str:
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def _decode(token: str, purpose: str) -> dict:
+    try:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=400, detail=f"Invalid or expired {purpose} token.")
+    # Access tokens share the key; the purpose claim keeps the kinds apart
+    if claims.get("purpose") != purpose:
+        raise HTTPException(status_code=400, detail=f"Invalid or expired {purpose} token.")
+    return claims
+
+@job_runner.handler("storage.delete", concurrency=2)
+async def delete_asset(public_id: str):
+    await get_storage().delete(public_id)
+
+def create_upload_intent(kind: str, content_type: str, size: int) -> dict:
+    """Signed parameters for uploading one file directly to storage."""
+    allowed = UPLOAD_KINDS[kind]["content_types"]
+    if content_type not in allowed:
+        raise HTTPException(
+            status_code=415,
+            detail=f"A {kind} must be one of: {', '.join(sorted(allowed))}.",
+        )
+    if size > settings.UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Files may be at most {settings.UPLOAD_MAX_BYTES} bytes.")
+
+    storage = get_storage()
+    expires = int(time.time()) + settings.UPLOAD_INTENT_TTL_SECONDS
+    public_id = storage.new_public_id(UPLOAD_KINDS[kind]["folder"], CONTENT_TYPE_FORMATS[content_type])
+    upload = storage.create_upload(public_id, content_type, size, expires)
+    upload_token = _encode({
+        "purpose": UPLOAD_TOKEN,
+        "kind": kind,
+        "public_id": public_id,
+        "content_type": content_type,
+        "size": size,
+        "exp": expires,
+    })
+    return {
+        **upload,
+        "upload_token": upload_token,
+        "expires_at": datetime.fromtimestamp(expires, timezone.utc),
+    }
+
+async def finalize_upload(upload_token: str) -> dict:
+    """
+    Checks that the file an upload token allowed actually arrived with the
+    declared format and exact size, and returns an asset token for it.
+    Assets that fail the check are deleted from storage in the background.
+    """
+    claims = _decode(upload_token, UPLOAD_TOKEN)
+    storage = get_storage()
+    asset = await storage.get_asset(claims["public_id"])
+    if asset is None:
+        raise HTTPException(status_code=409, detail="The file has not been uploaded yet.")
+
+    expected_format = CONTENT_TYPE_FORMATS[claims["content_type"]]
+    if asset["format"] != expected_format or asset["bytes"] != claims["size"]:
+        await job_runner.enqueue("storage.delete", {"public_id": claims["public_id"]})
+        raise HTTPException(status_code=422, detail="The uploaded file does not match its upload intent.")
+
+    asset_token = _encode({
+        "purpose": ASSET_TOKEN,
+        "kind": claims["kind"],
+        "public_id": asset["public_id"],
+        "secure_url": asset["secure_url"],
+        "exp": int(time.time()) + settings.UPLOAD_INTENT_TTL_SECONDS,
+    })
+    return {**asset, "kind": claims["kind"], "asset_token": asset_token}
+
+def read_asset_token(asset_token: str, kind: str) -> dict:
+    """The verified asset behind a finalized upload of the given kind."""
+    claims = _decode(asset_token, ASSET_TOKEN)
+    if claims["kind"] != kind:
+        raise HTTPException(status_code=400, detail=f"Expected a {kind} upload, got a {claims['kind']}.")
+    return claims
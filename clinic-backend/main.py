@@ -1,24 +1,49 @@
 # File: clinic-backend/main.py
 
+import os
+
 from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import your initializers
-from core.db import init_db
+from core.db import init_db, close_db, pool_monitor
 from core.cloudinary_utils import configure_cloudinary
+from core.auth import get_password_hash_stats, shutdown_password_hasher
+from core.config import settings
+from core.pagination import NEXT_CURSOR_HEADER
+from core.doctor_directory import doctor_directory
+from core.backplane import backplane
+from core.cache import principal_cache
+from core.metrics import CONTENT_TYPE, MetricsMiddleware, metrics
+from core.profiler import QueryProfilerMiddleware, query_profiler
+from core.notifications import user_connections
+from core.upload_server import app as upload_server
+from core.jobs import job_runner
 
 # Import your API routers
-from api.routes import auth_routes, admin_routes, public_routes, user_routes, doctor_routes, websockets, review_routes
+from api.routes import auth_routes, admin_routes, public_routes, user_routes, doctor_routes, websockets, review_routes, health_routes
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """ Actions to perform on application startup and shutdown. """
     print("Application startup...")
-    await init_db()
-    configure_cloudinary()
+    app.state.db_client = await init_db()
+    if settings.STORAGE_BACKEND == "cloudinary":
+        configure_cloudinary()
+    await doctor_directory.start()
+    await backplane.start()
+    await job_runner.start()
     yield
     print("Application shutdown...")
+    # Jobs may still publish through the backplane while they drain
+    await job_runner.stop()
+    await backplane.stop()
+    await doctor_directory.stop()
+    shutdown_password_hasher()
+    close_db(app.state.db_client)
 
 app = FastAPI(lifespan=lifespan)
 
@@ -37,8 +62,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],  # Lets the frontend read pagination cursors
 )
 
+# Per-request database query profiling, for dev and staging
+if settings.QUERY_PROFILER_ENABLED:
+    app.add_middleware(QueryProfilerMiddleware)
+    metrics.add_collector("clinic_query_profiler", query_profiler.stats)
+
+# Added last so it is outermost and times the whole request, CORS included
+app.add_middleware(MetricsMiddleware)
+
+# Component stats exported alongside the request metrics on /metrics
+metrics.add_collector("clinic_password_hashing", get_password_hash_stats)
+metrics.add_collector("clinic_principal_cache", principal_cache.stats)
+metrics.add_collector("clinic_mongo_pool", pool_monitor.stats)
+metrics.add_collector("clinic_ws_video", websockets.manager.stats)
+metrics.add_collector("clinic_ws_notifications", user_connections.stats)
+metrics.add_collector("clinic_jobs", job_runner.stats)
+
 # ===================================================================
 # Include the API routers (with prefixes where needed)
 # ===================================================================
@@ -49,6 +91,20 @@ app.include_router(user_routes.router, prefix="/users", tags=["Users"])
 app.include_router(doctor_routes.router, prefix="/doctors", tags=["Doctors"])
 app.include_router(websockets.router, prefix="/ws", tags=["Websockets"])
 app.include_router(review_routes.router, prefix="/reviews", tags=["Reviews"])
+app.include_router(health_routes.router, prefix="/health", tags=["Health"])
+
+# Serve uploaded files when using the local storage backend
+if settings.STORAGE_BACKEND == "local":
+    os.makedirs(settings.LOCAL_STORAGE_DIR, exist_ok=True)
+    app.mount(settings.LOCAL_STORAGE_BASE_URL, StaticFiles(directory=settings.LOCAL_STORAGE_DIR), name="media")
+    # Stand-in for direct uploads, unless it runs as its own server
+    if settings.LOCAL_STORAGE_UPLOAD_URL.startswith("/"):
+        app.mount(settings.LOCAL_STORAGE_UPLOAD_URL, upload_server, name="storage-upload")
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus scrape endpoint."""
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
 
 # Root route
 @app.get("/")
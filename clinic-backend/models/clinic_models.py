@@ -4,8 +4,11 @@ from beanie import Document
 from pydantic import Field, BaseModel, conint
 from uuid import UUID, uuid4
 from datetime import datetime, date
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from enum import Enum
+from pymongo import IndexModel, DESCENDING
+
+from core.config import settings
 
 class AppointmentStatus(str, Enum):
     PENDING = "pending"
@@ -13,6 +16,13 @@ class AppointmentStatus(str, Enum):
     COMPLETED = "completed"
     CANCELLED = "cancelled"
 
+# Appointments in these states occupy the doctor's time slot
+SLOT_HOLDING_STATUSES = [
+    AppointmentStatus.PENDING.value,
+    AppointmentStatus.CONFIRMED.value,
+    AppointmentStatus.COMPLETED.value,
+]
+
 class Appointment(Document):
     appointment_id: UUID = Field(default_factory=uuid4, unique=True)
     patient_id: UUID = Field(..., index=True)
@@ -37,11 +47,30 @@ class Appointment(Document):
 
     class Settings:
         name = "appointments"
+        indexes = [
+            # Patient and doctor dashboards page newest-first by (created_at, _id)
+            IndexModel([("patient_id", 1), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("doctor_id", 1), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # A doctor's slot can be held by at most one live appointment. Inserting a
+            # clashing booking fails atomically with DuplicateKeyError; cancelling an
+            # appointment drops it from the index and frees the slot.
+            # Deploying: $in in a partial filter needs MongoDB 6.0+, and the build
+            # fails (and with it startup) while any slot is already double-booked;
+            # run scripts/dedupe_appointment_slots.py --apply against existing data first.
+            IndexModel(
+                [("doctor_id", 1), ("appointment_date", 1), ("appointment_time", 1)],
+                name="unique_active_doctor_slot",
+                unique=True,
+                partialFilterExpression={"status": {"$in": SLOT_HOLDING_STATUSES}},
+            ),
+        ]
 
 class Prescription(Document):
     prescription_id: UUID = Field(default_factory=uuid4, unique=True)
     patient_id: UUID = Field(..., index=True)
     doctor_id: UUID
+    # The appointment it was issued in; None for prescriptions recorded before issuance went through the API
+    appointment_id: Optional[UUID] = None
     medication: str
     dosage: str
     notes: Optional[str] = None
@@ -49,6 +78,11 @@ class Prescription(Document):
 
     class Settings:
         name = "prescriptions"
+        indexes = [
+            # Patient timeline and doctor listing, both paged newest first in index order
+            IndexModel([("patient_id", 1), ("issued_date", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("doctor_id", 1), ("issued_date", DESCENDING), ("_id", DESCENDING)]),
+        ]
 
 class Review(Document):
     review_id: UUID = Field(default_factory=uuid4, unique=True)
@@ -60,6 +94,110 @@ class Review(Document):
 
     class Settings:
         name = "reviews"
+        indexes = [
+            IndexModel([("review_id", 1)], unique=True),
+            IndexModel([("doctor_id", 1), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ]
+
+class DoctorRatingSummary(Document):
+    """
+    Running rating totals for one doctor, kept up to date with $inc by a job
+    as reviews are created, so ratings never require scanning the reviews
+    collection.
+    Rebuild with scripts/rebuild_rating_summaries.py.
+    """
+    doctor_id: UUID
+    review_count: int = 0
+    rating_total: int = 0
+    # Number of reviews per star rating, keyed "1" to "5"
+    histogram: Dict[str, int] = Field(default_factory=dict)
+    # The last few reviews folded in, so a retried job never counts one twice
+    recent_review_ids: List[UUID] = Field(default_factory=list)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    @property
+    def average(self) -> Optional[float]:
+        return round(self.rating_total / self.review_count, 2) if self.review_count else None
+
+    class Settings:
+        name = "doctor_rating_summaries"
+        indexes = [
+            IndexModel("doctor_id", unique=True),
+        ]
+
+# Notifications older than this are removed by a TTL index
+NOTIFICATION_RETENTION_SECONDS = int(settings.NOTIFICATION_RETENTION_HOURS * 3600)
+
+class NotificationCounter(Document):
+    """Last notification sequence number issued to a user, bumped with $inc."""
+    user_id: UUID
+    seq: int = 0
+
+    class Settings:
+        name = "notification_counters"
+        indexes = [
+            IndexModel("user_id", unique=True),
+        ]
+
+class Notification(Document):
+    """
+    One delta event for a user's notification channel, kept for a while so a
+    reconnecting client can replay everything after the last seq it saw.
+    """
+    user_id: UUID
+    seq: int
+    event: str
+    appointment_id: UUID
+    status: AppointmentStatus
+    appointment_date: date
+    appointment_time: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "notifications"
+        indexes = [
+            IndexModel([("user_id", 1), ("seq", 1)], unique=True),
+            IndexModel("created_at", expireAfterSeconds=NOTIFICATION_RETENTION_SECONDS),
+        ]
+
+# Finished jobs are removed by a TTL index
+JOB_RETENTION_SECONDS = int(settings.JOB_RETENTION_HOURS * 3600)
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class Job(Document):
+    """
+    A unit of deferred work for core/jobs.py. Queued jobs are claimed with
+    find_one_and_update, which stamps a lease; a job whose lease runs out
+    (its process died) is claimed again by another runner.
+    """
+    job_id: UUID = Field(default_factory=uuid4)
+    type: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    max_attempts: int
+    run_at: datetime = Field(default_factory=datetime.utcnow)
+    locked_by: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    class Settings:
+        name = "jobs"
+        indexes = [
+            IndexModel("job_id", unique=True),
+            # Claiming: due queued jobs, and running jobs whose lease expired
+            IndexModel([("status", 1), ("type", 1), ("run_at", 1)]),
+            IndexModel([("status", 1), ("lease_expires_at", 1)]),
+            # Only documents with finished_at set expire
+            IndexModel("finished_at", expireAfterSeconds=JOB_RETENTION_SECONDS),
+        ]
 
 # Note: The two schemas below are duplicates of what's in clinic_schemas.py.
 # It's best practice to remove them from this model file to avoid confusion.
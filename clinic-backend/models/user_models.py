@@ -2,6 +2,7 @@
 
 from beanie import Document # We no longer need Indexed directly from beanie
 from pydantic import Field, EmailStr
+from pymongo import IndexModel
 from typing import Optional
 from enum import Enum
 from uuid import UUID, uuid4
@@ -30,6 +31,13 @@ class User(Document):
 
     class Settings:
         name = "users"
+        indexes = [
+            # Every authenticated request that misses the principal cache looks users up by user_id
+            IndexModel("user_id", unique=True),
+            # Login looks users up by email, and registration relies on the
+            # unique constraint instead of checking for an existing account first
+            IndexModel("email", unique=True),
+        ]
 
 class DoctorStatus(str, Enum):
     """
@@ -54,4 +62,9 @@ class DoctorProfile(Document):
     
     class Settings:
         name = "doctor_profiles"
+        indexes = [
+            IndexModel("doctor_id", unique=True),
+            # Admin review queue: pending profiles in registration (ObjectId) order
+            IndexModel([("status", 1), ("_id", 1)]),
+        ]
 
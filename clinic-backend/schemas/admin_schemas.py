@@ -1,15 +1,42 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Literal, Optional
 from uuid import UUID
 
 # Import the DoctorStatus Enum from your models
 from models.user_models import DoctorStatus
+from schemas.clinic_schemas import PrescriptionOut, ReviewOut
 
 # ADD THIS CLASS
 # This schema is used for the request body when updating a doctor's status
 class DoctorStatusUpdate(BaseModel):
     status: DoctorStatus # Will accept 'verified' or 'rejected'
 
+# Upper bound on doctors per bulk status request
+MAX_BULK_STATUS_UPDATES = 1000
+
+class DoctorStatusBulkItem(BaseModel):
+    doctor_id: UUID
+    status: DoctorStatus
+
+class DoctorStatusBulkUpdate(BaseModel):
+    """
+    Schema for setting many pending doctors' statuses in one request.
+    """
+    updates: List[DoctorStatusBulkItem] = Field(min_length=1, max_length=MAX_BULK_STATUS_UPDATES)
+
+class DoctorStatusOutcome(BaseModel):
+    """
+    What happened to one doctor in a bulk status request.
+    `status` is the doctor's status afterwards, when the profile exists.
+    """
+    doctor_id: UUID
+    outcome: Literal["updated", "not_found", "not_pending", "conflict", "duplicate", "invalid_status"]
+    status: Optional[DoctorStatus] = None
+
+class DoctorStatusBulkResult(BaseModel):
+    updated: int
+    results: List[DoctorStatusOutcome]
+
 
 # YOUR EXISTING CLASS (NO CHANGES NEEDED)
 class DoctorAdminOut(BaseModel):
@@ -26,4 +53,12 @@ class DoctorAdminOut(BaseModel):
     bio: Optional[str] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Row shapes for the admin export endpoints
+class PrescriptionExport(PrescriptionOut):
+    patient_id: UUID
+    doctor_id: UUID
+
+class ReviewExport(ReviewOut):
+    doctor_id: UUID
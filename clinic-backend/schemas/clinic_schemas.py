@@ -1,9 +1,9 @@
 # File: clinic-backend/schemas/clinic_schemas.py
 
-from pydantic import BaseModel, conint
+from pydantic import BaseModel, Field, conint, field_validator
 from uuid import UUID
 from datetime import date, datetime
-from typing import Optional
+from typing import Dict, List, Optional
 from models.clinic_models import AppointmentStatus
 
 class AppointmentCreate(BaseModel):
@@ -20,6 +20,12 @@ class AppointmentCreate(BaseModel):
     patient_phone: Optional[str] = None
     patient_address: Optional[str] = None
 
+    @field_validator("appointment_time")
+    @classmethod
+    def normalize_time(cls, value: str) -> str:
+        """'9:00  am' and '9:00 AM' must name the same slot for the clash check."""
+        return " ".join(value.split()).upper()
+
 class AppointmentOut(BaseModel):
     appointment_id: UUID
     patient_id: UUID
@@ -38,6 +44,7 @@ class AppointmentOut(BaseModel):
 
 class PrescriptionOut(BaseModel):
     prescription_id: UUID
+    appointment_id: Optional[UUID] = None
     medication: str
     dosage: str
     notes: Optional[str] = None
@@ -46,6 +53,20 @@ class PrescriptionOut(BaseModel):
     class Config:
         from_attributes = True
 
+class PrescriptionWithPatientInfo(PrescriptionOut):
+    """Extends PrescriptionOut with the patient, for the doctor-side listing."""
+    patient_id: UUID
+    patient_name: Optional[str] = None
+
+class PrescriptionItem(BaseModel):
+    medication: str = Field(min_length=1)
+    dosage: str = Field(min_length=1)
+    notes: Optional[str] = None
+
+class PrescriptionIssue(BaseModel):
+    """One or more prescriptions issued together in an appointment."""
+    prescriptions: List[PrescriptionItem] = Field(min_length=1, max_length=50)
+
 class ReviewCreate(BaseModel):
     rating: conint(ge=1, le=5) 
     comment: Optional[str] = None
@@ -75,3 +96,37 @@ class AppointmentWithPatientInfo(AppointmentOut):
 
     class Config:
         from_attributes = True
+
+class RatingSummaryOut(BaseModel):
+    """Aggregated ratings for a doctor: review count, mean and 1-5 star histogram."""
+    doctor_id: UUID
+    count: int = 0
+    average: Optional[float] = None
+    histogram: Dict[str, int]
+
+    @classmethod
+    def empty(cls, doctor_id: UUID) -> "RatingSummaryOut":
+        return cls(doctor_id=doctor_id, histogram={str(star): 0 for star in range(1, 6)})
+
+    @classmethod
+    def from_summary(cls, summary) -> "RatingSummaryOut":
+        histogram = {str(star): summary.histogram.get(str(star), 0) for star in range(1, 6)}
+        return cls(
+            doctor_id=summary.doctor_id,
+            count=summary.review_count,
+            average=summary.average,
+            histogram=histogram,
+        )
+
+class NotificationOut(BaseModel):
+    """A delta event pushed on /ws/notifications; `seq` increases per user."""
+    seq: int
+    event: str
+    appointment_id: UUID
+    status: AppointmentStatus
+    appointment_date: date
+    appointment_time: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
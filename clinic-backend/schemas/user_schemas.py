@@ -1,8 +1,9 @@
 # File: clinic-backend/schemas/user_schemas.py
 
+from datetime import datetime
 from pydantic import BaseModel, EmailStr, Field
 from uuid import UUID
-from typing import Optional
+from typing import Any, Dict, List, Literal, Optional
 from models.user_models import Role # Import the Enum from your models
 
 # ==================
@@ -43,8 +44,10 @@ class DoctorCreate(BaseModel):
     full_name: str
     specialty: str
     bio: Optional[str] = None
-    # In the actual endpoint, we'll handle file uploads separately
-    # and get URLs to populate photo_url and degree_url.
+    # Asset tokens from POST /auth/uploads/finalize; the files themselves
+    # go straight to storage (see core/uploads.py)
+    photo_asset: str
+    degree_asset: str
 
 class DoctorOut(BaseModel):
     """
@@ -55,9 +58,63 @@ class DoctorOut(BaseModel):
     specialty: str
     bio: Optional[str] = None
     photo_url: Optional[str] = None
+    # Filled from DoctorRatingSummary by the public directory
+    rating_count: int = 0
+    rating_average: Optional[float] = None
     
     class Config:
         from_attributes = True
+class DoctorSearchOut(BaseModel):
+    """
+    Schema for a page of doctor search results.
+    facets counts matching doctors per specialty, ignoring the specialty filter.
+    """
+    items: List[DoctorOut]
+    facets: Dict[str, int]
+    next_cursor: Optional[str] = None
+
+# ==================
+# Upload Schemas
+# ==================
+
+class UploadIntentCreate(BaseModel):
+    """
+    Schema for requesting signed parameters to upload a file directly to storage.
+    """
+    kind: Literal["photo", "degree"]
+    content_type: str
+    size: int = Field(gt=0, description="File size in bytes")
+
+class UploadIntentOut(BaseModel):
+    """
+    Schema for signed upload parameters.
+    Send the file to `url` with `method`, `headers` and, for POST, the
+    multipart `fields` plus a `file` part; a PUT carries the raw bytes.
+    """
+    method: str
+    url: str
+    headers: Dict[str, str]
+    fields: Dict[str, Any]
+    upload_token: str
+    expires_at: datetime
+
+class UploadFinalize(BaseModel):
+    """
+    Schema for confirming a direct upload has finished.
+    """
+    upload_token: str
+
+class UploadedAssetOut(BaseModel):
+    """
+    Schema for a verified upload. Pass asset_token on to registration.
+    """
+    kind: str
+    public_id: str
+    secure_url: str
+    bytes: int
+    format: str
+    asset_token: str
+
 # ==================
 # Token Schemas
 # ==================
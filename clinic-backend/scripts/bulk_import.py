@@ -0,0 +1,352 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
+from dotenv import load_dotenv
+
+# Allow script to import from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Load .env file
+dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
+load_dotenv(dotenv_path=dotenv_path)
+
+# These imports MUST come AFTER loading the .env file
+from beanie.odm.utils.dump import get_dict
+from beanie.operators import In
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from core.db import init_db, close_db
+from core.auth import get_password_hash
+from models.user_models import User, DoctorProfile, Role, DoctorStatus
+from models.clinic_models import Appointment
+from schemas.clinic_schemas import AppointmentCreate
+
+# Bulk importer for onboarding a partner clinic.
+#
+#   python scripts/bulk_import.py users patients.csv
+#   python scripts/bulk_import.py doctors doctors.jsonl
+#   python scripts/bulk_import.py appointments history.csv --batch-size 10000
+#
+# Input is streamed (CSV with a header row, or JSON Lines) and every row is
+# validated against the Beanie models. Invalid rows go to <input>.rejects.jsonl
+# with the reason; rows that already exist (same email, or a clashing slot)
+# are skipped. After each batch is written the input line is checkpointed to
+# <input>.checkpoint.json, so re-running the same command after a failure
+# resumes where it stopped. (Users and doctors are deduplicated by email on a
+# rerun; appointments only by the live-slot index, so cancelled appointments
+# from a batch that failed halfway can be inserted twice.) A doctor's user is
+# inserted before their profile, so a doctors rerun also creates the profile
+# of any existing doctor account that lacks one.
+#
+# The users kind imports patients only; doctors need a profile, so they come
+# in through the doctors kind, and admins only from scripts/create_admin.py.
+#
+# Passwords are hashed on a process pool while the previous batch is being
+# inserted. Rows that carry a bcrypt `hashed_password` instead of `password`
+# skip hashing entirely.
+
+DUPLICATE_KEY = 11000
+
+class Row:
+    """A raw input row: its line number and fields, or why it could not be parsed."""
+    __slots__ = ("line", "fields", "error")
+
+    def __init__(self, line: int, fields: dict, error: Optional[str] = None):
+        self.line = line
+        self.fields = fields
+        self.error = error
+
+def read_rows(path: str, file_format: str, start_after: int) -> Iterator[Row]:
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            # Line numbers count data rows (the header is line 0)
+            for line, fields in enumerate(csv.DictReader(f), start=1):
+                if line > start_after:
+                    yield Row(line=line, fields={k: (v if v != "" else None) for k, v in fields.items()})
+        else:
+            for line, text in enumerate(f, start=1):
+                if line > start_after and text.strip():
+                    # A malformed line is rejected like any invalid row, so it can't stall a resume
+                    try:
+                        fields = json.loads(text)
+                    except json.JSONDecodeError as e:
+                        yield Row(line=line, fields={}, error=f"invalid JSON: {e}")
+                        continue
+                    if not isinstance(fields, dict):
+                        yield Row(line=line, fields={}, error="expected a JSON object")
+                        continue
+                    yield Row(line=line, fields=fields)
+
+class Batch:
+    """Validated documents for one batch, plus the rows rejected along the way."""
+    def __init__(self):
+        self.users: List[User] = []
+        self.passwords: List[Optional[str]] = []
+        self.profiles: List[DoctorProfile] = []
+        self.appointments: List[Appointment] = []
+        self.rejected: List[Tuple[int, str]] = []
+        self.skipped = 0
+        self.last_line = 0
+
+class Importer:
+    def __init__(self, kind: str, pool: ProcessPoolExecutor):
+        self.kind = kind
+        self.pool = pool
+
+    async def prepare(self, rows: List[Row]) -> Batch:
+        batch = Batch()
+        batch.last_line = rows[-1].line
+        batch.rejected.extend((row.line, row.error) for row in rows if row.error)
+        rows = [row for row in rows if not row.error]
+        if not rows:
+            return batch
+        if self.kind in ("users", "doctors"):
+            await self._prepare_accounts(rows, batch)
+        else:
+            await self._prepare_appointments(rows, batch)
+        return batch
+
+    async def _prepare_accounts(self, rows: List[Row], batch: Batch):
+        # Skip emails that already have an account, so reruns are idempotent
+        emails = [row.fields.get("email") for row in rows if row.fields.get("email")]
+        existing = {user.email: user for user in await User.find(In(User.email, emails)).to_list()}
+        # Doctor accounts whose profile never made it in (the run stopped between the two inserts)
+        without_profile = set()
+        if self.kind == "doctors":
+            doctor_ids = [user.user_id for user in existing.values() if user.role == Role.DOCTOR]
+            if doctor_ids:
+                with_profile = {p.doctor_id for p in await DoctorProfile.find(In(DoctorProfile.doctor_id, doctor_ids)).to_list()}
+                without_profile = set(doctor_ids) - with_profile
+        seen = set()
+        for row in rows:
+            f = row.fields
+            email = f.get("email")
+            if email in existing or email in seen:
+                user = existing.get(email)
+                if user is not None and user.user_id in without_profile:
+                    without_profile.discard(user.user_id)
+                    try:
+                        batch.profiles.append(doctor_profile(user.user_id, f))
+                    except (ValidationError, ValueError) as e:
+                        batch.rejected.append((row.line, str(e)))
+                        continue
+                batch.skipped += 1
+                continue
+            try:
+                if not f.get("password") and not f.get("hashed_password"):
+                    raise ValueError("either password or hashed_password is required")
+                if f.get("password") and len(f["password"]) < 8:
+                    raise ValueError("password must be at least 8 characters")
+                role = Role.DOCTOR if self.kind == "doctors" else Role(f.get("role") or Role.PATIENT.value)
+                if self.kind == "users" and role != Role.PATIENT:
+                    raise ValueError("role must be patient; import doctors with the doctors kind")
+                user = User(
+                    email=email,
+                    full_name=f.get("full_name"),
+                    # Replaced below once the password is hashed
+                    hashed_password=f.get("hashed_password") or "pending",
+                    role=role,
+                )
+                profile = doctor_profile(user.user_id, f) if self.kind == "doctors" else None
+            except (ValidationError, ValueError) as e:
+                batch.rejected.append((row.line, str(e)))
+                continue
+            seen.add(email)
+            batch.users.append(user)
+            batch.passwords.append(None if f.get("hashed_password") else f["password"])
+            if profile is not None:
+                batch.profiles.append(profile)
+
+        # Hash on the process pool; the event loop stays free for the previous batch's insert
+        to_hash = [(i, password) for i, password in enumerate(batch.passwords) if password is not None]
+        if to_hash:
+            loop = asyncio.get_running_loop()
+            hashes = await asyncio.gather(*(
+                loop.run_in_executor(self.pool, get_password_hash, password) for _, password in to_hash
+            ))
+            for (i, _), hashed in zip(to_hash, hashes):
+                batch.users[i].hashed_password = hashed
+
+    async def _prepare_appointments(self, rows: List[Row], batch: Batch):
+        # Appointments may reference people by id or by email; resolve emails in one query
+        emails = set()
+        for row in rows:
+            for role in ("patient", "doctor"):
+                if not row.fields.get(f"{role}_id") and row.fields.get(f"{role}_email"):
+                    emails.add(row.fields[f"{role}_email"])
+        ids_by_email = {}
+        if emails:
+            ids_by_email = {user.email: user.user_id for user in await User.find(In(User.email, list(emails))).to_list()}
+
+        for row in rows:
+            f = row.fields
+            try:
+                ids = {}
+                for role in ("patient", "doctor"):
+                    value = f.get(f"{role}_id")
+                    if value:
+                        ids[role] = UUID(str(value))
+                    elif f.get(f"{role}_email") in ids_by_email:
+                        ids[role] = ids_by_email[f[f"{role}_email"]]
+                    else:
+                        raise ValueError(f"unknown {role}: give {role}_id or the email of an imported account")
+                fields = {
+                    key: value for key, value in f.items()
+                    if key in Appointment.model_fields and key not in ("patient_id", "doctor_id") and value is not None
+                }
+                if "appointment_time" in fields:
+                    fields["appointment_time"] = AppointmentCreate.normalize_time(fields["appointment_time"])
+                appointment = Appointment(patient_id=ids["patient"], doctor_id=ids["doctor"], **fields)
+            except (ValidationError, ValueError) as e:
+                batch.rejected.append((row.line, str(e)))
+                continue
+            batch.appointments.append(appointment)
+
+    async def write(self, batch: Batch) -> Tuple[int, int]:
+        """Inserts a prepared batch; returns (inserted, skipped as duplicates)."""
+        if self.kind == "appointments":
+            return await insert_unordered(Appointment, batch.appointments)
+        inserted, duplicates = await insert_unordered(User, batch.users)
+        if batch.profiles:
+            # Only profiles whose user made it in, or already existed
+            failed = {user.user_id for user in batch.users} - set(await inserted_user_ids(batch.users))
+            await insert_unordered(DoctorProfile, [p for p in batch.profiles if p.doctor_id not in failed])
+        return inserted, duplicates
+
+def doctor_profile(doctor_id: UUID, f: dict) -> DoctorProfile:
+    return DoctorProfile(
+        doctor_id=doctor_id,
+        full_name=f.get("full_name"),
+        specialty=f.get("specialty"),
+        bio=f.get("bio"),
+        photo_url=f.get("photo_url"),
+        degree_url=f.get("degree_url"),
+        status=DoctorStatus(f.get("status") or DoctorStatus.PENDING.value),
+    )
+
+async def inserted_user_ids(users: List[User]) -> List[UUID]:
+    rows = await User.get_motor_collection().find(
+        {"user_id": {"$in": [user.user_id for user in users]}}, {"user_id": 1}
+    ).to_list(length=None)
+    return [row["user_id"] for row in rows]
+
+async def insert_unordered(model, documents) -> Tuple[int, int]:
+    """Raw unordered insert_many; duplicate-key rows are counted and skipped, anything else raises."""
+    if not documents:
+        return 0, 0
+    collection = model.get_motor_collection()
+    try:
+        result = await collection.insert_many([get_dict(doc, to_db=True) for doc in documents], ordered=False)
+        return len(result.inserted_ids), 0
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        other = [error for error in errors if error.get("code") != DUPLICATE_KEY]
+        if other:
+            raise
+        return e.details.get("nInserted", 0), len(errors)
+
+def load_checkpoint(path: str, input_path: str, kind: str) -> dict:
+    if not os.path.exists(path):
+        return {"line": 0, "inserted": 0, "skipped": 0, "rejected": 0}
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("input") != os.path.abspath(input_path) or checkpoint.get("kind") != kind:
+        raise SystemExit(f"Checkpoint {path} belongs to a different import; delete it or pass --checkpoint.")
+    return checkpoint
+
+def save_checkpoint(path: str, checkpoint: dict):
+    # Write then rename, so a crash never leaves a half-written checkpoint
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(temp_path, path)
+
+async def main():
+    """
+    Streams CSV/JSONL rows into users, doctors or appointments in batches.
+    """
+    parser = argparse.ArgumentParser(description="Bulk import users, doctors or appointments.")
+    parser.add_argument("kind", choices=["users", "doctors", "appointments"])
+    parser.add_argument("input", help="CSV (with header) or JSON Lines file")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Password hashing processes")
+    parser.add_argument("--checkpoint", help="Defaults to <input>.checkpoint.json")
+    parser.add_argument("--restart", action="store_true", help="Ignore any checkpoint and start from the top")
+    args = parser.parse_args()
+
+    file_format = args.format or ("jsonl" if args.input.endswith((".jsonl", ".ndjson")) else "csv")
+    checkpoint_path = args.checkpoint or args.input + ".checkpoint.json"
+    rejects_path = args.input + ".rejects.jsonl"
+
+    print("--- Bulk Import Script ---")
+    checkpoint = {"line": 0, "inserted": 0, "skipped": 0, "rejected": 0}
+    if not args.restart:
+        checkpoint = load_checkpoint(checkpoint_path, args.input, args.kind)
+    checkpoint.update(input=os.path.abspath(args.input), kind=args.kind)
+    if checkpoint["line"]:
+        print(f"Resuming after line {checkpoint['line']} ({checkpoint['inserted']} rows already imported).")
+
+    client = await init_db()
+    started = time.perf_counter()
+    processed = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool, open(rejects_path, "a") as rejects:
+        importer = Importer(args.kind, pool)
+        pending: Optional[asyncio.Task] = None
+        pending_batch: Optional[Batch] = None
+
+        async def finish_pending():
+            nonlocal processed
+            inserted, duplicates = await pending
+            checkpoint["inserted"] += inserted
+            checkpoint["skipped"] += pending_batch.skipped + duplicates
+            checkpoint["rejected"] += len(pending_batch.rejected)
+            checkpoint["line"] = pending_batch.last_line
+            for line, reason in pending_batch.rejected:
+                rejects.write(json.dumps({"line": line, "error": reason}) + "\n")
+            rejects.flush()
+            save_checkpoint(checkpoint_path, checkpoint)
+            processed += inserted + duplicates + pending_batch.skipped + len(pending_batch.rejected)
+            elapsed = time.perf_counter() - started
+            print(f"\r  line {checkpoint['line']}: {checkpoint['inserted']} imported, "
+                  f"{processed / max(elapsed, 1e-9):,.0f} rows/s", end="", flush=True)
+
+        rows: List[Row] = []
+        for row in read_rows(args.input, file_format, checkpoint["line"]):
+            rows.append(row)
+            if len(rows) < args.batch_size:
+                continue
+            # Validate and hash this batch while the previous one is being inserted
+            batch = await importer.prepare(rows)
+            rows = []
+            if pending is not None:
+                await finish_pending()
+            pending, pending_batch = asyncio.create_task(importer.write(batch)), batch
+        if rows:
+            batch = await importer.prepare(rows)
+            if pending is not None:
+                await finish_pending()
+            pending, pending_batch = asyncio.create_task(importer.write(batch)), batch
+        if pending is not None:
+            await finish_pending()
+
+    elapsed = time.perf_counter() - started
+    print()
+    print(f"Imported {checkpoint['inserted']} {args.kind}; skipped {checkpoint['skipped']} existing, "
+          f"rejected {checkpoint['rejected']} invalid (see {rejects_path}).")
+    print(f"This run: {processed} rows in {elapsed:.1f}s ({processed / max(elapsed, 1e-9):,.0f} rows/s).")
+    close_db(client)
+    # Finished cleanly; a later run of the same file should start over
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+if __name__ == "__main__":
+    asyncio.run(main())
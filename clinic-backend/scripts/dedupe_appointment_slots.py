@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Allow script to import from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Load .env file
+dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
+load_dotenv(dotenv_path=dotenv_path)
+
+# These imports MUST come AFTER loading the .env file
+from core.config import settings
+from core.db import create_client, close_db
+from models.clinic_models import Appointment, AppointmentStatus, SLOT_HOLDING_STATUSES
+
+# The unique partial index on (doctor_id, appointment_date, appointment_time)
+# cannot be built while a slot is held by more than one live appointment, and
+# every worker fails at startup when init_beanie tries to create it. Run this
+# before deploying that index: it keeps one appointment per slot (a completed
+# one if there is one, then a confirmed one, else the earliest booked) and
+# cancels the pending and confirmed others. Completed appointments are never
+# cancelled; slots with more than one are reported for manual cleanup.
+# It connects without init_beanie, so it works while the index is missing.
+
+INDEX_MIN_SERVER_VERSION = (6, 0)  # $in in a partialFilterExpression
+
+# Which booking keeps a slot; ties go to whoever booked first
+KEEP_ORDER = {
+    AppointmentStatus.COMPLETED.value: 0,
+    AppointmentStatus.CONFIRMED.value: 1,
+    AppointmentStatus.PENDING.value: 2,
+}
+
+# Only bookings that have not happened yet may be cancelled
+CANCELLABLE_STATUSES = [AppointmentStatus.PENDING.value, AppointmentStatus.CONFIRMED.value]
+
+async def main():
+    """
+    Finds doctor time slots held by more than one pending, confirmed or
+    completed appointment and, with --apply, cancels the extra pending and
+    confirmed ones.
+    """
+    print("--- Appointment Slot Dedupe Script ---")
+    parser = argparse.ArgumentParser(description="Cancel double-booked appointments before building the slot index.")
+    parser.add_argument("--apply", action="store_true", help="Cancel the extra bookings (default: only report them)")
+    args = parser.parse_args()
+
+    client = create_client()
+    try:
+        info = await client.server_info()
+        version = tuple(info["versionArray"][:2])
+        if version < INDEX_MIN_SERVER_VERSION:
+            print(f"Warning: MongoDB {info['version']} cannot build the slot index; it needs 6.0 or newer.")
+
+        collection = client[settings.DATABASE_NAME][Appointment.Settings.name]
+        pipeline = [
+            {"$match": {"status": {"$in": SLOT_HOLDING_STATUSES}}},
+            {"$sort": {"created_at": 1, "_id": 1}},
+            {"$group": {
+                "_id": {"doctor_id": "$doctor_id", "date": "$appointment_date", "time": "$appointment_time"},
+                "appointments": {"$push": {"_id": "$_id", "status": "$status"}},
+                "count": {"$sum": 1},
+            }},
+            {"$match": {"count": {"$gt": 1}}},
+        ]
+
+        slots = 0
+        extra_ids = []
+        manual = []
+        async for slot in collection.aggregate(pipeline, allowDiskUse=True):
+            slots += 1
+            # sorted() is stable, so booking order breaks ties within a status
+            keep, *others = sorted(slot["appointments"], key=lambda a: KEEP_ORDER[a["status"]])
+            extras = [appointment for appointment in others if appointment["status"] in CANCELLABLE_STATUSES]
+            key = slot["_id"]
+            print(f"  doctor {key['doctor_id']} on {key['date']} at {key['time']}: "
+                  f"keeping {keep['_id']} ({keep['status']}), cancelling {len(extras)}")
+            extra_ids.extend(appointment["_id"] for appointment in extras)
+            if len(others) > len(extras):
+                manual.append((key, [keep["_id"]] + [a["_id"] for a in others if a not in extras]))
+
+        if not slots:
+            print("No double-booked slots; the index can be built.")
+            return
+        print(f"Found {slots} double-booked slots with {len(extra_ids)} extra appointments.")
+        if manual:
+            print(f"{len(manual)} slots hold more than one completed appointment. Completed appointments are "
+                  f"never cancelled, so these must be fixed by hand before the index can be built:")
+            for key, ids in manual:
+                print(f"  doctor {key['doctor_id']} on {key['date']} at {key['time']}: {', '.join(map(str, ids))}")
+        if not extra_ids:
+            return
+        if not args.apply:
+            print("Dry run: nothing changed. Re-run with --apply to cancel them.")
+            return
+
+        # Still guarded on status, in case one was cancelled or completed since the scan
+        result = await collection.update_many(
+            {"_id": {"$in": extra_ids}, "status": {"$in": CANCELLABLE_STATUSES}},
+            {"$set": {"status": AppointmentStatus.CANCELLED.value, "updated_at": datetime.utcnow()}},
+        )
+        print(f"Cancelled {result.modified_count} appointments.")
+    finally:
+        close_db(client)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+import asyncio
+import os
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Allow script to import from the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Load .env file
+dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
+load_dotenv(dotenv_path=dotenv_path)
+
+# These imports MUST come AFTER loading the .env file
+from pymongo import ReplaceOne
+from core.db import init_db
+from models.clinic_models import Review, DoctorRatingSummary
+
+BATCH_SIZE = 1000
+
+async def main():
+    """
+    Recomputes every doctor's rating summary from the reviews collection.
+    Use it to backfill summaries or to repair them after manual data changes.
+    """
+    print("--- Rating Summary Rebuild Script ---")
+
+    await init_db()
+
+    # One pass over the reviews, grouped per doctor and per star rating
+    pipeline = [
+        {"$group": {
+            "_id": {"doctor_id": "$doctor_id", "rating": "$rating"},
+            "count": {"$sum": 1},
+        }},
+        {"$group": {
+            "_id": "$_id.doctor_id",
+            "count": {"$sum": "$count"},
+            "total": {"$sum": {"$multiply": ["$_id.rating", "$count"]}},
+            "histogram": {"$push": {"k": {"$toString": "$_id.rating"}, "v": "$count"}},
+        }},
+    ]
+
+    collection = DoctorRatingSummary.get_motor_collection()
+    now = datetime.utcnow()
+    doctor_ids = []
+    batch = []
+    async for row in Review.get_motor_collection().aggregate(pipeline, allowDiskUse=True):
+        doctor_ids.append(row["_id"])
+        batch.append(ReplaceOne(
+            {"doctor_id": row["_id"]},
+            {
+                "doctor_id": row["_id"],
+                "review_count": row["count"],
+                "rating_total": row["total"],
+                "histogram": {entry["k"]: entry["v"] for entry in row["histogram"]},
+                "updated_at": now,
+            },
+            upsert=True,
+        ))
+        if len(batch) >= BATCH_SIZE:
+            await collection.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        await collection.bulk_write(batch, ordered=False)
+
+    # Doctors whose reviews were all removed should not keep a stale summary
+    removed = await collection.delete_many({"doctor_id": {"$nin": doctor_ids}})
+
+    print(f"Rebuilt rating summaries for {len(doctor_ids)} doctors.")
+    print(f"Removed {removed.deleted_count} summaries with no remaining reviews.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
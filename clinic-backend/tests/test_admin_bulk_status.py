@@ -0,0 +1,60 @@
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+import api.routes.admin_routes as admin_routes
+from core.doctor_directory import DoctorDirectory
+from models.user_models import DoctorProfile, DoctorStatus
+from schemas.admin_schemas import DoctorStatusBulkUpdate
+
+
+@pytest_asyncio.fixture
+async def directory(monkeypatch):
+    await init_beanie(database=AsyncMongoMockClient()["test"], document_models=[DoctorProfile])
+    directory = DoctorDirectory()
+    monkeypatch.setattr(admin_routes, "doctor_directory", directory)
+    return directory
+
+
+def make_profile(status=DoctorStatus.PENDING):
+    return DoctorProfile(doctor_id=uuid4(), full_name="Dr Test", specialty="Cardiology", status=status)
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_reports_an_outcome_per_requested_id(directory):
+    approve = make_profile()
+    reject = make_profile()
+    already = make_profile(DoctorStatus.VERIFIED)
+    await DoctorProfile.insert_many([approve, reject, already])
+    missing = uuid4()
+    still_pending = uuid4()
+
+    body = DoctorStatusBulkUpdate(updates=[
+        {"doctor_id": approve.doctor_id, "status": "verified"},
+        {"doctor_id": reject.doctor_id, "status": "rejected"},
+        {"doctor_id": approve.doctor_id, "status": "rejected"},
+        {"doctor_id": already.doctor_id, "status": "rejected"},
+        {"doctor_id": missing, "status": "verified"},
+        {"doctor_id": still_pending, "status": "pending"},
+    ])
+    result = await admin_routes.update_doctor_statuses(body)
+
+    assert result["updated"] == 2
+    assert [(r["doctor_id"], r["outcome"], r.get("status")) for r in result["results"]] == [
+        (approve.doctor_id, "updated", DoctorStatus.VERIFIED),
+        (reject.doctor_id, "updated", DoctorStatus.REJECTED),
+        (approve.doctor_id, "duplicate", None),
+        (already.doctor_id, "not_pending", DoctorStatus.VERIFIED),
+        (missing, "not_found", None),
+        (still_pending, "invalid_status", None),
+    ]
+
+    # The first request for a duplicated id wins
+    assert (await DoctorProfile.find_one(DoctorProfile.doctor_id == approve.doctor_id)).status == DoctorStatus.VERIFIED
+    assert (await DoctorProfile.find_one(DoctorProfile.doctor_id == already.doctor_id)).status == DoctorStatus.VERIFIED
+    # Only the newly verified doctor is published
+    assert directory.get_json(approve.doctor_id) is not None
+    assert len(directory) == 1
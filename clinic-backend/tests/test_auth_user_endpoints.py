@@ -3,10 +3,20 @@ from httpx import AsyncClient
 from fastapi import FastAPI
 from api.routes.auth_routes import router as auth_router
 from api.routes.user_routes import router as user_router
+import core.storage
+from core.config import settings
+from core.upload_server import app as upload_server
 
 app = FastAPI()
-app.include_router(auth_router)
+app.include_router(auth_router, prefix="/auth")
 app.include_router(user_router)
+app.mount(settings.LOCAL_STORAGE_UPLOAD_URL, upload_server)
+
+@pytest.fixture
+def local_storage(monkeypatch):
+    """Sends uploads to the local stand-in storage server for one test."""
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(core.storage, "_storage", None)
 
 @pytest.mark.asyncio
 async def test_patient_registration_and_login():
@@ -27,31 +37,54 @@ async def test_patient_registration_and_login():
         assert response.status_code == 200
         assert "access_token" in response.json()
 
+async def upload_directly(ac, kind, path, content_type):
+    """Runs the intent -> direct PUT -> finalize flow and returns the asset token."""
+    with open(path, "rb") as f:
+        content = f.read()
+    response = await ac.post("/auth/uploads/intent", json={"kind": kind, "content_type": content_type, "size": len(content)})
+    assert response.status_code == 201
+    intent = response.json()
+    assert intent["method"] == "PUT"
+
+    response = await ac.put(intent["url"], content=content, headers=intent["headers"])
+    assert response.status_code == 201
+
+    response = await ac.post("/auth/uploads/finalize", json={"upload_token": intent["upload_token"]})
+    assert response.status_code == 200
+    assert response.json()["bytes"] == len(content)
+    return response.json()["asset_token"]
+
 @pytest.mark.asyncio
-async def test_doctor_registration_and_login():
+async def test_doctor_registration_and_login(local_storage):
     async with AsyncClient(app=app, base_url="http://test") as ac:
-        photo_path = "tests/sample_photo.jpg"
-        degree_path = "tests/sample_degree.pdf"
-
-        with open(photo_path, "rb") as photo_file, open(degree_path, "rb") as degree_file:
-            form_data = {
-                "email": "testdoctor@example.com",
-                "password": "strongpassword",
-                "full_name": "Dr. Test Doctor",
-                "specialty": "Cardiology",
-                "bio": "Experienced cardiologist."
-            }
-            files = {
-                "photo": ("sample_photo.jpg", photo_file, "image/jpeg"),
-                "degree": ("sample_degree.pdf", degree_file, "application/pdf")
-            }
-            response = await ac.post("/auth/register/doctor", data=form_data, files=files)
-            assert response.status_code == 201
-            assert response.json()["full_name"] == form_data["full_name"]
+        photo_asset = await upload_directly(ac, "photo", "tests/sample_photo.png", "image/png")
+        degree_asset = await upload_directly(ac, "degree", "tests/sample_degree.pdf", "application/pdf")
+
+        doctor_data = {
+            "email": "testdoctor@example.com",
+            "password": "strongpassword",
+            "full_name": "Dr. Test Doctor",
+            "specialty": "Cardiology",
+            "bio": "Experienced cardiologist.",
+            "photo_asset": photo_asset,
+            "degree_asset": degree_asset,
+        }
+        response = await ac.post("/auth/register/doctor", json=doctor_data)
+        assert response.status_code == 201
+        assert response.json()["full_name"] == doctor_data["full_name"]
+
+        # An upload token is not an asset token
+        response = await ac.post("/auth/uploads/intent", json={"kind": "photo", "content_type": "image/png", "size": 1})
+        upload_token = response.json()["upload_token"]
+        response = await ac.post(
+            "/auth/register/doctor",
+            json={**doctor_data, "email": "otherdoctor@example.com", "photo_asset": upload_token},
+        )
+        assert response.status_code == 400
 
         login_data = {
-            "username": form_data["email"],
-            "password": form_data["password"]
+            "username": doctor_data["email"],
+            "password": doctor_data["password"]
         }
         response = await ac.post("/auth/login", data=login_data)
         assert response.status_code == 403
@@ -0,0 +1,59 @@
+import asyncio
+import socket
+
+import pytest
+
+from core.backplane import InProcessBackplane, LocalSocketBackplane
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_in_process_backplane_dispatches_by_namespace():
+    backplane = InProcessBackplane()
+    received = []
+    backplane.add_handler("room", lambda key, message: received.append((key, message)))
+
+    await backplane.publish("room", "abc", "hi")
+    await backplane.publish("other", "abc", "ignored")
+
+    assert received == [("abc", "hi")]
+
+
+@pytest.mark.asyncio
+async def test_local_backplane_shares_rooms_across_workers_and_survives_broker_exit():
+    url = f"tcp://127.0.0.1:{free_port()}"
+    workers = [LocalSocketBackplane(url) for _ in range(3)]
+    received = {i: [] for i in range(3)}
+    for i, worker in enumerate(workers):
+        worker.add_handler("room", lambda key, message, i=i: received[i].append(message))
+        await worker.start()
+
+    assert sum(worker.is_broker for worker in workers) == 1
+
+    await workers[2].publish("room", "r1", "hello")
+    await wait_for(lambda: all(received[i] == ["hello"] for i in range(3)))
+
+    # The broker's worker goes away; a survivor takes over the address
+    broker = next(worker for worker in workers if worker.is_broker)
+    await broker.stop()
+    survivors = [worker for worker in workers if worker is not broker]
+    await wait_for(lambda: all(worker._writer is not None for worker in survivors))
+    await wait_for(lambda: sum(worker.is_broker for worker in survivors) == 1)
+
+    await survivors[0].publish("room", "r1", "again")
+    await wait_for(lambda: all(received[workers.index(w)][-1] == "again" for w in survivors))
+
+    for worker in survivors:
+        await worker.stop()
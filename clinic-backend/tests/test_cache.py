@@ -0,0 +1,30 @@
+from core.cache import TTLCache
+
+
+def test_cache_evicts_least_recently_used_entry():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_cache_expires_entries_and_supports_invalidation(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("core.cache.time.monotonic", lambda: clock[0])
+    cache = TTLCache(max_entries=10, ttl_seconds=5)
+    cache.set("user", "principal")
+    cache.set("other", "principal")
+
+    clock[0] += 6
+    assert cache.get("user") is None
+
+    cache.invalidate("other")
+    assert cache.get("other") is None
+    assert cache.stats()["misses"] == 2
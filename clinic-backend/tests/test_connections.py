@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from starlette.websockets import WebSocketState
+
+from core.connections import DROP, EVICT, SLOW_CONSUMER_CLOSE_CODE, ConnectionManager
+
+
+async def drain():
+    # Let the sender tasks pick up and write their queued messages
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class FakeWebSocket:
+    def __init__(self, stalled=False):
+        self.sent = []
+        self.closed_with = None
+        self.client_state = WebSocketState.CONNECTED
+        self._stalled = stalled
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        if self._stalled:
+            await asyncio.Event().wait()
+        self.sent.append(message)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+        self.client_state = WebSocketState.DISCONNECTED
+
+
+@pytest.mark.asyncio
+async def test_broadcast_only_reaches_the_same_room():
+    manager = ConnectionManager(queue_size=10, slow_consumer_policy=DROP)
+    alice, bob, carol = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    await manager.connect(alice, "room-1")
+    await manager.connect(bob, "room-1")
+    await manager.connect(carol, "room-2")
+
+    assert manager.broadcast("room-1", "hello") == 2
+    await drain()
+
+    assert alice.sent == ["hello"] and bob.sent == ["hello"]
+    assert carol.sent == []
+
+    manager.disconnect(alice, "room-1")
+    manager.disconnect(bob, "room-1")
+    assert manager.stats()["rooms"] == 1
+    manager.disconnect(carol, "room-2")
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_dropped_or_evicted_without_blocking_others():
+    for policy in (DROP, EVICT):
+        manager = ConnectionManager(queue_size=1, slow_consumer_policy=policy)
+        slow, fast = FakeWebSocket(stalled=True), FakeWebSocket()
+        await manager.connect(slow, "room")
+        await manager.connect(fast, "room")
+
+        for i in range(3):
+            manager.broadcast("room", str(i))
+            await drain()
+
+        assert fast.sent == ["0", "1", "2"]
+        if policy == DROP:
+            assert manager.room_size("room") == 2
+            assert manager.stats()["dropped_messages"] == 1
+        else:
+            assert manager.room_size("room") == 1
+            assert slow.closed_with == SLOW_CONSUMER_CLOSE_CODE
+        manager.disconnect(slow, "room")
+        manager.disconnect(fast, "room")
@@ -0,0 +1,77 @@
+import asyncio
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+from core.doctor_directory import DoctorDirectory
+from models.clinic_models import DoctorRatingSummary
+from models.user_models import DoctorProfile, DoctorStatus
+
+
+@pytest_asyncio.fixture
+async def db():
+    await init_beanie(database=AsyncMongoMockClient()["test"], document_models=[DoctorProfile, DoctorRatingSummary])
+
+
+def make_profile(full_name, status=DoctorStatus.VERIFIED):
+    return DoctorProfile(doctor_id=uuid4(), full_name=full_name, specialty="Cardiology", status=status)
+
+
+@pytest.mark.asyncio
+async def test_reload_keeps_changes_made_while_reading(db, monkeypatch):
+    stays = make_profile("Alice Adams")
+    leaves = make_profile("Bob Brown")
+    await DoctorProfile.insert_many([stays, leaves])
+    directory = DoctorDirectory()
+    await directory.reload()
+
+    # Hold the reload between its reads and its swap
+    reading = asyncio.Event()
+    resume = asyncio.Event()
+    find_all = DoctorRatingSummary.find_all
+
+    class GatedQuery:
+        async def to_list(self):
+            reading.set()
+            await resume.wait()
+            return await find_all().to_list()
+
+    monkeypatch.setattr(DoctorRatingSummary, "find_all", classmethod(lambda cls: GatedQuery()))
+    reload = asyncio.create_task(directory.reload())
+    await reading.wait()
+
+    # Local changes the reload's profile read did not see
+    joins = make_profile("Carol Clark")
+    directory.upsert(joins)
+    directory.remove(leaves.doctor_id)
+    summary = DoctorRatingSummary(doctor_id=stays.doctor_id, review_count=1, rating_total=5)
+    directory.update_rating(summary)
+
+    resume.set()
+    await reload
+
+    assert directory.get_json(joins.doctor_id) is not None
+    assert directory.get_json(leaves.doctor_id) is None
+    body, _ = directory.page_json(None, 10)
+    assert body.count(b'"doctor_id"') == 2
+    assert b'"rating_count":1' in directory.get_json(stays.doctor_id)
+
+
+def test_older_rating_summary_is_ignored():
+    directory = DoctorDirectory()
+    profile = make_profile("Alice Adams")
+    directory.upsert(profile)
+
+    newer = DoctorRatingSummary(doctor_id=profile.doctor_id, review_count=2, rating_total=9)
+    older = DoctorRatingSummary(doctor_id=profile.doctor_id, review_count=1, rating_total=4,
+                                updated_at=newer.updated_at - timedelta(seconds=1))
+    directory.update_rating(newer)
+    version = directory.version
+    directory.update_rating(older)
+
+    assert directory.version == version
+    assert b'"rating_count":2' in directory.get_json(profile.doctor_id)
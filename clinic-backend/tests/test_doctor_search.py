@@ -0,0 +1,96 @@
+from uuid import uuid4
+
+from core.doctor_search import DoctorSearchIndex
+from schemas.user_schemas import DoctorOut
+
+
+def make_doctor(full_name, specialty, bio=None):
+    return DoctorOut(doctor_id=uuid4(), full_name=full_name, specialty=specialty, bio=bio)
+
+
+def build_index():
+    doctors = {
+        "house": make_doctor("Gregory House", "Nephrology", "Diagnostic medicine and infectious disease."),
+        "grey": make_doctor("Meredith Grey", "General Surgery", "Trauma and general surgery."),
+        "strange": make_doctor("Stephen Strange", "Neurosurgery", "Complex neurosurgery cases."),
+        "shepherd": make_doctor("Derek Shepherd", "Neurosurgery", "Brain surgery."),
+    }
+    index = DoctorSearchIndex()
+    for doctor in doctors.values():
+        index.add(doctor)
+    return index, {key: doctor.doctor_id for key, doctor in doctors.items()}
+
+
+def test_search_ranks_name_matches_and_counts_facets():
+    index, ids = build_index()
+
+    results, facets, next_key = index.search("neurosurgery", None, limit=10)
+
+    assert set(results) == {ids["strange"], ids["shepherd"]}
+    assert facets == {"Neurosurgery": 2}
+    assert next_key is None
+
+    results, _, _ = index.search("surgery", None, limit=10)
+    # "surgery" is in Grey's specialty and bio, but only in Shepherd's bio
+    assert results == [ids["grey"], ids["shepherd"]]
+
+
+def test_last_term_matches_as_prefix_and_specialty_filters():
+    index, ids = build_index()
+
+    results, facets, _ = index.search("neuro", None, limit=10)
+    assert set(results) == {ids["strange"], ids["shepherd"]}
+
+    results, facets, _ = index.search(None, "general surgery", limit=10)
+    assert results == [ids["grey"]]
+    assert facets["Neurosurgery"] == 2  # facets ignore the specialty filter
+
+
+def test_search_pages_with_continuation_key():
+    index, ids = build_index()
+
+    first, _, next_key = index.search(None, None, limit=3)
+    second, _, last_key = index.search(None, None, limit=3, after=next_key)
+
+    assert len(first) == 3 and len(second) == 1
+    assert last_key is None
+    assert set(first + second) == set(ids.values())
+
+
+def test_removed_doctors_disappear_and_suggest_uses_names():
+    index, ids = build_index()
+
+    assert index.suggest("ste", limit=5) == [ids["strange"]]
+
+    index.remove(ids["strange"])
+    assert index.suggest("ste", limit=5) == []
+    assert len(index) == 3
+
+
+def test_suggest_is_not_crowded_out_by_bio_words():
+    index, _ = build_index()
+    wordy = make_doctor("Gregory Wordy", "Dermatology", " ".join(f"sa{n:03d}" for n in range(100)))
+    sarah = make_doctor("Sarah Smith", "Dermatology")
+    index.add(wordy)
+    index.add(sarah)
+
+    assert sarah.doctor_id in index.suggest("s", limit=10)
+    assert index.suggest("sa", limit=10) == [sarah.doctor_id]
+
+    index.remove(sarah.doctor_id)
+    assert index.suggest("sa", limit=10) == []
+
+
+def test_browsing_without_query_pages_in_name_order_and_counts_every_specialty():
+    index, ids = build_index()
+
+    first, facets, next_key = index.search(None, None, limit=2)
+    second, _, last_key = index.search(None, None, limit=2, after=next_key)
+
+    assert first + second == [ids["shepherd"], ids["house"], ids["grey"], ids["strange"]]
+    assert last_key is None
+    assert facets == {"Neurosurgery": 2, "Nephrology": 1, "General Surgery": 1}
+
+    results, facets, _ = index.search("", " neurosurgery ", limit=10)
+    assert results == [ids["shepherd"], ids["strange"]]
+    assert facets["General Surgery"] == 1
@@ -0,0 +1,76 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date, datetime
+from uuid import uuid4
+
+import pytest
+
+from core.config import settings
+from core.export import _encode, _gzip, date_range_filter
+from models.clinic_models import AppointmentStatus
+
+
+async def rows_of(rows):
+    for row in rows:
+        yield row
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.asyncio
+async def test_csv_has_header_and_plain_values():
+    appointment_id = uuid4()
+    rows = [
+        {"appointment_id": appointment_id, "status": AppointmentStatus.CONFIRMED,
+         "appointment_date": date(2024, 3, 1), "created_at": datetime(2024, 2, 28, 9, 30), "reason": None},
+        {"appointment_id": appointment_id, "status": AppointmentStatus.PENDING,
+         "appointment_date": date(2024, 3, 2), "created_at": datetime(2024, 2, 29, 17, 0), "reason": "Has, a comma"},
+    ]
+    columns = ["appointment_id", "status", "appointment_date", "created_at", "reason"]
+
+    body = b"".join(await collect(_encode(rows_of(rows), columns, "csv")))
+
+    assert list(csv.reader(io.StringIO(body.decode()))) == [
+        columns,
+        [str(appointment_id), "confirmed", "2024-03-01", "2024-02-28T09:30:00", ""],
+        [str(appointment_id), "pending", "2024-03-02", "2024-02-29T17:00:00", "Has, a comma"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_is_written_in_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_BYTES", 100)
+    rows = [{"n": n, "text": "x" * 20} for n in range(20)]
+
+    chunks = await collect(_encode(rows_of(rows), ["n", "text"], "ndjson"))
+
+    assert len(chunks) > 1
+    # Every chunk but the last is flushed as soon as it reaches the threshold, on a line boundary
+    assert all(len(chunk) >= 100 and chunk.endswith(b"\n") for chunk in chunks[:-1])
+    lines = b"".join(chunks).splitlines()
+    assert [json.loads(line) for line in lines] == rows
+
+
+@pytest.mark.asyncio
+async def test_gzip_round_trips():
+    chunks = [b"first line\n", b"", b"second line\n" * 1000]
+
+    compressed = b"".join(await collect(_gzip(rows_of(chunks))))
+
+    assert gzip.decompress(compressed) == b"".join(chunks)
+
+
+def test_date_range_filter_is_inclusive():
+    query = date_range_filter("created_at", date(2024, 1, 1), date(2024, 1, 31))
+
+    bounds = query["created_at"]
+    assert bounds["$gte"] == datetime(2024, 1, 1, 0, 0)
+    assert bounds["$lte"] >= datetime(2024, 1, 31, 23, 59, 59, 999000)
+    assert bounds["$lte"] < datetime(2024, 2, 1)
+
+    assert date_range_filter("created_at", None, date(2024, 1, 31))["created_at"].keys() == {"$lte"}
+    assert date_range_filter("created_at", None, None) == {}
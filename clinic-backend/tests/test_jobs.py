@@ -0,0 +1,150 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+from core.config import settings
+from core.jobs import JobRunner
+from models.clinic_models import Job, JobStatus
+
+
+@pytest_asyncio.fixture
+async def runner(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_WORKERS", 8)
+    monkeypatch.setattr(settings, "JOB_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "JOB_SHUTDOWN_GRACE_SECONDS", 0.05)
+    await init_beanie(database=AsyncMongoMockClient()["test"], document_models=[Job])
+    runner = JobRunner()
+    yield runner
+    await runner.stop()
+
+
+async def wait_until(predicate, timeout=5):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not await predicate():
+        assert loop.time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def job_status(job, status):
+    stored = await Job.find_one(Job.job_id == job.job_id)
+    return stored.status == status
+
+
+def test_backoff_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 2)
+    monkeypatch.setattr(settings, "JOB_RETRY_MAX_SECONDS", 600)
+    runner = JobRunner()
+
+    assert 1 <= runner._backoff(1) <= 2
+    assert 4 <= runner._backoff(3) <= 8
+    assert 300 <= runner._backoff(20) <= 600
+
+
+@pytest.mark.asyncio
+async def test_failing_job_is_retried_until_failed(runner):
+    calls = []
+
+    @runner.handler("flaky", max_attempts=3)
+    async def flaky(n):
+        calls.append(n)
+        raise ValueError("still broken")
+
+    job = await runner.enqueue("flaky", {"n": 1})
+    await runner.start()
+    await wait_until(lambda: job_status(job, JobStatus.FAILED))
+
+    stored = await Job.find_one(Job.job_id == job.job_id)
+    assert calls == [1, 1, 1]
+    assert stored.attempts == 3
+    assert stored.last_error == "ValueError: still broken"
+    assert stored.finished_at is not None and stored.locked_by is None
+    assert (runner.retried, runner.failed, runner.succeeded) == (2, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_per_type_concurrency_limit(runner):
+    release = asyncio.Event()
+    running = 0
+    peak = 0
+
+    @runner.handler("slow", concurrency=2)
+    async def slow(n):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await release.wait()
+        running -= 1
+
+    jobs = await runner.enqueue_many("slow", [{"n": n} for n in range(5)])
+    await runner.start()
+
+    async def two_running():
+        return running == 2
+    await wait_until(two_running)
+    # Give the dispatcher a few polls to (wrongly) start a third
+    await asyncio.sleep(0.1)
+    assert peak == 2
+    assert await Job.find(Job.status == JobStatus.QUEUED).count() == 3
+
+    release.set()
+    for job in jobs:
+        await wait_until(lambda: job_status(job, JobStatus.SUCCEEDED))
+    assert peak == 2 and runner.succeeded == 5
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed(runner):
+    ran = []
+
+    @runner.handler("task", max_attempts=3)
+    async def task(n):
+        ran.append(n)
+
+    past = datetime.utcnow() - timedelta(seconds=1)
+    # A runner died mid-run: still RUNNING, but its lease has run out
+    orphan = Job(type="task", payload={"n": 1}, max_attempts=3, status=JobStatus.RUNNING,
+                 attempts=1, locked_by="dead-runner", lease_expires_at=past)
+    # This one's runner died on every attempt; it must not be run again
+    doomed = Job(type="task", payload={"n": 2}, max_attempts=3, status=JobStatus.RUNNING,
+                 attempts=3, locked_by="dead-runner", lease_expires_at=past)
+    # Still leased by a live runner
+    held = Job(type="task", payload={"n": 3}, max_attempts=3, status=JobStatus.RUNNING,
+               attempts=1, locked_by="live-runner", lease_expires_at=past + timedelta(minutes=5))
+    await Job.insert_many([orphan, doomed, held])
+
+    await runner.start()
+    await wait_until(lambda: job_status(orphan, JobStatus.SUCCEEDED))
+    await wait_until(lambda: job_status(doomed, JobStatus.FAILED))
+
+    assert ran == [1]
+    assert (await Job.find_one(Job.job_id == orphan.job_id)).attempts == 2
+    assert "Lease expired" in (await Job.find_one(Job.job_id == doomed.job_id)).last_error
+    stored = await Job.find_one(Job.job_id == held.job_id)
+    assert stored.locked_by == "live-runner" and stored.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_shutdown_requeues_without_spending_an_attempt(runner):
+    started = asyncio.Event()
+
+    @runner.handler("endless")
+    async def endless():
+        started.set()
+        await asyncio.Event().wait()
+
+    job = await runner.enqueue("endless", {})
+    await runner.start()
+    await asyncio.wait_for(started.wait(), timeout=5)
+    await runner.stop()
+
+    stored = await Job.find_one(Job.job_id == job.job_id)
+    assert stored.status == JobStatus.QUEUED
+    assert stored.attempts == 0
+    assert stored.locked_by is None and stored.lease_expires_at is None
+    assert runner.stats()["running"] == 0
@@ -0,0 +1,134 @@
+from datetime import date, datetime
+from typing import List
+from uuid import UUID, uuid4
+
+import pytest
+import pytest_asyncio
+from beanie import init_beanie
+from bson.binary import UUID_SUBTYPE, Binary
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient, AsyncMongoMockCollection
+from pymongo import DESCENDING
+
+from core.lean import LeanShape, find_lean, lean_response
+from models.clinic_models import Prescription
+from schemas.clinic_schemas import PrescriptionOut
+
+NEWEST_ISSUED_FIRST = [("issued_date", DESCENDING), ("_id", DESCENDING)]
+
+
+class StandardUuidCursor:
+    """Decodes UUIDs the way find_lean's codec options do on a real server, which mongomock can't apply."""
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def sort(self, *args):
+        self.cursor = self.cursor.sort(*args)
+        return self
+
+    def limit(self, limit):
+        self.cursor = self.cursor.limit(limit)
+        return self
+
+    async def to_list(self, length):
+        rows = await self.cursor.to_list(length=length)
+        return [
+            {key: value.as_uuid() if isinstance(value, Binary) and value.subtype == UUID_SUBTYPE else value
+             for key, value in row.items()}
+            for row in rows
+        ]
+
+
+class StandardUuidCollection:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def find(self, *args, **kwargs):
+        return StandardUuidCursor(self.collection.find(*args, **kwargs))
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch):
+    monkeypatch.setattr(
+        AsyncMongoMockCollection, "with_options", lambda self, **options: StandardUuidCollection(self), raising=False,
+    )
+    await init_beanie(database=AsyncMongoMockClient()["test"], document_models=[Prescription])
+
+
+def make_prescription(patient_id, **fields):
+    return Prescription(patient_id=patient_id, doctor_id=uuid4(), medication="Amoxicillin", dosage="500mg", **fields)
+
+
+def test_projection_is_built_from_the_schema():
+    shape = LeanShape(PrescriptionOut, extra_fields=["patient_id"])
+
+    assert shape.fields == ["prescription_id", "appointment_id", "medication", "dosage", "notes", "issued_date"]
+    assert shape.projection == {name: 1 for name in [*shape.fields, "patient_id"]}
+    assert shape.date_fields == {"issued_date"}
+
+
+def test_shape_returns_dates_fills_defaults_and_drops_extra_fields():
+    shape = LeanShape(PrescriptionOut, extra_fields=["patient_id"])
+    prescription_id = uuid4()
+
+    row = shape.shape({
+        "_id": "ignored", "patient_id": uuid4(), "prescription_id": prescription_id,
+        "medication": "Amoxicillin", "dosage": "500mg", "issued_date": datetime(2024, 3, 1),
+    })
+
+    assert row == {
+        "prescription_id": prescription_id, "appointment_id": None, "medication": "Amoxicillin",
+        "dosage": "500mg", "notes": None, "issued_date": date(2024, 3, 1),
+    }
+    assert type(row["issued_date"]) is date
+
+
+@pytest.mark.asyncio
+async def test_find_lean_reads_projected_rows_in_sort_order(db):
+    patient_id = uuid4()
+    older = make_prescription(patient_id, issued_date=date(2024, 1, 5), notes="With food")
+    newer = make_prescription(patient_id, issued_date=date(2024, 2, 5))
+    await Prescription.insert_many([older, newer, make_prescription(uuid4())])
+
+    rows = await find_lean(
+        Prescription.find(Prescription.patient_id == patient_id), LeanShape(PrescriptionOut), NEWEST_ISSUED_FIRST, 10,
+    )
+
+    assert [row["prescription_id"] for row in rows] == [newer.prescription_id, older.prescription_id]
+    assert isinstance(rows[0]["prescription_id"], UUID)
+    # Only projected fields and the sort keys come back; Beanie stores the date as a midnight datetime
+    assert set(rows[1]) == {"_id", "prescription_id", "appointment_id", "medication", "dosage", "notes", "issued_date"}
+    assert rows[1]["issued_date"] == datetime(2024, 1, 5)
+
+
+@pytest.mark.asyncio
+async def test_lean_response_matches_response_model_json(db):
+    patient_id = uuid4()
+    await Prescription.insert_many([
+        make_prescription(patient_id, issued_date=date(2024, 1, 5), notes="With food", appointment_id=uuid4()),
+        make_prescription(patient_id, issued_date=date(2024, 2, 5)),
+    ])
+    shape = LeanShape(PrescriptionOut)
+    documents = await Prescription.find(Prescription.patient_id == patient_id).sort(NEWEST_ISSUED_FIRST).to_list()
+    rows = await find_lean(Prescription.find(Prescription.patient_id == patient_id), shape, NEWEST_ISSUED_FIRST, 10)
+
+    app = FastAPI()
+
+    @app.get("/documents", response_model=List[PrescriptionOut])
+    async def documents_path():
+        return documents
+
+    @app.get("/lean", response_model=List[PrescriptionOut])
+    async def lean_path(response: Response):
+        response.headers["X-Next-Cursor"] = "abc"
+        return lean_response(rows, shape, response)
+
+    client = TestClient(app)
+    expected = client.get("/documents")
+    actual = client.get("/lean")
+
+    assert actual.json() == expected.json()
+    assert actual.content == expected.content
+    assert actual.headers["content-type"] == "application/json"
+    assert actual.headers["x-next-cursor"] == "abc"
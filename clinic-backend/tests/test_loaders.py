@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from core.loaders import BatchLoader
+
+
+@pytest.mark.asyncio
+async def test_loads_in_the_same_tick_are_coalesced_and_memoized():
+    calls = []
+
+    async def batch_fn(keys):
+        calls.append(list(keys))
+        return {key: key * 10 for key in keys if key != 3}
+
+    loader = BatchLoader(batch_fn)
+    first, second, duplicate, missing = await asyncio.gather(
+        loader.load(1), loader.load(2), loader.load(1), loader.load(3)
+    )
+
+    assert (first, second, duplicate, missing) == (10, 20, 10, None)
+    assert calls == [[1, 2, 3]]
+
+    assert await loader.load_many([2, 4, 4]) == {2: 20, 4: 40}
+    assert calls == [[1, 2, 3], [4]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_not_memoized():
+    attempts = []
+
+    async def batch_fn(keys):
+        attempts.append(keys)
+        if len(attempts) == 1:
+            raise RuntimeError("database unavailable")
+        return {key: str(key) for key in keys}
+
+    loader = BatchLoader(batch_fn)
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+
+    assert await loader.load(1) == "1"
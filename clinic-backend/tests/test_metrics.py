@@ -0,0 +1,33 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from core.metrics import UNMATCHED_ROUTE, MetricsMiddleware, MetricsRegistry
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_by_route_template():
+    registry = MetricsRegistry()
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=registry)
+
+    @app.post("/items/{item_id}")
+    async def update_item(item_id: int):
+        return {"item_id": item_id}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.post("/items/1", content=b"abc")
+        await client.post("/items/2")
+        await client.get("/missing")
+
+    assert registry.responses == {
+        ("POST", "/items/{item_id}", "200"): 2,
+        ("GET", UNMATCHED_ROUTE, "404"): 1,
+    }
+    stats = registry.routes[("POST", "/items/{item_id}")]
+    assert stats.count == 2 and stats.request_bytes == 3
+    assert stats.response_bytes == len(b'{"item_id":1}') * 2
+    assert registry.in_flight == 0
+
+    text = registry.render()
+    assert 'http_request_duration_seconds_bucket{method="POST",route="/items/{item_id}",le="+Inf"} 2' in text
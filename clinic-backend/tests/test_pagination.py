@@ -0,0 +1,61 @@
+from datetime import date, datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException, Response
+from pymongo import ASCENDING, DESCENDING
+
+from core.pagination import (
+    NEWEST_FIRST,
+    NEXT_CURSOR_HEADER,
+    PageParams,
+    cursor_for,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    split_page,
+)
+
+
+def test_cursor_round_trips_sort_values():
+    values = [datetime(2024, 5, 1, 9, 30, 0, 125000), ObjectId()]
+
+    assert decode_cursor(encode_cursor(values), NEWEST_FIRST) == values
+
+
+def test_tampered_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor", NEWEST_FIRST)
+    assert exc_info.value.status_code == 400
+
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor(["only-one-value"]), NEWEST_FIRST)
+
+
+def test_keyset_filter_follows_sort_direction():
+    oid = ObjectId()
+    when = datetime(2024, 5, 1)
+
+    assert keyset_filter([("_id", ASCENDING)], [oid]) == {"_id": {"$gt": oid}}
+    assert keyset_filter([("created_at", DESCENDING), ("_id", DESCENDING)], [when, oid]) == {
+        "$or": [
+            {"created_at": {"$lt": when}},
+            {"created_at": when, "_id": {"$lt": oid}},
+        ]
+    }
+
+
+def test_split_page_sets_next_cursor_only_when_more_items_exist():
+    sort = [("issued_date", DESCENDING), ("_id", DESCENDING)]
+    items = [{"issued_date": date(2024, 1, 3 - i), "_id": ObjectId()} for i in range(3)]
+    page = PageParams(limit=2, cursor=None)
+
+    response = Response()
+    trimmed = split_page(items, page, sort, response)
+    assert trimmed == items[:2]
+    assert response.headers[NEXT_CURSOR_HEADER] == cursor_for(items[1], sort)
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER], sort)[0] == datetime(2024, 1, 2)
+
+    response = Response()
+    assert split_page(items[:2], page, sort, response) == items[:2]
+    assert NEXT_CURSOR_HEADER not in response.headers
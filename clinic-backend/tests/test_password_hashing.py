@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from core import auth
+from core.config import settings
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify_round_trip():
+    hashed = await auth.get_password_hash_async("strongpassword")
+
+    assert await auth.verify_password_async("strongpassword", hashed)
+    assert not await auth.verify_password_async("wrongpassword", hashed)
+
+    stats = auth.get_password_hash_stats()
+    assert stats["hash"]["calls"] >= 1
+    assert stats["verify"]["calls"] >= 2
+    assert stats["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hash_pool_sheds_load_when_queue_is_full(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 1)
+
+    results = await asyncio.gather(
+        auth.get_password_hash_async("strongpassword"),
+        auth.get_password_hash_async("strongpassword"),
+        return_exceptions=True,
+    )
+
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 1
+    assert rejected[0].status_code == 503
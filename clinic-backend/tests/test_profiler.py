@@ -0,0 +1,45 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.profiler import QueryProfiler, RequestProfile, _current_profile, shape_of
+
+
+def test_shape_of_keeps_structure_but_drops_literals():
+    query = {"status": "pending", "$or": [{"age": {"$gt": 30}}, {"tags": ["a", "b"]}]}
+
+    assert shape_of(query) == {"status": "?", "$or": [{"age": {"$gt": "?"}}, {"tags": "?"}]}
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_shapes_are_flagged_as_n_plus_one(monkeypatch, capsys):
+    monkeypatch.setattr("core.profiler.settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD", 2)
+    monkeypatch.setattr("core.profiler.settings.QUERY_PROFILER_SLOW_MS", 10_000)
+    profiler = QueryProfiler()
+    profile = RequestProfile("GET /admin/doctors/pending", asyncio.get_running_loop())
+    token = _current_profile.set(profile)
+    try:
+        for request_id in range(3):
+            profiler.started(SimpleNamespace(
+                command_name="find",
+                command={"find": "users", "filter": {"user_id": request_id}},
+                request_id=request_id,
+                connection_id=("localhost", 27017),
+                database_name="clinic",
+            ))
+            profiler.succeeded(SimpleNamespace(
+                command_name="find",
+                reply={"cursor": {"firstBatch": [{}]}},
+                request_id=request_id,
+                connection_id=("localhost", 27017),
+                duration_micros=1500,
+            ))
+    finally:
+        _current_profile.reset(token)
+
+    profiler.finish(profile)
+
+    assert [(q.collection, q.documents) for q in profile.queries] == [("users", 1)] * 3
+    assert profiler.stats()["n_plus_one_requests"] == 1
+    assert 'Probable N+1 in GET /admin/doctors/pending: find users {"user_id": "?"} ran 3 times' in capsys.readouterr().out
@@ -0,0 +1,40 @@
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+
+from core.storage import LocalStorage, StorageBackend
+
+
+@pytest.mark.asyncio
+async def test_local_upload_writes_file_and_returns_url(tmp_path):
+    storage = LocalStorage(str(tmp_path), "http://files.test/media/")
+    file = UploadFile(io.BytesIO(b"%PDF-1.4 degree"), filename="Degree.PDF", size=15)
+
+    result = await storage.upload(file, "/clinic/doctor_degrees/")
+
+    public_id = result["public_id"]
+    assert public_id.startswith("clinic/doctor_degrees/") and public_id.endswith(".pdf")
+    assert result["secure_url"] == f"http://files.test/media/{public_id}"
+    assert result["bytes"] == 15
+    with open(os.path.join(tmp_path, public_id), "rb") as stored:
+        assert stored.read() == b"%PDF-1.4 degree"
+
+    asset = await storage.get_asset(public_id)
+    assert asset == {"public_id": public_id, "secure_url": result["secure_url"], "bytes": 15, "format": "pdf"}
+    await storage.delete(public_id)
+    assert await storage.get_asset(public_id) is None
+
+
+@pytest.mark.parametrize("public_id", ["../outside.png", "clinic/../../outside.png", "/etc/passwd", ""])
+def test_local_path_rejects_ids_outside_the_root(tmp_path, public_id):
+    storage = LocalStorage(str(tmp_path / "media"), "http://files.test/media")
+
+    with pytest.raises(ValueError):
+        storage.path(public_id)
+
+
+def test_storage_backend_is_abstract():
+    with pytest.raises(TypeError):
+        StorageBackend()
@@ -0,0 +1,69 @@
+// File: clinic-frontend/src/api/pagination.ts
+
+import { useCallback, useEffect, useRef, useState } from 'react';
+import axiosInstance from './axiosInstance';
+
+// List endpoints return one page at a time. The token for the next page comes
+// back in the X-Next-Cursor header (absent on the last page) and is sent back
+// as ?cursor= to fetch it. Axios lower-cases response header names.
+const NEXT_CURSOR_HEADER = 'x-next-cursor';
+
+export const fetchPage = async <T>(url: string, cursor?: string | null) => {
+  const response = await axiosInstance.get<T[]>(url, { params: cursor ? { cursor } : undefined });
+  const nextCursor = (response.headers[NEXT_CURSOR_HEADER] as string | undefined) ?? null;
+  return { items: response.data, nextCursor };
+};
+
+// Loads the first page of `url` (skipped while it is null), then appends
+// further pages on loadMore(). Changing `refreshKey` starts again from page one.
+export const usePagedList = <T>(url: string | null, refreshKey?: unknown) => {
+  const [items, setItems] = useState<T[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
+  const [error, setError] = useState(false);
+  // Responses from before the latest reload are dropped
+  const generation = useRef(0);
+
+  const reload = useCallback(async () => {
+    const current = ++generation.current;
+    if (!url) { setIsLoading(false); return; }
+    setIsLoading(true);
+    setError(false);
+    try {
+      const page = await fetchPage<T>(url);
+      if (current !== generation.current) return;
+      setItems(page.items);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      if (current !== generation.current) return;
+      console.error(`Failed to fetch ${url}`, err);
+      setError(true);
+    } finally {
+      if (current === generation.current) setIsLoading(false);
+    }
+  }, [url]);
+
+  useEffect(() => {
+    reload();
+  }, [reload, refreshKey]);
+
+  const loadMore = async () => {
+    if (!url || !nextCursor || isLoadingMore) return;
+    const current = generation.current;
+    setIsLoadingMore(true);
+    try {
+      const page = await fetchPage<T>(url, nextCursor);
+      if (current !== generation.current) return;
+      setItems(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error(`Failed to fetch more of ${url}`, err);
+      alert("Could not load more results. Please try again.");
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
+  return { items, setItems, nextCursor, isLoading, isLoadingMore, error, reload, loadMore };
+};
@@ -0,0 +1,20 @@
+// File: clinic-frontend/src/components/LoadMoreButton.tsx
+
+type LoadMoreButtonProps = {
+  onClick: () => void;
+  isLoading: boolean;
+};
+
+const LoadMoreButton = ({ onClick, isLoading }: LoadMoreButtonProps) => (
+  <div className="flex justify-center mt-6">
+    <button
+      onClick={onClick}
+      disabled={isLoading}
+      className="bg-dark-card text-dark-text font-semibold py-2 px-6 rounded-lg border border-slate-700 hover:border-brand-blue transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
+    >
+      {isLoading ? 'Loading...' : 'Load more'}
+    </button>
+  </div>
+);
+
+export default LoadMoreButton;
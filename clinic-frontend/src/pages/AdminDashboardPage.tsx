@@ -1,5 +1,7 @@
 import { useState, useEffect } from 'react';
 import axiosInstance from '../api/axiosInstance';
+import { usePagedList } from '../api/pagination';
+import LoadMoreButton from '../components/LoadMoreButton';
 import { useAuthStore } from '../stores/authStore';
 import PageWrapper from '../components/PageWrapper';
 
@@ -13,34 +15,15 @@ interface PendingDoctor {
 }
 
 const AdminDashboardPage = () => {
-  const [pendingDoctors, setPendingDoctors] = useState<PendingDoctor[]>([]);
-  const [isLoading, setIsLoading] = useState(true);
   const [message, setMessage] = useState<string>('');
   const token = useAuthStore((state) => state.token);
-
-  const fetchPendingDoctors = async () => {
-    if (!token) return;
-    try {
-      setIsLoading(true);
-      // NOTE: Your backend router for admin routes is at '/admin', 
-      // but you included it in main.py with another '/admin' prefix.
-      // The final URL is '/admin/admin/doctors/pending'.
-      // Make sure your main.py inclusion is correct. If it is, this URL is correct.
-      // If you removed the prefix from admin_routes.py, then the URL is '/admin/doctors/pending'.
-      // I'll assume the prefix in main.py is the source of truth.
-      const response = await axiosInstance.get('/admin/doctors/pending');
-      setPendingDoctors(response.data);
-    } catch (error) {
-      console.error("Failed to fetch pending doctors", error);
-      setMessage("Could not load doctor applications.");
-    } finally {
-      setIsLoading(false);
-    }
-  };
+  const {
+    items: pendingDoctors, setItems: setPendingDoctors, isLoading, error, nextCursor, isLoadingMore, loadMore,
+  } = usePagedList<PendingDoctor>(token ? '/admin/doctors/pending' : null);
 
   useEffect(() => {
-    fetchPendingDoctors();
-  }, [token]);
+    if (error) setMessage("Could not load doctor applications.");
+  }, [error]);
   
   const handleVerification = async (doctorId: string, newStatus: 'verified' | 'rejected') => {
     try {
@@ -85,6 +68,7 @@ const AdminDashboardPage = () => {
                 </div>
               </div>
             )) : <p className="text-dark-subtle text-center py-8">No pending doctor applications.</p>}
+            {nextCursor && <LoadMoreButton onClick={loadMore} isLoading={isLoadingMore} />}
           </div>
         )}
       </div>
@@ -1,5 +1,7 @@
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import axiosInstance from '../api/axiosInstance';
+import { usePagedList } from '../api/pagination';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 // The interface now correctly anticipates the patient's name
 interface Appointment {
@@ -49,27 +51,8 @@ const DoctorDashboardPage = () => {
 };
 
 const DoctorAppointmentsList = () => {
-  const [appointments, setAppointments] = useState<Appointment[]>([]);
-  const [isLoading, setIsLoading] = useState(true);
-  const [error, setError] = useState<string | null>(null); // <-- NEW: State for error handling
-
-  const fetchAppointments = async () => {
-    try {
-      // --- This is the API call to the new endpoint ---
-      // Note: No need for manual headers; axiosInstance handles it.
-      const response = await axiosInstance.get('/doctors/me/appointments');
-      setAppointments(response.data);
-    } catch (err) {
-      console.error("Failed to fetch appointments", err);
-      setError("Could not load appointments. Please try again later."); // <-- NEW: Set error message
-    } finally {
-      setIsLoading(false);
-    }
-  };
-
-  useEffect(() => {
-    fetchAppointments();
-  }, []);
+  const { items: appointments, isLoading, error, nextCursor, isLoadingMore, loadMore, reload } =
+    usePagedList<Appointment>('/doctors/me/appointments');
 
   const handleUpdateStatus = async (appointmentId: string, status: string) => {
     try {
@@ -77,7 +60,7 @@ const DoctorAppointmentsList = () => {
       // Fix: Use correct HTTP method and pass status as query param
       await axiosInstance.put(`/doctors/me/appointments/${appointmentId}/status`, null, { params: { status } });
       // Refresh the appointments list after updating status
-      fetchAppointments();
+      reload();
     } catch (err) {
       console.error("Failed to update appointment status", err);
       alert("Failed to update appointment status. Please try again.");
@@ -85,7 +68,7 @@ const DoctorAppointmentsList = () => {
   };
 
   if (isLoading) return <p className="text-dark-subtle">Loading appointments...</p>;
-  if (error) return <p className="text-red-400">{error}</p>; // <-- NEW: Display error message
+  if (error) return <p className="text-red-400">Could not load appointments. Please try again later.</p>;
   if (appointments.length === 0) return <p className="text-dark-subtle">You have no upcoming appointments.</p>;
 
   return (
@@ -125,34 +108,18 @@ const DoctorAppointmentsList = () => {
           </div>
         </div>
       ))}
+      {nextCursor && <LoadMoreButton onClick={loadMore} isLoading={isLoadingMore} />}
     </div>
   );
 
 };
 
 const DoctorHistoryList = () => {
-  const [appointments, setAppointments] = useState<Appointment[]>([]);
-  const [isLoading, setIsLoading] = useState(true);
-  const [error, setError] = useState<string | null>(null);
-
-  const fetchHistory = async () => {
-    try {
-      const response = await axiosInstance.get('/doctors/me/appointments/history');
-      setAppointments(response.data);
-    } catch (err) {
-      console.error("Failed to fetch appointment history", err);
-      setError("Could not load appointment history. Please try again later.");
-    } finally {
-      setIsLoading(false);
-    }
-  };
-
-  useEffect(() => {
-    fetchHistory();
-  }, []);
+  const { items: appointments, isLoading, error, nextCursor, isLoadingMore, loadMore } =
+    usePagedList<Appointment>('/doctors/me/appointments/history');
 
   if (isLoading) return <p className="text-dark-subtle">Loading history...</p>;
-  if (error) return <p className="text-red-400">{error}</p>;
+  if (error) return <p className="text-red-400">Could not load appointment history. Please try again later.</p>;
   if (appointments.length === 0) return <p className="text-dark-subtle">You have no cancelled appointments in your history.</p>;
 
   return (
@@ -175,6 +142,7 @@ const DoctorHistoryList = () => {
           </div>
         </div>
       ))}
+      {nextCursor && <LoadMoreButton onClick={loadMore} isLoading={isLoadingMore} />}
     </div>
   );
 };
@@ -1,7 +1,7 @@
 // File: clinic-frontend/src/pages/DoctorsPage.tsx
-import { useState, useEffect } from 'react';
-import axiosInstance from '../api/axiosInstance';
+import { usePagedList } from '../api/pagination';
 import DoctorCard from '../components/DoctorCard';
+import LoadMoreButton from '../components/LoadMoreButton';
 import type { NavigateFunction } from '../App';
 
 type Doctor = {
@@ -17,25 +17,8 @@ type DoctorsPageProps = {
 };
 
 const DoctorsPage = ({ onNavigate }: DoctorsPageProps) => {
-  const [doctors, setDoctors] = useState<Doctor[]>([]);
-  const [isLoading, setIsLoading] = useState(true);
-  const [error, setError] = useState<string | null>(null);
-
-  useEffect(() => {
-    const fetchDoctors = async () => {
-      try {
-        setError(null);
-        setIsLoading(true);
-        const response = await axiosInstance.get('/public/doctors');
-        setDoctors(response.data);
-      } catch (err) {
-        setError('Failed to load doctors. Please try again later.');
-      } finally {
-        setIsLoading(false);
-      }
-    };
-    fetchDoctors();
-  }, []);
+  const { items: doctors, isLoading, error, nextCursor, isLoadingMore, loadMore } =
+    usePagedList<Doctor>('/public/doctors');
 
   return (
     <div className="bg-dark-bg py-16 px-4 sm:px-6 lg:px-8">
@@ -46,7 +29,7 @@ const DoctorsPage = ({ onNavigate }: DoctorsPageProps) => {
         </div>
 
         {isLoading && <div className="text-center text-xl text-dark-subtle">Loading doctors...</div>}
-        {error && <div className="text-center text-red-400 text-xl">{error}</div>}
+        {error && <div className="text-center text-red-400 text-xl">Failed to load doctors. Please try again later.</div>}
 
         {!isLoading && !error && doctors.length > 0 && (
           <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-8">
@@ -55,6 +38,7 @@ const DoctorsPage = ({ onNavigate }: DoctorsPageProps) => {
             ))}
           </div>
         )}
+        {!isLoading && !error && nextCursor && <LoadMoreButton onClick={loadMore} isLoading={isLoadingMore} />}
          {!isLoading && !error && doctors.length === 0 && (
             <div className="text-center text-xl text-dark-subtle">No verified doctors are available at this moment.</div>
         )}
@@ -1,7 +1,9 @@
 // File: clinic-frontend/src/pages/PatientDashboardPage.tsx
 
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import axiosInstance from '../api/axiosInstance';
+import { usePagedList } from '../api/pagination';
+import LoadMoreButton from '../components/LoadMoreButton';
 import { useAuthStore } from '../stores/authStore';
 import type { NavigateFunction } from '../App';// <-- NEW IMPORT
 
@@ -90,21 +92,8 @@ const PatientDashboardPage = ({ onNavigate }: PatientDashboardPageProps) => {
 
 // --- Your existing sub-components (unchanged) ---
 const AppointmentsList = ({ token, onUndo, refreshFlag }: { token: string | null; onUndo: (appointmentId: string) => Promise<void>; refreshFlag: boolean }) => {
-  const [appointments, setAppointments] = useState<Appointment[]>([]);
-  const [isLoading, setIsLoading] = useState(true);
-
-  const fetchAppointments = async () => {
-    if (!token) { setIsLoading(false); return; }
-    try {
-      const response = await axiosInstance.get('/users/me/appointments');
-      setAppointments(response.data);
-    } catch (error) { console.error("Failed to fetch appointments", error); }
-    finally { setIsLoading(false); }
-  };
-
-  useEffect(() => {
-    fetchAppointments();
-  }, [token, refreshFlag]);
+  const { items: appointments, isLoading, nextCursor, isLoadingMore, loadMore } =
+    usePagedList<Appointment>(token ? '/users/me/appointments' : null, refreshFlag);
 
   if (isLoading) return <p>Loading appointments...</p>;
   if (appointments.length === 0) return <p>You have no scheduled appointments.</p>;
@@ -130,22 +119,14 @@ const AppointmentsList = ({ token, onUndo, refreshFlag }: { token: string | null
           </div>
         </div>
       ))}
+      {nextCursor && <LoadMoreButton onClick={loadMore} isLoading={isLoadingMore} />}
     </div>
   );
 };
 
 const PrescriptionsList = ({ token }: { token: string | null }) => {
-  const [prescriptions, setPrescriptions] = useState<Prescription[]>([]);
-  useEffect(() => {
-    const fetchPrescriptions = async () => {
-       if (!token) return;
-        try {
-            const response = await axiosInstance.get('/users/me/prescriptions');
-            setPrescriptions(response.data);
-        } catch (error) { console.error("Failed to fetch prescriptions", error); }
-    };
-    fetchPrescriptions();
-  }, [token]);
+  const { items: prescriptions, nextCursor, isLoadingMore, loadMore } =
+    usePagedList<Prescription>(token ? '/users/me/prescriptions' : null);
 
   if (prescriptions.length === 0) return <p>You have no prescriptions on record.</p>;
 
@@ -158,26 +139,14 @@ const PrescriptionsList = ({ token }: { token: string | null }) => {
           <p className="text-xs text-slate-500 mt-2">Issued: {new Date(pr.issued_date).toDateString()}</p>
         </div>
       ))}
+      {nextCursor && <LoadMoreButton onClick={loadMore} isLoading={isLoadingMore} />}
     </div>
   );
 };
 
 const HistoryList = ({ token }: { token: string | null }) => {
-  const [appointments, setAppointments] = useState<Appointment[]>([]);
-  const [isLoading, setIsLoading] = useState(true);
-
-  const fetchHistory = async () => {
-    if (!token) { setIsLoading(false); return; }
-    try {
-      const response = await axiosInstance.get('/users/me/appointments/history');
-      setAppointments(response.data);
-    } catch (error) { console.error("Failed to fetch appointment history", error); }
-    finally { setIsLoading(false); }
-  };
-
-  useEffect(() => {
-    fetchHistory();
-  }, [token]);
+  const { items: appointments, isLoading, nextCursor, isLoadingMore, loadMore } =
+    usePagedList<Appointment>(token ? '/users/me/appointments/history' : null);
 
   if (isLoading) return <p>Loading history...</p>;
   if (appointments.length === 0) return <p>You have no cancelled appointments in your history.</p>;
@@ -195,6 +164,7 @@ const HistoryList = ({ token }: { token: string | null }) => {
           </div>
         </div>
       ))}
+      {nextCursor && <LoadMoreButton onClick={loadMore} isLoading={isLoadingMore} />}
     </div>
   );
 };
@@ -2,9 +2,45 @@
 
 import { useState } from 'react';
 import { motion } from 'framer-motion';
+import axios from 'axios';
 import axiosInstance from '../api/axiosInstance';
 import type { NavigateFunction } from '../App';
 
+type UploadIntent = {
+  method: 'POST' | 'PUT';
+  url: string;
+  headers: Record<string, string>;
+  fields: Record<string, string | number>;
+  upload_token: string;
+};
+
+// Sends a registration file straight to storage and returns the asset token
+// the register endpoint expects: intent -> direct upload -> finalize.
+const uploadDirectly = async (kind: 'photo' | 'degree', file: File): Promise<string> => {
+  const { data: intent } = await axiosInstance.post<UploadIntent>('/auth/uploads/intent', {
+    kind,
+    content_type: file.type,
+    size: file.size,
+  });
+
+  // Plain axios: the storage server must not receive our bearer token.
+  // Local storage hands out URLs relative to the API.
+  const url = new URL(intent.url, axiosInstance.defaults.baseURL).toString();
+  if (intent.method === 'PUT') {
+    await axios.put(url, file, { headers: intent.headers });
+  } else {
+    const form = new FormData();
+    Object.entries(intent.fields).forEach(([key, value]) => form.append(key, String(value)));
+    form.append('file', file);
+    await axios.post(url, form, { headers: intent.headers });
+  }
+
+  const { data: asset } = await axiosInstance.post('/auth/uploads/finalize', {
+    upload_token: intent.upload_token,
+  });
+  return asset.asset_token;
+};
+
 const RegisterPage = ({ onNavigate }: { onNavigate: NavigateFunction }) => {
   const [activeTab, setActiveTab] = useState<'patient' | 'doctor'>('patient');
 
@@ -108,18 +144,20 @@ const RegisterPage = ({ onNavigate }: { onNavigate: NavigateFunction }) => {
         return;
       }
       try {
-        const data = new FormData();
-        data.append('full_name', formData.full_name);
-        data.append('specialty', formData.specialty);
-        data.append('email', formData.email);
-        data.append('password', formData.password);
-        data.append('bio', formData.bio);
-        data.append('photo', formData.photo);
-        data.append('degree', formData.degree);
+        // The files go directly to storage; the API only receives JSON
+        const [photoAsset, degreeAsset] = await Promise.all([
+          uploadDirectly('photo', formData.photo),
+          uploadDirectly('degree', formData.degree),
+        ]);
 
-        // ✅ fixed endpoint (removed /auth/)
-        const response = await axiosInstance.post('/auth/register/doctor', data, {
-          headers: { 'Content-Type': 'multipart/form-data' },
+        const response = await axiosInstance.post('/auth/register/doctor', {
+          full_name: formData.full_name,
+          specialty: formData.specialty,
+          email: formData.email,
+          password: formData.password,
+          bio: formData.bio || null,
+          photo_asset: photoAsset,
+          degree_asset: degreeAsset,
         });
         console.log(response.data);
         alert('Doctor registration successful! Please wait for admin approval.');
@@ -196,6 +234,7 @@ const RegisterPage = ({ onNavigate }: { onNavigate: NavigateFunction }) => {
           <input
             type="file"
             name="photo"
+            accept="image/jpeg,image/png,image/webp"
             required
             onChange={handleChange}
             className="w-full text-sm text-slate-400 file:mr-4 file:py-2 file:px-4
@@ -208,6 +247,7 @@ const RegisterPage = ({ onNavigate }: { onNavigate: NavigateFunction }) => {
           <input
             type="file"
             name="degree"
+            accept="application/pdf,image/jpeg,image/png"
             required
             onChange={handleChange}
             className="w-full text-sm text-slate-400 file:mr-4 file:py-2 file:px-4